@@ -0,0 +1,108 @@
+"""
+Benchmark: non-streaming response serialization, fast JSON path vs. FastAPI's default.
+
+Sends the same large ChatCompletion (tool calls and logprobs) through the
+`/v1/chat/completions` route with `fast_json_responses` on and off, and reports the
+per-request time. The upstream call is stubbed out, so only server overhead is measured.
+
+Usage:
+    python benchmarks/bench_json_response.py [--requests 2000] [--tokens 1000]
+"""
+
+import argparse
+import asyncio
+from time import perf_counter
+from unittest.mock import AsyncMock
+
+import httpx
+from openai.types.chat import ChatCompletion
+
+from chat_completion_server import ChatCompletionServer, ProxyConfig
+
+
+def build_completion(tokens: int) -> ChatCompletion:
+    """Build a completion with `tokens` logprob entries and a handful of tool calls."""
+    logprobs = [
+        {
+            "token": f"tok{i}",
+            "logprob": -0.5,
+            "bytes": [116, 111, 107],
+            "top_logprobs": [
+                {"token": f"alt{j}", "logprob": -1.5, "bytes": None} for j in range(3)
+            ],
+        }
+        for i in range(tokens)
+    ]
+    tool_calls = [
+        {
+            "id": f"call_{i}",
+            "type": "function",
+            "function": {"name": f"tool_{i}", "arguments": '{"query": "' + "x" * 200 + '"}'},
+        }
+        for i in range(8)
+    ]
+    return ChatCompletion.model_validate(
+        {
+            "id": "chatcmpl-bench",
+            "object": "chat.completion",
+            "created": 1234567890,
+            "model": "bench-model",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {
+                        "role": "assistant",
+                        "content": " ".join(f"tok{i}" for i in range(tokens)),
+                        "tool_calls": tool_calls,
+                    },
+                    "logprobs": {"content": logprobs},
+                }
+            ],
+            "usage": {
+                "prompt_tokens": 100,
+                "completion_tokens": tokens,
+                "total_tokens": tokens + 100,
+            },
+        }
+    )
+
+
+async def run(fast_json: bool, completion: ChatCompletion, requests: int) -> float:
+    """Return the mean seconds per request through the ASGI app."""
+    server = ChatCompletionServer(config=ProxyConfig(fast_json_responses=fast_json), plugins=[])
+    server.process_request = AsyncMock(return_value=completion)
+    body = {"model": "custom-model", "messages": [{"role": "user", "content": "hi"}]}
+
+    transport = httpx.ASGITransport(app=server.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(min(50, requests)):  # warm up
+            await client.post("/v1/chat/completions", json=body)
+
+        start = perf_counter()
+        for _ in range(requests):
+            response = await client.post("/v1/chat/completions", json=body)
+            response.raise_for_status()
+        return (perf_counter() - start) / requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=1000)
+    args = parser.parse_args()
+
+    completion = build_completion(args.tokens)
+    size = len(completion.model_dump_json())
+
+    default = await run(False, completion, args.requests)
+    fast = await run(True, completion, args.requests)
+
+    print(f"response size: {size / 1024:.1f} KiB, requests: {args.requests}")
+    print(f"default (jsonable_encoder): {default * 1e6:9.1f} us/request")
+    print(f"fast (pydantic_core.to_json): {fast * 1e6:7.1f} us/request")
+    print(f"savings: {(default - fast) * 1e6:.1f} us/request ({(1 - fast / default) * 100:.1f}%)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+"""
+Benchmark: ModelManager.apply_model_config over long agent conversations.
+
+Builds conversations of user, assistant tool-call and tool-result messages with a system
+message first, and reports the per-request time of applying each system prompt behavior.
+The previous implementation (list rebuild, linear system-message scan and in-place edits)
+is included as a baseline.
+
+Usage:
+    python benchmarks/bench_model_config.py [--messages 100 500] [--iterations 20000]
+"""
+
+import argparse
+from time import perf_counter
+from typing import Any
+
+from chat_completion_server.core.model_manager import ModelManager
+from chat_completion_server.models.model import ModelConfig, SystemPromptBehavior
+
+BEHAVIORS = (
+    SystemPromptBehavior.OVERRIDE,
+    SystemPromptBehavior.PREPEND,
+    SystemPromptBehavior.APPEND,
+    SystemPromptBehavior.DEFAULT,
+)
+SYSTEM_PROMPT = "You are a careful assistant. " * 20
+
+
+def build_messages(count: int) -> list[dict[str, Any]]:
+    """Build a conversation of `count` messages, cycling user, tool call and tool result."""
+    messages: list[dict[str, Any]] = [{"role": "system", "content": "Client prompt. " * 50}]
+    for i in range(count - 1):
+        kind = i % 3
+        if kind == 0:
+            messages.append({"role": "user", "content": f"Question {i}: " + "words " * 40})
+        elif kind == 1:
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": f"call_{i}",
+                            "type": "function",
+                            "function": {"name": "search", "arguments": '{"q": "x"}'},
+                        }
+                    ],
+                }
+            )
+        else:
+            messages.append(
+                {"role": "tool", "tool_call_id": f"call_{i - 1}", "content": "result " * 100}
+            )
+    return messages
+
+
+def previous_apply(params: dict[str, Any], model: ModelConfig) -> dict[str, Any]:
+    """The previous apply_model_config, for comparison."""
+    if model.upstream_model:
+        params["model"] = model.upstream_model
+    messages = list(params.get("messages", []))
+    idx = next((i for i, m in enumerate(messages) if m.get("role") == "system"), None)
+    behavior = model.system_prompt_behavior
+    if idx is None:
+        messages.insert(0, {"role": "system", "content": model.system_prompt})
+    elif behavior == SystemPromptBehavior.OVERRIDE:
+        messages[idx]["content"] = model.system_prompt
+    elif behavior == SystemPromptBehavior.PREPEND:
+        messages[idx]["content"] = f"{model.system_prompt}\n\n{messages[idx]['content']}"
+    elif behavior == SystemPromptBehavior.APPEND:
+        messages[idx]["content"] = f"{messages[idx]['content']}\n\n{model.system_prompt}"
+    params["messages"] = messages
+    return params
+
+
+def time_per_call(fn: Any, iterations: int) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (perf_counter() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--messages", type=int, nargs="+", default=[100, 500])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args()
+
+    for count in args.messages:
+        messages = build_messages(count)
+        print(f"{count} messages, {args.iterations} iterations")
+        for behavior in BEHAVIORS:
+            model = ModelConfig(
+                id="bench",
+                upstream_model="gpt-4o",
+                system_prompt=SYSTEM_PROMPT,
+                system_prompt_behavior=behavior,
+            )
+            manager = ModelManager({"bench": model})
+
+            current = time_per_call(
+                lambda: manager.apply_model_config({"model": "bench", "messages": messages}),
+                args.iterations,
+            )
+            # The previous implementation edits the system message in place; restore it
+            system, content = messages[0], messages[0]["content"]
+            previous = time_per_call(
+                lambda: (
+                    previous_apply({"model": "bench", "messages": messages}, model),
+                    system.__setitem__("content", content),
+                ),
+                args.iterations,
+            )
+            print(
+                f"  {behavior.value:<9} previous {previous * 1e6:7.2f} us   "
+                f"current {current * 1e6:7.2f} us   ({previous / current:4.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,10 @@
 from chat_completion_server.core import ChatCompletionServer, ProxyConfig, ProxyHandler, ProxyPlugin
-from chat_completion_server.models import ModelConfig, SystemPromptBehavior
+from chat_completion_server.models import (
+    ModelConfig,
+    StreamEvents,
+    StreamTiming,
+    SystemPromptBehavior,
+)
 
 __all__ = [
     "ChatCompletionServer",
@@ -7,5 +12,7 @@ __all__ = [
     "ProxyHandler",
     "ProxyPlugin",
     "ModelConfig",
+    "StreamEvents",
+    "StreamTiming",
     "SystemPromptBehavior",
 ]
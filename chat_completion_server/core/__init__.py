@@ -1,5 +1,6 @@
 from chat_completion_server.models.config import ProxyConfig
 from chat_completion_server.core.proxy_handler import OpenAIProxyHandler, ProxyHandler
+from chat_completion_server.core.load_balancer import LoadBalancedProxyHandler
 from chat_completion_server.core.model_manager import ModelManager
 from chat_completion_server.models.plugin import ProxyPlugin
 from chat_completion_server.core.server import ChatCompletionServer
@@ -9,6 +10,7 @@ __all__ = [
     "ProxyConfig",
     "ProxyHandler",
     "OpenAIProxyHandler",
+    "LoadBalancedProxyHandler",
     "ProxyPlugin",
     "ModelManager",
 ]
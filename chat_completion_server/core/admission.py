@@ -0,0 +1,264 @@
+import asyncio
+from collections import deque
+from logging import getLogger
+from statistics import median
+from time import monotonic
+
+from chat_completion_server.core.resilience import get_retry_after, is_overload
+from chat_completion_server.models.model import ModelConfig
+
+
+logger = getLogger(__name__)
+
+HOLD_TIME_ALPHA = 0.2
+"""Weight of the newest sample in the permit hold time EWMA"""
+AIMD_BACKOFF_RATIO = 0.5
+"""Factor the adaptive limit is multiplied by on overload"""
+AIMD_LATENCY_WINDOW = 20
+"""Latency samples per window; each window's median is compared against the baseline"""
+AIMD_LATENCY_TOLERANCE = 2.0
+"""A window median above this multiple of the baseline latency counts as a latency spike"""
+BASELINE_LATENCY_ALPHA = 0.2
+"""Weight of the newest window median in the baseline latency EWMA"""
+AIMD_MIN_DECREASE_INTERVAL = 1.0
+"""Minimum seconds between decreases, so one burst of failures only backs off once"""
+
+
+class AdmissionRejectedError(Exception):
+    """Raised when a request cannot be admitted because its model is saturated."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Too many concurrent requests for {name}; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class Permit:
+    """A slot held by one admitted request. Releasing it more than once is a no-op."""
+
+    def __init__(self, limiter: "ConcurrencyLimiter"):
+        self.limiter = limiter
+        self._acquired_at = monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self.limiter._release(monotonic() - self._acquired_at)
+
+
+class AIMDLimit:
+    """
+    Concurrency limit discovered by additive increase / multiplicative decrease.
+
+    Each success grows the limit by `1 / limit`, i.e. by one per window of `limit` requests.
+    Overload signals (upstream 429s, 5xx, timeouts) and latency spikes multiply it by
+    `AIMD_BACKOFF_RATIO`.
+
+    Latency samples must not depend on output length, so streams report their upstream time
+    to first chunk and non-streaming calls report none. A spike is a window of
+    `AIMD_LATENCY_WINDOW` samples whose median exceeds `AIMD_LATENCY_TOLERANCE` times the
+    baseline, a slow EWMA of window medians; single slow requests (e.g. long prompts) do not
+    count.
+    """
+
+    def __init__(self, initial: int, min_limit: int, max_limit: int):
+        """
+        Args:
+            initial: Starting limit
+            min_limit: Lowest the limit may shrink to
+            max_limit: Highest the limit may grow to
+        """
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.baseline_latency: float | None = None
+        self._latencies: list[float] = []
+        self._last_decrease = float("-inf")
+
+    def on_success(self, latency: float | None = None) -> None:
+        """Record a successful upstream call, with its latency sample if it has one."""
+        if latency is not None and self._record_latency(latency):
+            self.on_overload()
+            return
+        self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    def _record_latency(self, latency: float) -> bool:
+        """Add a latency sample. Returns True if it completes a window that spiked."""
+        self._latencies.append(latency)
+        if len(self._latencies) < AIMD_LATENCY_WINDOW:
+            return False
+        recent = median(self._latencies)
+        self._latencies.clear()
+        baseline = self.baseline_latency
+        self.baseline_latency = (
+            recent
+            if baseline is None
+            else BASELINE_LATENCY_ALPHA * recent + (1 - BASELINE_LATENCY_ALPHA) * baseline
+        )
+        return baseline is not None and recent > AIMD_LATENCY_TOLERANCE * baseline
+
+    def on_overload(self) -> None:
+        """Back off after an overload signal."""
+        now = monotonic()
+        if now - self._last_decrease < AIMD_MIN_DECREASE_INTERVAL:
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * AIMD_BACKOFF_RATIO)
+
+
+class ConcurrencyLimiter:
+    """
+    Caps in-flight requests, queueing excess requests in a bounded FIFO queue.
+
+    Requests beyond `max_in_flight` wait in arrival order. When `max_queued` requests are
+    already waiting, or a request waits longer than `queue_timeout`, it is rejected with
+    `AdmissionRejectedError` instead of piling more work onto the upstream.
+
+    With an `AIMDLimit`, `max_in_flight` follows the adaptive limit, and a `Retry-After`
+    from an upstream 429 pauses admission until it has passed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_in_flight: int,
+        max_queued: int = 0,
+        queue_timeout: float | None = None,
+        aimd: AIMDLimit | None = None,
+    ):
+        """
+        Args:
+            name: Name used in errors and logs, e.g. the model id
+            max_in_flight: Maximum requests holding a permit at once
+            max_queued: Maximum requests waiting for a permit
+            queue_timeout: Seconds a request may wait for a permit. If None, waits indefinitely
+            aimd: Adaptive limit driving `max_in_flight`. If None, the limit is static
+        """
+        self.name = name
+        self.aimd = aimd
+        self.max_in_flight = int(aimd.limit) if aimd is not None else max_in_flight
+        self.max_queued = max_queued
+        self.queue_timeout = queue_timeout
+        self.in_flight = 0
+        self.hold_time_ewma: float | None = None
+        self.paused_until = 0.0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> float:
+        """Estimate how long until a rejected request could be admitted."""
+        hold_time = self.hold_time_ewma or 1.0
+        return max(1.0, hold_time * (self.queued + 1) / max(1, self.max_in_flight))
+
+    async def acquire(self) -> Permit:
+        """Wait for a permit, raising `AdmissionRejectedError` if the queue is full or times out."""
+        paused_for = self.paused_until - monotonic()
+        if paused_for > 0:
+            raise AdmissionRejectedError(self.name, paused_for)
+
+        if self.in_flight < self.max_in_flight and not self._waiters:
+            self.in_flight += 1
+            return Permit(self)
+
+        if len(self._waiters) >= self.max_queued:
+            raise AdmissionRejectedError(self.name, self.retry_after())
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.queue_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                # The permit was handed over as we gave up; pass it on
+                self._release(None)
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+            if isinstance(e, asyncio.TimeoutError):
+                raise AdmissionRejectedError(self.name, self.retry_after()) from None
+            raise
+        return Permit(self)
+
+    def record_success(self, latency: float | None = None) -> None:
+        """Feed a successful upstream call, and its latency sample if any, into the limit."""
+        if self.aimd is not None:
+            self.aimd.on_success(latency)
+            self._update_limit()
+
+    def record_error(self, error: BaseException) -> None:
+        """Feed a failed upstream call into the adaptive limit, if any."""
+        if self.aimd is None or not is_overload(error):
+            return
+        retry_after = get_retry_after(error)
+        if retry_after is not None:
+            self.paused_until = max(self.paused_until, monotonic() + retry_after)
+        self.aimd.on_overload()
+        self._update_limit()
+
+    def _update_limit(self) -> None:
+        assert self.aimd is not None
+        limit = int(self.aimd.limit)
+        if limit != self.max_in_flight:
+            logger.info(f"[Admission] Concurrency limit for {self.name}: {limit}")
+            self.max_in_flight = limit
+        # A raised limit admits queued requests right away
+        while self._waiters and self.in_flight < self.max_in_flight:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _release(self, hold_time: float | None) -> None:
+        if hold_time is not None:
+            self.hold_time_ewma = (
+                hold_time
+                if self.hold_time_ewma is None
+                else HOLD_TIME_ALPHA * hold_time + (1 - HOLD_TIME_ALPHA) * self.hold_time_ewma
+            )
+        # Hand the slot straight to the oldest waiter, if any, so it cannot be barged
+        while self._waiters and self.in_flight <= self.max_in_flight:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.in_flight -= 1
+
+
+class AdmissionController:
+    """
+    Per-model concurrency limiters, configured by `ModelConfig.max_in_flight`.
+
+    With `ModelConfig.adaptive_concurrency`, the limit starts at `max_in_flight` and adapts
+    between `min_in_flight` and `max_in_flight`.
+    """
+
+    def __init__(self) -> None:
+        self.limiters: dict[str, ConcurrencyLimiter] = {}
+
+    def get_limiter(self, model: ModelConfig | None) -> ConcurrencyLimiter | None:
+        """Return the limiter for `model`, or None if its concurrency is unlimited."""
+        if model is None or model.max_in_flight is None:
+            return None
+        limiter = self.limiters.get(model.id)
+        if limiter is None:
+            aimd = (
+                AIMDLimit(model.max_in_flight, model.min_in_flight, model.max_in_flight)
+                if model.adaptive_concurrency
+                else None
+            )
+            limiter = ConcurrencyLimiter(
+                model.id, model.max_in_flight, model.max_queued, model.queue_timeout, aimd
+            )
+            self.limiters[model.id] = limiter
+        return limiter
+
+    async def acquire(self, model: ModelConfig | None) -> Permit | None:
+        """Admit a request for `model`. Returns None if the model is not limited."""
+        limiter = self.get_limiter(model)
+        if limiter is None:
+            return None
+        return await limiter.acquire()
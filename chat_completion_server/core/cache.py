@@ -0,0 +1,118 @@
+import hashlib
+import json
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Generic, TypeVar
+
+from pydantic import BaseModel
+
+
+V = TypeVar("V")
+
+
+def canonical_hash(obj: Any) -> str:
+    """
+    Return a stable SHA-256 hex digest for a JSON-like object.
+
+    Dict keys are sorted and whitespace is stripped so that semantically equal
+    request params always produce the same key.
+    """
+    payload = json.dumps(
+        obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback serializer for values `json` cannot encode natively."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode="json", exclude_none=True)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+class LRUCache(Generic[V]):
+    """
+    In-process LRU cache bounded by entry count and total size, with per-entry TTLs.
+
+    Not thread-safe; intended to be used from a single event loop.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int | None = None):
+        """
+        Args:
+            max_entries: Maximum number of entries kept
+            max_bytes: Maximum total `size` of all entries. If None, only `max_entries` applies
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[V, float | None, int]] = OrderedDict()
+        self._size_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of all cached entries."""
+        return self._size_bytes
+
+    def get(self, key: str) -> V | None:
+        """Return the cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        value, expires_at, _ = entry
+        if expires_at is not None and expires_at <= monotonic():
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: V, ttl: float | None = None, size: int = 0) -> bool:
+        """
+        Store a value, evicting least recently used entries as needed.
+
+        Args:
+            key: Cache key
+            value: Value to cache
+            ttl: Time-to-live in seconds. If None, the entry never expires
+            size: Size accounted against `max_bytes`
+
+        Returns:
+            False if the value is larger than the cache and was not stored
+        """
+        if self.max_entries <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return False
+
+        if key in self._entries:
+            self._remove(key)
+
+        expires_at = monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at, size)
+        self._size_bytes += size
+
+        while len(self._entries) > self.max_entries or (
+            self.max_bytes is not None and self._size_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+        return True
+
+    def delete(self, key: str) -> None:
+        """Remove an entry if present."""
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        self._entries.clear()
+        self._size_bytes = 0
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self._size_bytes -= size
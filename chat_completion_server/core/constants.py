@@ -13,6 +13,11 @@ STREAMING_HEADERS = {
     "Cache-Control": "no-cache",
     "Connection": "keep-alive",
 }
+RETRY_AFTER_HEADER = "Retry-After"
 
 # Message roles
 ROLE_SYSTEM = "system"
+
+# Response cache
+CACHE_CONTROL_HEADER = "cache-control"
+CACHE_BYPASS_DIRECTIVES = ("no-cache", "no-store")
@@ -0,0 +1,105 @@
+import asyncio
+from collections import deque
+from logging import getLogger
+from time import monotonic
+from typing import Awaitable, Callable, Generic, TypeVar
+
+from pydantic import BaseModel
+
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+LATENCY_WINDOW = 256
+"""Number of recent latencies the hedge delay is computed from"""
+MIN_SAMPLES = 20
+"""Latencies required before hedging starts"""
+MAX_BUDGET = 10.0
+"""Most hedges that can be banked during quiet periods and spent in a burst"""
+
+
+class HedgingMetrics(BaseModel):
+    """Counters describing hedging activity."""
+
+    requests: int = 0
+    """Requests run through the hedger"""
+    hedged: int = 0
+    """Requests for which a second attempt was sent"""
+    hedge_wins: int = 0
+    """Hedged requests answered by the second attempt"""
+    budget_exhausted: int = 0
+    """Requests that would have been hedged but the budget was spent"""
+
+
+class Hedger(Generic[T]):
+    """
+    Sends a second, identical attempt when the first is slower than recent latency suggests.
+
+    The hedge delay is the `percentile` of recent successful latencies. Whichever attempt
+    finishes first wins and the other is cancelled. Each request earns `budget` hedge credit
+    and each hedge spends one, so hedging adds at most a `budget` fraction of extra load.
+    """
+
+    def __init__(self, percentile: float = 95.0, budget: float = 0.05):
+        """
+        Args:
+            percentile: Latency percentile (0-100) after which a hedge is sent
+            budget: Maximum fraction of extra attempts hedging may add
+        """
+        self.percentile = percentile
+        self.budget = budget
+        self.metrics = HedgingMetrics()
+        self._latencies: deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._credit = 0.0
+
+    def hedge_delay(self) -> float | None:
+        """Seconds to wait before hedging, or None if there are not enough samples yet."""
+        if len(self._latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self._latencies)
+        index = min(len(ordered) - 1, int(len(ordered) * self.percentile / 100))
+        return ordered[index]
+
+    def record_latency(self, latency: float) -> None:
+        """Record the latency of a successful attempt."""
+        self._latencies.append(latency)
+
+    async def run(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn`, hedging it with a second call if the first is slow."""
+        self.metrics.requests += 1
+        self._credit = min(self._credit + self.budget, MAX_BUDGET)
+        delay = self.hedge_delay()
+        start = monotonic()
+
+        primary = asyncio.ensure_future(fn())
+        attempts = [primary]
+        try:
+            if delay is not None:
+                await asyncio.wait(attempts, timeout=delay)
+
+            if not primary.done() and delay is not None:
+                if self._credit >= 1:
+                    self._credit -= 1
+                    self.metrics.hedged += 1
+                    logger.info(f"[Hedging] No response after {delay:.3f}s, sending hedge")
+                    attempts.append(asyncio.ensure_future(fn()))
+                else:
+                    self.metrics.budget_exhausted += 1
+
+            pending = set(attempts)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for attempt in attempts:
+                    if attempt in done and attempt.exception() is None:
+                        self.record_latency(monotonic() - start)
+                        if attempt is not primary:
+                            self.metrics.hedge_wins += 1
+                        return attempt.result()
+
+            # Every attempt failed; surface the primary's error
+            return primary.result()
+        finally:
+            for attempt in attempts:
+                if not attempt.done():
+                    attempt.cancel()
@@ -0,0 +1,135 @@
+import asyncio
+import contextvars
+import random
+from logging import getLogger
+from typing import Any, Awaitable, Callable
+
+from chat_completion_server.models.config import HookOverflowPolicy
+
+
+logger = getLogger(__name__)
+
+DROP_LOG_INTERVAL = 100
+"""Log one warning per this many dropped jobs"""
+
+Job = tuple[Callable[..., Awaitable[Any]], tuple[Any, ...], contextvars.Context]
+
+
+class HookExecutor:
+    """
+    Runs background hook jobs on a bounded queue served by a fixed pool of workers.
+
+    Jobs are `(fn, args, context)` triples; the coroutine is only created when a worker
+    picks the job up, so dropped jobs cost nothing. Like `asyncio.create_task`, each job
+    runs in a copy of the submitter's context, so context variables such as the request ID
+    carry over. When the queue is full, `policy` decides whether new jobs are dropped,
+    sampled or make the submitter wait.
+
+    Workers are started lazily on the running event loop, and restarted if the server is
+    used from a new loop.
+    """
+
+    def __init__(
+        self,
+        workers: int = 4,
+        max_queued: int = 1000,
+        policy: HookOverflowPolicy = HookOverflowPolicy.DROP,
+    ):
+        """
+        Args:
+            workers: Number of jobs run concurrently
+            max_queued: Maximum jobs waiting for a worker
+            policy: What to do with new jobs when the queue is full
+        """
+        self.workers = max(1, workers)
+        self.max_queued = max(1, max_queued)
+        self.policy = policy
+        self.dropped = 0
+        """Jobs discarded because the queue was full"""
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._queue: asyncio.Queue[Job] | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def submit(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> bool:
+        """
+        Queue `fn(*args)` to run in the background.
+
+        Only waits if the queue is full and the policy is BLOCK.
+
+        Returns:
+            False if the job was dropped
+        """
+        queue = self._ensure_started()
+        job = (fn, args, contextvars.copy_context())
+        if self.policy == HookOverflowPolicy.BLOCK:
+            await queue.put(job)
+            return True
+
+        if self.policy == HookOverflowPolicy.SAMPLE and not self._sample(queue.qsize()):
+            return self._drop(fn)
+        try:
+            queue.put_nowait(job)
+        except asyncio.QueueFull:
+            return self._drop(fn)
+        return True
+
+    async def drain(self, timeout: float | None = None) -> None:
+        """
+        Wait for queued and running jobs to finish, then stop the workers.
+
+        Jobs still pending after `timeout` seconds are cancelled.
+        """
+        queue = self._queue
+        if queue is None or self._loop is not asyncio.get_running_loop():
+            return
+        try:
+            await asyncio.wait_for(queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"[HookExecutor] Drain timed out; cancelling {queue.qsize()} queued jobs"
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+    def _ensure_started(self) -> asyncio.Queue[Job]:
+        loop = asyncio.get_running_loop()
+        if self._queue is None or self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue(self.max_queued)
+            self._tasks = [
+                loop.create_task(self._work(self._queue)) for _ in range(self.workers)
+            ]
+        return self._queue
+
+    def _sample(self, queued: int) -> bool:
+        """Accept every job below half capacity, then a linearly shrinking fraction."""
+        half = self.max_queued / 2
+        if queued < half:
+            return True
+        return random.random() < (self.max_queued - queued) / half
+
+    def _drop(self, fn: Callable[..., Awaitable[Any]]) -> bool:
+        self.dropped += 1
+        if (self.dropped - 1) % DROP_LOG_INTERVAL == 0:
+            name = getattr(fn, "__name__", fn)
+            logger.warning(f"[HookExecutor] Hook queue full; dropped {name} ({self.dropped} total)")
+        return False
+
+    async def _work(self, queue: asyncio.Queue[Job]) -> None:
+        while True:
+            fn, args, context = await queue.get()
+            try:
+                await asyncio.get_running_loop().create_task(fn(*args), context=context)
+            except Exception:
+                logger.exception("[HookExecutor] Error in background hook")
+            finally:
+                queue.task_done()
@@ -0,0 +1,207 @@
+from logging import getLogger
+from time import monotonic
+from typing import Any, AsyncIterator
+
+import httpx
+from openai.lib.streaming.chat import AsyncChatCompletionStreamManager
+from openai.types.chat import ChatCompletion, CompletionCreateParams
+
+from chat_completion_server.core.proxy_handler import OpenAIProxyHandler, ProxyHandler
+from chat_completion_server.core.resilience import CircuitState
+from chat_completion_server.core.transport import create_http_client
+from chat_completion_server.models.config import (
+    LoadBalancingStrategy,
+    ProxyConfig,
+    UpstreamTarget,
+)
+
+
+logger = getLogger(__name__)
+
+EWMA_ALPHA = 0.3
+"""Weight of the newest sample in the latency and error EWMAs"""
+ERROR_HALF_LIFE = 30.0
+"""Seconds for the error EWMA to halve without new samples, so failed upstreams are retried"""
+ERROR_PENALTY = 10.0
+"""Score multiplier applied per unit of error rate"""
+DEFAULT_REFERENCE_LATENCY = 1.0
+"""Latency in seconds assumed for failing upstreams while no target has a measured latency"""
+
+
+class UpstreamStats:
+    """Live load and health statistics for one upstream target."""
+
+    def __init__(self, target: UpstreamTarget):
+        self.target = target
+        self.weight = max(target.weight, 1e-6)
+        self.outstanding = 0
+        self.latency_ewma: float | None = None
+        self.tried = False
+        self.current_weight = 0.0
+        self._error_ewma = 0.0
+        self._error_updated_at = monotonic()
+
+    @property
+    def error_rate(self) -> float:
+        """Recent error rate, decayed towards 0 while no new samples arrive."""
+        elapsed = monotonic() - self._error_updated_at
+        return self._error_ewma * 0.5 ** (elapsed / ERROR_HALF_LIFE)
+
+    def record(self, latency: float, error: bool) -> None:
+        """Record the outcome of a request to this upstream."""
+        if not error:
+            self.latency_ewma = (
+                latency
+                if self.latency_ewma is None
+                else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.latency_ewma
+            )
+        self._error_ewma = EWMA_ALPHA * float(error) + (1 - EWMA_ALPHA) * self.error_rate
+        self._error_updated_at = monotonic()
+        self.tried = True
+
+    def ewma_score(self, reference_latency: float) -> float:
+        """
+        Expected cost of sending one more request here; lower is better.
+
+        Args:
+            reference_latency: Latency assumed for upstreams that have only failed so far,
+                normally the lowest latency measured on any target
+        """
+        if self.latency_ewma is not None:
+            latency = self.latency_ewma
+        elif self.tried:
+            # Errors carry no usable latency, so score error-only upstreams like the fastest
+            # target; the error penalty then puts them behind it
+            latency = reference_latency
+        else:
+            # Untried upstreams score 0 so they get explored first
+            latency = 0.0
+        penalty = 1 + ERROR_PENALTY * self.error_rate
+        return latency * (self.outstanding + 1) * penalty / self.weight
+
+
+class LoadBalancedProxyHandler(ProxyHandler):
+    """
+    Handler that spreads requests across several OpenAI-compatible upstreams.
+
+    Each target gets its own `OpenAIProxyHandler`; all of them share one connection pool.
+    The target for each request is picked by `config.load_balancing_strategy`, using live
+    latency/error EWMAs and outstanding request counts. Streaming requests opened through
+    the SDK stream manager are balanced but not measured, since the stream is consumed
+    after `execute()` returns.
+    """
+
+    def __init__(
+        self,
+        config: ProxyConfig,
+        targets: list[UpstreamTarget] | None = None,
+        strategy: LoadBalancingStrategy | None = None,
+        http_client: httpx.AsyncClient | None = None,
+    ):
+        """
+        Args:
+            config: Server configuration
+            targets: Upstreams to balance across. Defaults to `config.upstream_targets`, or
+                `config.upstream_url` alone if that is empty
+            strategy: Target selection strategy. Defaults to `config.load_balancing_strategy`
+            http_client: Shared upstream HTTP client. Defaults to one built from `config`
+        """
+        self.config = config
+        self.strategy = strategy or config.load_balancing_strategy
+        targets = targets or config.upstream_targets or [UpstreamTarget(url=config.upstream_url)]
+        http_client = http_client or create_http_client(config)
+
+        self.stats = [UpstreamStats(target) for target in targets]
+        self.handlers = [
+            OpenAIProxyHandler(
+                config.model_copy(
+                    update={
+                        "upstream_url": target.url,
+                        "upstream_api_key": target.api_key or config.upstream_api_key,
+                    }
+                ),
+                http_client,
+            )
+            for target in targets
+        ]
+
+    def select(self) -> int:
+        """Return the index of the target the next request should go to."""
+        # Skip targets whose circuit is open, unless all of them are
+        candidates = [
+            i
+            for i, handler in enumerate(self.handlers)
+            if handler.guard.breaker.state != CircuitState.OPEN
+        ] or list(range(len(self.handlers)))
+
+        if self.strategy == LoadBalancingStrategy.WEIGHTED_ROUND_ROBIN:
+            total = 0.0
+            for i in candidates:
+                self.stats[i].current_weight += self.stats[i].weight
+                total += self.stats[i].weight
+            index = max(candidates, key=lambda i: self.stats[i].current_weight)
+            self.stats[index].current_weight -= total
+            return index
+
+        if self.strategy == LoadBalancingStrategy.LEAST_OUTSTANDING:
+            return min(candidates, key=lambda i: self.stats[i].outstanding / self.stats[i].weight)
+
+        reference_latency = min(
+            (self.stats[i].latency_ewma for i in candidates if self.stats[i].latency_ewma),
+            default=DEFAULT_REFERENCE_LATENCY,
+        )
+        return min(
+            candidates,
+            key=lambda i: (self.stats[i].ewma_score(reference_latency), self.stats[i].outstanding),
+        )
+
+    async def execute(
+        self, params: CompletionCreateParams
+    ) -> ChatCompletion | AsyncChatCompletionStreamManager[Any]:
+        """Forward request to the selected upstream."""
+        if params.get("stream"):
+            return await self.handlers[self.select()].execute(params)
+        return await self.execute_non_streaming(params)
+
+    async def execute_non_streaming(self, params: CompletionCreateParams) -> ChatCompletion:
+        """Execute a non-streaming request on the selected upstream, recording its outcome."""
+        index = self.select()
+        stats = self.stats[index]
+        stats.outstanding += 1
+        start = monotonic()
+        try:
+            response = await self.handlers[index].execute_non_streaming(params)
+        except Exception:
+            stats.record(monotonic() - start, error=True)
+            raise
+        else:
+            stats.record(monotonic() - start, error=False)
+            return response
+        finally:
+            stats.outstanding -= 1
+
+    async def execute_raw_stream(self, params: CompletionCreateParams) -> AsyncIterator[bytes]:
+        """Open a raw stream on the selected upstream, measuring time until it responds."""
+        stream = self._relay_raw_stream(params)
+        # Open the upstream response now so its errors surface before the client response
+        await anext(stream)
+        return stream
+
+    async def _relay_raw_stream(self, params: CompletionCreateParams) -> AsyncIterator[bytes]:
+        """Open the upstream stream, yield an empty marker, then relay the stream's bytes."""
+        index = self.select()
+        stats = self.stats[index]
+        stats.outstanding += 1
+        start = monotonic()
+        try:
+            try:
+                raw_stream = await self.handlers[index].execute_raw_stream(params)
+            except Exception:
+                stats.record(monotonic() - start, error=True)
+                raise
+            stats.record(monotonic() - start, error=False)
+            yield b""
+            async for data in raw_stream:
+                yield data
+        finally:
+            stats.outstanding -= 1
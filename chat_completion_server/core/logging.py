@@ -1,7 +1,12 @@
+import atexit
+import json
 import logging
+import random
 import sys
 import uuid
 from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from queue import Full, Queue
 from typing import Optional
 
 # Context variable to store request ID
@@ -19,10 +24,98 @@ class RequestIdFilter(logging.Filter):
         return True
 
 
-def setup_logging():
+class SamplingFilter(logging.Filter):
+    """
+    Logging filter that keeps only a fraction of records from selected loggers.
+
+    Rates apply to a logger and its children, the most specific prefix winning. Records at
+    WARNING or above are always kept.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING or not self.rates:
+            return True
+        rate = self._get_rate(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+    def _get_rate(self, name: str) -> float:
+        while True:
+            if name in self.rates:
+                return self.rates[name]
+            if "." not in name:
+                return self.rates.get("", 1.0)
+            name = name.rsplit(".", 1)[0]
+
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formats records as single-line JSON objects.
+    """
+
+    def format(self, record):
+        entry = {
+            "timestamp": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """
+    Queue handler that never blocks the logging thread.
+
+    Unlike `QueueHandler`, records are queued unformatted: the message and the formatter
+    run on the listener's writer thread. Arguments passed to a log call must therefore
+    not be mutated afterwards. When the queue is full, records are dropped and counted.
+    """
+
+    def __init__(self, queue: Queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except Full:
+            self.dropped += 1
+
+
+_listener: QueueListener | None = None
+
+
+def setup_logging(
+    json_output: bool = False,
+    sample_rates: dict[str, float] | None = None,
+    max_queued: int = 10000,
+):
     """
     Configure logging with request ID tracking.
+
+    Records are handed to a bounded queue and written to stdout by a background thread,
+    so a slow log consumer never stalls the event loop. The request ID and sampling
+    filters run on the calling side, where the request context is available.
+
+    Args:
+        json_output: Write one JSON object per record instead of plain text
+        sample_rates: Fraction of records below WARNING to keep, by logger name
+        max_queued: Maximum records waiting to be written; further records are dropped
     """
+    global _listener
+
     # Get the root logger
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
@@ -30,33 +123,52 @@ def setup_logging():
     # Remove existing handlers to avoid duplicates
     for handler in logger.handlers[:]:
         logger.removeHandler(handler)
+    _stop_listener()
 
-    # Create console handler
+    # Create console handler, written to from the listener thread
     handler = logging.StreamHandler(sys.stdout)
     handler.setLevel(logging.INFO)
 
     # Create formatter with request ID
-    formatter = logging.Formatter(
-        "%(asctime)s - [%(levelname)s] - (%(request_id)s) - (%(name)s) -  %(message)s"
-    )
+    if json_output:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(
+            "%(asctime)s - [%(levelname)s] - (%(request_id)s) - (%(name)s) -  %(message)s"
+        )
     handler.setFormatter(formatter)
 
-    # Add request ID filter
-    handler.addFilter(RequestIdFilter())
+    # Add request ID and sampling filters to the queue handler, in the caller's context
+    queue_handler = NonBlockingQueueHandler(Queue(max_queued))
+    queue_handler.addFilter(RequestIdFilter())
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
 
     # Add handler to logger
-    logger.addHandler(handler)
+    logger.addHandler(queue_handler)
+
+    _listener = QueueListener(queue_handler.queue, handler, respect_handler_level=True)
+    _listener.start()
+    # Flush queued records on exit
+    atexit.register(_stop_listener)
 
     # optionally add file logging handler
     # if True:
     #     file_handler = logging.FileHandler("app.log")
     #     file_handler.setLevel(logging.INFO)
     #     file_handler.setFormatter(formatter)
-    #     logger.addHandler(file_handler)
+    #     _listener.handlers += (file_handler,)
 
     return logger
 
 
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def get_request_id() -> str:
     """
     Get the current request ID from context or return None.
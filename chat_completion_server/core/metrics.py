@@ -0,0 +1,274 @@
+from bisect import bisect_left
+from math import inf
+from typing import Iterable
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+"""Default histogram buckets (in seconds), from sub-chunk gaps to full upstream timeouts"""
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10)
+"""Histogram buckets for small counts, such as tool rounds per request"""
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""Content type of the Prometheus text exposition format"""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class for a metric family with a fixed set of label names."""
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+
+    def _format_labels(self, label_values: tuple[str, ...], extra: str = "") -> str:
+        pairs = [
+            f'{name}="{_escape(str(value))}"' for name, value in zip(self.label_names, label_values)
+        ]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError("_samples() shall be impl'd by child class")
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {_escape(self.documentation)}",
+            f"# TYPE {self.name} {self.type}",
+            *self._samples(),
+        ]
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value, e.g. requests served."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def set_total(self, *label_values: str, value: float) -> None:
+        """Set the total directly, for counters mirrored from another source at scrape time."""
+        self._values[label_values] = value
+
+    def get(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{self._format_labels(labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Gauge(Metric):
+    """Value that can go up and down, e.g. requests in flight."""
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, label_names: Iterable[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def set(self, *label_values: str, value: float) -> None:
+        self._values[label_values] = value
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1.0) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def get(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0.0)
+
+    def _samples(self) -> list[str]:
+        return [
+            f"{self.name}{self._format_labels(labels)} {_format_value(value)}"
+            for labels, value in self._values.items()
+        ]
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets, e.g. latencies."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., count above the last bucket], sum
+        self._values: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        entry = self._values.get(label_values)
+        if entry is None:
+            entry = ([0] * (len(self.buckets) + 1), [0.0])
+            self._values[label_values] = entry
+        counts, total = entry
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def get_count(self, *label_values: str) -> int:
+        entry = self._values.get(label_values)
+        return sum(entry[0]) if entry is not None else 0
+
+    def get_sum(self, *label_values: str) -> float:
+        entry = self._values.get(label_values)
+        return entry[1][0] if entry is not None else 0.0
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{self._format_labels(labels, le)} {cumulative}"
+                )
+            label_str = self._format_labels(labels)
+            lines.append(f"{self.name}_sum{label_str} {_format_value(total[0])}")
+            lines.append(f"{self.name}_count{label_str} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together in the Prometheus text format."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, label_names))  # type: ignore[return-value]
+
+    def gauge(self, name: str, documentation: str, label_names: Iterable[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names))  # type: ignore[return-value]
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(  # type: ignore[return-value]
+            Histogram(name, documentation, label_names, buckets)
+        )
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+class ServerMetrics:
+    """Metrics recorded by `ChatCompletionServer` and exposed on `/metrics`."""
+
+    def __init__(self, registry: MetricsRegistry | None = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+
+        self.http_requests = r.counter(
+            "http_requests_total",
+            "HTTP requests by route, method and status",
+            ("route", "method", "status"),
+        )
+        self.http_request_duration = r.histogram(
+            "http_request_duration_seconds", "HTTP request latency by route", ("route", "method")
+        )
+        self.requests = r.counter(
+            "chat_requests_total",
+            "Chat completion requests by model, streaming and outcome",
+            ("model", "stream", "outcome"),
+        )
+        self.request_duration = r.histogram(
+            "chat_request_duration_seconds",
+            "Chat completion latency, until the last byte for streams",
+            ("model", "stream"),
+        )
+        self.requests_in_flight = r.gauge(
+            "chat_requests_in_flight", "Chat completion requests being processed", ("model",)
+        )
+        self.upstream_duration = r.histogram(
+            "upstream_request_duration_seconds",
+            "Non-streaming upstream call latency, including hedging",
+            ("model", "outcome"),
+        )
+        self.time_to_first_token = r.histogram(
+            "stream_time_to_first_token_seconds",
+            "Time from request start to the first streamed byte sent",
+            ("model",),
+        )
+        self.upstream_time_to_first_chunk = r.histogram(
+            "stream_upstream_time_to_first_chunk_seconds",
+            "Time from issuing an upstream stream request to its first chunk",
+        )
+        self.inter_token = r.histogram(
+            "stream_inter_token_seconds", "Gap between streamed frames sent", ("model",)
+        )
+        self.tool_rounds = r.histogram(
+            "tool_rounds", "Tool rounds per request", ("stream",), buckets=COUNT_BUCKETS
+        )
+        self.tool_calls = r.counter(
+            "tool_calls_total", "Tool calls by tool and outcome", ("tool", "outcome")
+        )
+        self.tool_duration = r.histogram(
+            "tool_call_duration_seconds", "Tool call latency", ("tool",)
+        )
+        self.hook_duration = r.histogram(
+            "plugin_hook_duration_seconds", "Plugin hook latency", ("plugin", "hook")
+        )
+        self.hook_jobs_queued = r.gauge(
+            "plugin_hook_jobs_queued", "Background hook jobs waiting for a worker"
+        )
+        self.hook_jobs_dropped = r.counter(
+            "plugin_hook_jobs_dropped_total", "Background hook jobs dropped on a full queue"
+        )
+        self.admission_in_flight = r.gauge(
+            "admission_in_flight", "Requests holding an admission permit", ("model",)
+        )
+        self.admission_queued = r.gauge(
+            "admission_queued", "Requests waiting for an admission permit", ("model",)
+        )
+        self.admission_limit = r.gauge(
+            "admission_limit", "Current concurrency limit", ("model",)
+        )
+        self.hedged_requests = r.counter(
+            "hedged_requests_total", "Requests for which a hedge was sent", ("model",)
+        )
+        self.hedge_wins = r.counter(
+            "hedge_wins_total", "Hedged requests answered by the hedge", ("model",)
+        )
+
+    def render(self) -> str:
+        return self.registry.render()
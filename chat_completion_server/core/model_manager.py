@@ -1,4 +1,5 @@
 from logging import getLogger
+from typing import Any
 
 from openai.types.chat import CompletionCreateParams
 
@@ -9,77 +10,150 @@ from chat_completion_server.models.model import ModelConfig, SystemPromptBehavio
 logger = getLogger(__name__)
 
 
+class TransformPlan:
+    """
+    The request transformations of one model, precomputed when the model is registered.
+    """
+
+    __slots__ = (
+        "upstream_model",
+        "system_prompt",
+        "system_prompt_behavior",
+        "prefix",
+        "suffix",
+        "transform_params",
+        "is_noop",
+    )
+
+    def __init__(self, model: ModelConfig):
+        self.upstream_model = model.upstream_model
+        self.system_prompt = model.system_prompt
+        self.system_prompt_behavior = (
+            model.system_prompt_behavior
+            if model.system_prompt
+            else SystemPromptBehavior.PASSTHROUGH
+        )
+        self.prefix = f"{model.system_prompt}\n\n"
+        self.suffix = f"\n\n{model.system_prompt}"
+        self.transform_params = model.transform_params
+        # Requests for the model are forwarded unchanged
+        self.is_noop = (
+            not self.upstream_model
+            and self.system_prompt_behavior == SystemPromptBehavior.PASSTHROUGH
+            and self.transform_params is None
+        )
+
+
 class ModelManager:
-    """Manages model configurations and applies model-specific transformations."""
+    """
+    Manages model configurations and applies model-specific transformations.
+
+    `models` is copy-on-write: changes replace the dict instead of mutating it, so callers
+    holding a reference keep a consistent snapshot. Each model's transformations are
+    compiled into a `TransformPlan` when it is registered.
+    """
 
     def __init__(self, models: dict[str, ModelConfig] | None = None):
-        self.models = models or {}
+        self.replace_models(models or {})
 
     def register_model(self, model: ModelConfig) -> None:
         """Register a custom model configuration."""
-        self.models[model.id] = model
+        self.replace_models({**self.models, model.id: model})
+
+    def replace_models(self, models: dict[str, ModelConfig]) -> None:
+        """Atomically replace all model configurations."""
+        plans = {model_id: TransformPlan(model) for model_id, model in models.items()}
+        self.models = dict(models)
+        self._plans = plans
+
+    def get_model(self, model_id: str | None) -> ModelConfig | None:
+        """Return the configuration registered for `model_id`, if any."""
+        if not model_id:
+            return None
+        return self.models.get(model_id)
 
     def apply_model_config(self, params: CompletionCreateParams) -> CompletionCreateParams:
         """
         Apply model-specific configuration to request params.
         Replace the `model` field with the predefined upstream model.
+
+        The caller's params, message list and messages are never modified: params are
+        shallow-copied if anything changes, and only the message that changes is copied.
         """
         model_id = params.get("model")
-        if not model_id or model_id not in self.models:
+        plan = self._plans.get(model_id) if model_id else None
+        if plan is None or plan.is_noop:
             return params
 
-        model = self.models[model_id]
+        params = dict(params)  # type: ignore[assignment]
 
         # Map to upstream model name if specified
-        if model.upstream_model:
-            params["model"] = model.upstream_model
+        if plan.upstream_model:
+            params["model"] = plan.upstream_model
 
         # Apply system prompt behavior
-        if model.system_prompt:
-            params = self._apply_system_prompt(params, model)
+        if plan.system_prompt_behavior != SystemPromptBehavior.PASSTHROUGH:
+            params = self._apply_system_prompt(params, plan)
 
         # Apply custom transform
-        if model.transform_params:
-            params = model.transform_params(params)
+        if plan.transform_params:
+            params = plan.transform_params(params)
 
         return params
 
     def _apply_system_prompt(
-        self, params: CompletionCreateParams, model: ModelConfig
+        self, params: CompletionCreateParams, plan: TransformPlan
     ) -> CompletionCreateParams:
         """Apply system prompt based on model's behavior."""
-        if (
-            model.system_prompt_behavior == SystemPromptBehavior.PASSTHROUGH
-            or not model.system_prompt
-        ):
-            return params
-
-        messages = list(params.get("messages", []))
+        messages = params.get("messages")
         if not messages:
             return params
 
-        # attempt to find existing system message
-        system_msg_idx = next(
-            (i for i, m in enumerate(messages) if m.get("role") == ROLE_SYSTEM), None
-        )
         try:
+            system_msg_idx = _find_system_message(messages)
+            behavior = plan.system_prompt_behavior
             if system_msg_idx is None:
-                messages.insert(0, {"role": ROLE_SYSTEM, "content": model.system_prompt})
-            elif model.system_prompt_behavior == SystemPromptBehavior.OVERRIDE:
-                messages[system_msg_idx]["content"] = model.system_prompt
-            elif model.system_prompt_behavior == SystemPromptBehavior.PREPEND:
-                existing = messages[system_msg_idx][
-                    "content"
-                ]  # pyright: ignore[reportTypedDictNotRequiredAccess]
-                messages[system_msg_idx]["content"] = f"{model.system_prompt}\n\n{existing}"
-            elif model.system_prompt_behavior == SystemPromptBehavior.APPEND:
-                existing = messages[system_msg_idx][
-                    "content"
-                ]  # pyright: ignore[reportTypedDictNotRequiredAccess]
-                messages[system_msg_idx]["content"] = f"{existing}\n\n{model.system_prompt}"
+                messages = [{"role": ROLE_SYSTEM, "content": plan.system_prompt}, *messages]
+            elif behavior == SystemPromptBehavior.DEFAULT:
+                return params
+            else:
+                existing = messages[system_msg_idx].get("content")
+                if behavior == SystemPromptBehavior.OVERRIDE:
+                    content: Any = plan.system_prompt
+                elif behavior == SystemPromptBehavior.PREPEND:
+                    content = _prepend_content(plan, existing)
+                elif behavior == SystemPromptBehavior.APPEND:
+                    content = _append_content(plan, existing)
+                else:
+                    return params
+                messages = list(messages)
+                messages[system_msg_idx] = {**messages[system_msg_idx], "content": content}
         except Exception:
             logger.exception("[ModelManager] Error while applying ModelConfig.system_prompt")
             return params
 
         params["messages"] = messages
         return params
+
+
+def _find_system_message(messages: Any) -> int | None:
+    """Return the index of the first system message, checking the usual first slot first."""
+    if messages[0].get("role") == ROLE_SYSTEM:
+        return 0
+    return next((i for i, m in enumerate(messages) if m.get("role") == ROLE_SYSTEM), None)
+
+
+def _prepend_content(plan: TransformPlan, existing: Any) -> Any:
+    if not existing:
+        return plan.system_prompt
+    if isinstance(existing, list):
+        return [{"type": "text", "text": plan.system_prompt}, *existing]
+    return plan.prefix + existing
+
+
+def _append_content(plan: TransformPlan, existing: Any) -> Any:
+    if not existing:
+        return plan.system_prompt
+    if isinstance(existing, list):
+        return [*existing, {"type": "text", "text": plan.system_prompt}]
+    return existing + plan.suffix
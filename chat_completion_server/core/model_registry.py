@@ -0,0 +1,156 @@
+import asyncio
+import json
+import os
+from logging import getLogger
+from pathlib import Path
+from typing import Any, Callable
+
+from pydantic import ValidationError
+
+from chat_completion_server.core.model_manager import ModelManager
+from chat_completion_server.models.model import ModelConfig
+
+
+logger = getLogger(__name__)
+
+YAML_SUFFIXES = (".yaml", ".yml")
+
+
+class ModelRegistryError(ValueError):
+    """Raised when a models file cannot be read or fails validation."""
+
+
+def load_models_file(path: str | Path) -> dict[str, ModelConfig]:
+    """
+    Read and validate model configurations from a JSON or YAML file.
+
+    The file holds a list of `ModelConfig` objects, either at the top level or under a
+    `models` key. YAML requires PyYAML to be installed.
+
+    Raises:
+        ModelRegistryError: If the file cannot be read or parsed, or a model is invalid
+    """
+    path = Path(path)
+    try:
+        text = path.read_text(encoding="utf-8")
+        data = _parse(text, path.suffix.lower())
+    except (OSError, ValueError) as e:
+        raise ModelRegistryError(f"Cannot read models file {path}: {e}") from e
+
+    if isinstance(data, dict):
+        data = data.get("models")
+    if not isinstance(data, list):
+        raise ModelRegistryError(f"Models file {path} must contain a list of models")
+
+    models: dict[str, ModelConfig] = {}
+    for index, entry in enumerate(data):
+        try:
+            model = ModelConfig.model_validate(entry)
+        except ValidationError as e:
+            raise ModelRegistryError(f"Invalid model #{index} in {path}: {e}") from e
+        if model.id in models:
+            raise ModelRegistryError(f"Duplicate model id {model.id!r} in {path}")
+        models[model.id] = model
+    return models
+
+
+def _parse(text: str, suffix: str) -> Any:
+    if suffix not in YAML_SUFFIXES:
+        return json.loads(text)
+    try:
+        import yaml
+    except ImportError:
+        raise ValueError("YAML models files require PyYAML (`pip install pyyaml`)")
+    try:
+        return yaml.safe_load(text)
+    except yaml.YAMLError as e:
+        raise ValueError(str(e)) from e
+
+
+class ModelRegistry:
+    """
+    Keeps a `ModelManager` in sync with a models file.
+
+    Each reload validates the whole file first and then swaps in a new models dict, so a
+    bad file never replaces a good configuration. Requests that already looked up their
+    `ModelConfig` keep using it. Models defined in code (`base_models`) are always kept;
+    file entries with the same id replace them.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        model_manager: ModelManager,
+        base_models: dict[str, ModelConfig] | None = None,
+        poll_interval: float = 5.0,
+        on_reload: Callable[[dict[str, ModelConfig], dict[str, ModelConfig]], None] | None = None,
+    ):
+        """
+        Args:
+            path: JSON or YAML models file
+            model_manager: Manager whose models are replaced on reload
+            base_models: Models defined in code, merged under the file's models
+            poll_interval: Seconds between checks of the file for changes. 0 disables watching
+            on_reload: Called with the previous and new models after each swap
+        """
+        self.path = Path(path)
+        self.model_manager = model_manager
+        self.base_models = dict(base_models or {})
+        self.poll_interval = poll_interval
+        self.on_reload = on_reload
+        self._signature: tuple[int, int] | None = None
+        self._task: asyncio.Task | None = None
+
+    def reload(self) -> bool:
+        """
+        Load the models file and swap it in if it changed.
+
+        Returns:
+            True if the models changed
+
+        Raises:
+            ModelRegistryError: If the file is invalid. The current models are kept
+        """
+        signature = self._stat()
+        models = {**self.base_models, **load_models_file(self.path)}
+        self._signature = signature
+
+        previous = self.model_manager.models
+        if models == previous:
+            return False
+        self.model_manager.replace_models(models)
+        logger.info(f"[ModelRegistry] Loaded {len(models)} models from {self.path}")
+        if self.on_reload is not None:
+            self.on_reload(previous, models)
+        return True
+
+    def start(self) -> None:
+        """Start watching the models file on the running event loop."""
+        if self.poll_interval > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self) -> None:
+        """Stop watching the models file."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _watch(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            if self._stat() == self._signature:
+                continue
+            try:
+                self.reload()
+            except ModelRegistryError as e:
+                logger.error(f"[ModelRegistry] Keeping current models: {e}")
+                # Do not retry the same broken file until it changes again
+                self._signature = self._stat()
+
+    def _stat(self) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
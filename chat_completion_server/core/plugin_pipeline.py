@@ -0,0 +1,94 @@
+from typing import Any, Awaitable, Callable, Sequence
+
+from openai.types.chat import ChatCompletion, CompletionCreateParams
+
+from chat_completion_server.models.plugin import ProxyPlugin, StreamEvents
+
+
+STREAM_EVENTS_ORDER = (StreamEvents.NONE, StreamEvents.CHUNKS, StreamEvents.ALL)
+
+AfterRequestHook = Callable[[CompletionCreateParams, ChatCompletion], Awaitable[None]]
+
+
+def get_stream_events_mode(plugin: ProxyPlugin) -> StreamEvents:
+    """Return the plugin's `stream_events` mode, defaulting to ALL if it does not declare one."""
+    mode = getattr(plugin, "stream_events", StreamEvents.ALL)
+    return mode if isinstance(mode, StreamEvents) else StreamEvents.ALL
+
+
+def mutates_params(plugin: ProxyPlugin) -> bool:
+    """Return whether the plugin's before_request may modify params, defaulting to True."""
+    return getattr(plugin, "mutates_params", True) is not False
+
+
+def overrides_hook(plugin: Any, hook: str) -> bool:
+    """
+    Check whether `plugin` implements `hook` itself rather than inheriting the no-op default.
+
+    Objects that are not `ProxyPlugin` instances are assumed to implement every hook.
+    """
+    if not isinstance(plugin, ProxyPlugin):
+        return True
+    if hook in vars(plugin):
+        return True
+    return getattr(type(plugin), hook) is not getattr(ProxyPlugin, hook)
+
+
+class PluginPipeline:
+    """
+    Per-hook plugin lists, compiled once from the server's plugins.
+
+    Each list only holds plugins that override the hook, in plugin order, so requests do
+    not await default no-op coroutines. Plugins relying on the default
+    `after_request_async` are called through their `after_stream_async` directly.
+
+    Compiled lists do not see later changes to the plugins' hook attributes; recompile by
+    building a new pipeline.
+    """
+
+    def __init__(self, plugins: Sequence[ProxyPlugin]):
+        self.plugins = list(plugins)
+
+        self.before_request: list[ProxyPlugin] = []
+        """Plugins whose before_request modifies params; run in order"""
+        self.validators: list[ProxyPlugin] = []
+        """Plugins whose before_request is read-only; run concurrently"""
+        for plugin in self.plugins:
+            if overrides_hook(plugin, "before_request"):
+                if mutates_params(plugin):
+                    self.before_request.append(plugin)
+                else:
+                    self.validators.append(plugin)
+
+        self.after_request: list[tuple[ProxyPlugin, AfterRequestHook]] = []
+        """Plugins and the hook to call after a non-streaming response"""
+        for plugin in self.plugins:
+            if overrides_hook(plugin, "after_request_async"):
+                self.after_request.append((plugin, plugin.after_request_async))
+            elif overrides_hook(plugin, "after_stream_async"):
+                self.after_request.append((plugin, _after_stream_without_events(plugin)))
+
+        self.after_stream = [p for p in self.plugins if overrides_hook(p, "after_stream_async")]
+        self.after_stream_timing = [
+            p for p in self.plugins if overrides_hook(p, "after_stream_timing_async")
+        ]
+        self.on_error = [p for p in self.plugins if overrides_hook(p, "on_error_async")]
+
+        self.stream_events = max(
+            (get_stream_events_mode(plugin) for plugin in self.after_stream),
+            key=STREAM_EVENTS_ORDER.index,
+            default=StreamEvents.NONE,
+        )
+        """Widest `stream_events` mode among plugins with an after_stream_async hook"""
+
+    @property
+    def has_stream_hooks(self) -> bool:
+        """Whether any plugin needs the final completion of a stream."""
+        return bool(self.after_stream or self.after_stream_timing)
+
+
+def _after_stream_without_events(plugin: ProxyPlugin) -> AfterRequestHook:
+    async def hook(params: CompletionCreateParams, response: ChatCompletion) -> None:
+        await plugin.after_stream_async(params, response, [])
+
+    return hook
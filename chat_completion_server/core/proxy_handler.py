@@ -1,10 +1,13 @@
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, AsyncIterator
 
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, omit
 from openai.types.chat import ChatCompletion, CompletionCreateParams
 from openai.lib.streaming.chat import AsyncChatCompletionStreamManager
 
+from chat_completion_server.core.resilience import GuardedStreamManager, UpstreamGuard
+from chat_completion_server.core.transport import create_http_client
 from chat_completion_server.models.config import ProxyConfig
 
 
@@ -39,37 +42,104 @@ class ProxyHandler(ABC):
         """Execute a non-streaming request. Return `ChatCompletion`."""
         raise NotImplementedError("execute_non_streaming() shall be impl'd by child class")
 
+    async def execute_raw_stream(self, params: CompletionCreateParams) -> AsyncIterator[bytes]:
+        """
+        Execute a streaming request and return the upstream SSE bytes, unparsed.
+
+        The upstream response should be opened before returning, so that connection errors,
+        error statuses and an open circuit are raised here, before a response is sent to the
+        client; only reading the body is left to the returned iterator.
+
+        Optional; only required when `ProxyConfig.stream_passthrough` is enabled.
+        """
+        raise NotImplementedError("execute_raw_stream() is not supported by this handler")
+
+
 class OpenAIProxyHandler(ProxyHandler):
-    """Default handler that proxies to an OpenAI-compatible API."""
+    """
+    Default handler that proxies to an OpenAI-compatible API.
+
+    Upstream calls go through an `UpstreamGuard`: a circuit breaker that fails fast while the
+    upstream is down, and retries bounded by a retry budget instead of the SDK's own retries.
+    """
 
-    def __init__(self, config: ProxyConfig):
+    def __init__(self, config: ProxyConfig, http_client: httpx.AsyncClient | None = None):
+        """
+        Args:
+            config: Server configuration
+            http_client: Shared upstream HTTP client. Defaults to one built from `config`
+        """
         self.config = config
+        self.http_client = http_client or create_http_client(config)
         self.client = AsyncOpenAI(
             base_url=config.upstream_url,
             api_key=config.upstream_api_key or "dummy",
-            timeout=20.0,  # in seconds
+            timeout=config.proxy_timeout,
+            max_retries=0,
+            http_client=self.http_client,
         )
-        self.high_timeout_client = AsyncOpenAI(
-            base_url=config.upstream_url,
-            api_key=config.upstream_api_key or "dummy",
-            timeout=60.0,  # in seconds
+        # Shares the connection pool of `client`; only the timeout differs
+        self.high_timeout_client = self.client.with_options(
+            timeout=config.proxy_non_streaming_timeout
         )
+        self.guard = UpstreamGuard(config.upstream_url, config)
 
     async def execute(
         self, params: CompletionCreateParams
     ) -> ChatCompletion | AsyncChatCompletionStreamManager[Any]:
         """Forward request to upstream OpenAI-compatible API."""
         if params.get("stream"):
-            # Use .stream() for streaming requests - returns AsyncChatCompletionStreamManager
-            stream_params = params.copy()
-            stream_params.pop("stream", None)
-            return self.client.chat.completions.stream(**stream_params)  # type: ignore[return-value]
+            # Streams are opened with .create() and wrapped in a stream manager directly:
+            # .stream() rejects function tools that are not `strict`, and would parse content
+            # against `response_format`, neither of which a proxy should do
+            stream_params = {**params, "stream": True}
+            # Fail fast while the circuit is open, before a streaming response is started
+            self.guard.breaker.check()
+            return GuardedStreamManager(
+                lambda: AsyncChatCompletionStreamManager(
+                    self.client.chat.completions.create(**stream_params),  # type: ignore[arg-type]
+                    response_format=omit,
+                    input_tools=omit,
+                ),
+                self.guard,
+            )
         else:
             # Use .create() for non-streaming requests
             return await self.execute_non_streaming(params)
 
     async def execute_non_streaming(self, params: CompletionCreateParams) -> ChatCompletion:
         """Execute a non-streaming request."""
-        return await self.high_timeout_client.chat.completions.create(
-            **params  # pyright: ignore[reportCallIssue,  reportArgumentType]
+        return await self.guard.call(
+            lambda: self.high_timeout_client.chat.completions.create(
+                **params  # pyright: ignore[reportCallIssue,  reportArgumentType]
+            )
         )
+
+    async def execute_raw_stream(self, params: CompletionCreateParams) -> AsyncIterator[bytes]:
+        """Open a streaming request upstream and return its raw SSE bytes, without parsing."""
+        # Fail fast while the circuit is open, before a streaming response is started
+        self.guard.breaker.check()
+        stream = self._stream_raw_bytes(params)
+        # Run the generator up to its first yield, which opens the upstream response, so
+        # errors surface here. A started generator is also closed by the event loop if it is
+        # dropped unfinished, releasing the connection
+        await anext(stream)
+        return stream
+
+    async def _stream_raw_bytes(self, params: CompletionCreateParams) -> AsyncIterator[bytes]:
+        """Open the upstream response, yield an empty marker, then yield the body bytes."""
+        stream_params = {**params, "stream": True}
+
+        async def open_stream() -> Any:
+            response_manager = self.client.chat.completions.with_streaming_response.create(
+                **stream_params  # pyright: ignore[reportCallIssue,  reportArgumentType]
+            )
+            return response_manager, await response_manager.__aenter__()
+
+        response_manager, response = await self.guard.call(open_stream)
+        try:
+            yield b""
+            async for data in response.iter_bytes():
+                yield data
+        finally:
+            await response_manager.__aexit__(None, None, None)
@@ -0,0 +1,177 @@
+import hashlib
+from abc import ABC, abstractmethod
+from contextvars import ContextVar
+from logging import getLogger
+from time import monotonic
+from typing import Mapping
+
+from openai.types.chat import ChatCompletion, CompletionCreateParams
+
+from chat_completion_server.core.cache import LRUCache
+from chat_completion_server.models.config import ProxyConfig
+
+
+logger = getLogger(__name__)
+
+# Caller of the current request, set by the server so usage can be charged after the fact
+caller_ctx_var: ContextVar[str | None] = ContextVar("rate_limit_caller", default=None)
+
+ANONYMOUS_CALLER = "anonymous"
+MAX_TRACKED_BUCKETS = 100_000
+"""Buckets kept by the in-memory backend; evicted buckets start over full"""
+CHARS_PER_TOKEN = 4
+"""Rough characters per token, used when a response carries no `usage`"""
+
+
+class RateLimitExceededError(Exception):
+    """Raised when a caller has used up its request or token budget."""
+
+    def __init__(self, caller: str, limit: str, retry_after: float):
+        super().__init__(f"Rate limit exceeded ({limit}); retry in {retry_after:.1f}s")
+        self.caller = caller
+        self.limit = limit
+        self.retry_after = retry_after
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage for token buckets.
+
+    The default `InMemoryRateLimitBackend` is per process. Implement this over a shared
+    store (e.g. Redis) to enforce one limit across several workers.
+    """
+
+    @abstractmethod
+    async def consume(
+        self, key: str, cost: float, capacity: float, refill_rate: float, allow_debt: bool = False
+    ) -> float:
+        """
+        Take `cost` tokens from the bucket `key`, refilled at `refill_rate` tokens per second.
+
+        Args:
+            key: Bucket identifier
+            cost: Tokens to take
+            capacity: Bucket size; new buckets start full
+            refill_rate: Tokens added per second
+            allow_debt: Take the tokens even if the bucket goes negative
+
+        Returns:
+            0 if the tokens were taken, otherwise seconds until they could be
+        """
+        raise NotImplementedError("consume() shall be impl'd by child class")
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Token buckets held in process memory."""
+
+    def __init__(self, max_buckets: int = MAX_TRACKED_BUCKETS):
+        self._buckets: LRUCache[tuple[float, float]] = LRUCache(max_entries=max_buckets)
+
+    async def consume(
+        self, key: str, cost: float, capacity: float, refill_rate: float, allow_debt: bool = False
+    ) -> float:
+        now = monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            tokens = capacity
+        else:
+            tokens, updated_at = bucket
+            tokens = min(capacity, tokens + (now - updated_at) * refill_rate)
+
+        wait = 0.0
+        if allow_debt or tokens >= cost:
+            tokens -= cost
+        else:
+            wait = (cost - tokens) / refill_rate
+
+        # Once refilled the bucket is indistinguishable from a new one, so let it expire
+        self._buckets.set(key, (tokens, now), ttl=(capacity - tokens) / refill_rate)
+        return wait
+
+
+class RateLimiter:
+    """
+    Per-caller requests/min and tokens/min limits.
+
+    Callers are identified by their tenant header, if `config.rate_limit_tenant_header` is
+    set and present, or else by a hash of their `Authorization` header. Each request takes
+    one token from the caller's request bucket up front. Upstream token usage is charged to
+    the caller's token bucket once the response is known, and requests are refused while
+    that bucket is in debt.
+    """
+
+    def __init__(self, config: ProxyConfig, backend: RateLimitBackend | None = None):
+        """
+        Args:
+            config: Server configuration
+            backend: Bucket storage. Defaults to `InMemoryRateLimitBackend`
+        """
+        self.requests_per_minute = config.rate_limit_requests_per_minute
+        self.tokens_per_minute = config.rate_limit_tokens_per_minute
+        self.tenant_header = config.rate_limit_tenant_header
+        self.backend = backend or InMemoryRateLimitBackend()
+
+    @property
+    def enabled(self) -> bool:
+        return self.requests_per_minute is not None or self.tokens_per_minute is not None
+
+    def identify(self, headers: Mapping[str, str] | None) -> str:
+        """Return a stable caller id. Raw API keys are hashed, never stored."""
+        if headers is None:
+            return ANONYMOUS_CALLER
+        if self.tenant_header is not None:
+            tenant = headers.get(self.tenant_header)
+            if tenant:
+                return f"tenant:{tenant}"
+        authorization = headers.get("authorization")
+        if not authorization:
+            return ANONYMOUS_CALLER
+        digest = hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:16]
+        return f"key:{digest}"
+
+    async def admit(self, caller: str) -> None:
+        """Admit one request from `caller`, raising `RateLimitExceededError` if over a limit."""
+        if self.tokens_per_minute is not None:
+            wait = await self.backend.consume(
+                f"{caller}:tokens", 0, self.tokens_per_minute, self.tokens_per_minute / 60
+            )
+            if wait > 0:
+                raise RateLimitExceededError(caller, "tokens per minute", wait)
+
+        if self.requests_per_minute is not None:
+            wait = await self.backend.consume(
+                f"{caller}:requests", 1, self.requests_per_minute, self.requests_per_minute / 60
+            )
+            if wait > 0:
+                raise RateLimitExceededError(caller, "requests per minute", wait)
+
+    async def charge(self, caller: str, tokens: int) -> None:
+        """Charge `tokens` of upstream usage to `caller`, possibly putting it into debt."""
+        if self.tokens_per_minute is None or tokens <= 0:
+            return
+        await self.backend.consume(
+            f"{caller}:tokens",
+            tokens,
+            self.tokens_per_minute,
+            self.tokens_per_minute / 60,
+            allow_debt=True,
+        )
+
+
+def get_usage_tokens(params: CompletionCreateParams, response: ChatCompletion) -> int:
+    """
+    Return the total tokens used by a completion.
+
+    Streams only carry `usage` if the client asked for it via `stream_options`; otherwise
+    the count is estimated from the prompt and output lengths.
+    """
+    if response.usage is not None:
+        return response.usage.total_tokens
+
+    chars = sum(len(str(message.get("content") or "")) for message in params.get("messages", []))
+    for choice in response.choices:
+        chars += len(choice.message.content or "")
+        for tool_call in choice.message.tool_calls or []:
+            if tool_call.type == "function":
+                chars += len(tool_call.function.arguments)
+    return -(-chars // CHARS_PER_TOKEN)
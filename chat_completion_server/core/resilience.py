@@ -0,0 +1,331 @@
+import asyncio
+from email.utils import parsedate_to_datetime
+from enum import Enum
+from logging import getLogger
+from random import uniform
+from time import monotonic, time
+from typing import Any, Awaitable, Callable, TypeVar
+
+import httpx
+import openai
+from openai.lib.streaming.chat import AsyncChatCompletionStream, AsyncChatCompletionStreamManager
+
+from chat_completion_server.models.config import ProxyConfig
+
+
+logger = getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = (408, 409, 429)
+"""Client error statuses worth retrying, in addition to 5xx (same set as the OpenAI SDK)"""
+RETRY_BACKOFF_BASE = 0.25
+"""Seconds before the first retry; doubled on each further retry"""
+RETRY_BACKOFF_MAX = 4.0
+"""Upper bound (in seconds) on the delay before a retry"""
+
+
+def _get_status_code(error: BaseException) -> int | None:
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
+
+def _get_headers(error: BaseException) -> httpx.Headers | None:
+    if isinstance(error, openai.APIStatusError):
+        return error.response.headers
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.headers
+    return None
+
+
+def get_retry_after(error: BaseException) -> float | None:
+    """Return the delay (in seconds) the upstream asked for via `Retry-After`, if any."""
+    headers = _get_headers(error)
+    if headers is None:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms is not None:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if retry_after is None:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_overload(error: BaseException) -> bool:
+    """Check whether `error` signals the upstream is overloaded: rate limited or failing."""
+    return is_upstream_failure(error) or _get_status_code(error) == 429
+
+
+def is_upstream_failure(error: BaseException) -> bool:
+    """Check whether `error` means the upstream is unhealthy: unreachable, timed out, or 5xx."""
+    if isinstance(
+        error, (openai.APIConnectionError, httpx.TransportError, asyncio.TimeoutError)
+    ):
+        return True
+    status_code = _get_status_code(error)
+    return status_code is not None and status_code >= 500
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Check whether retrying the call that raised `error` might succeed."""
+    return is_upstream_failure(error) or _get_status_code(error) in RETRYABLE_STATUS_CODES
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+    def __init__(self, name: str, retry_after: float):
+        super().__init__(f"Circuit open for {name}; retry in {retry_after:.1f}s")
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitState(str, Enum):
+    """State of a `CircuitBreaker`."""
+
+    CLOSED = "closed"
+    """Calls flow normally"""
+    OPEN = "open"
+    """Calls fail fast without reaching the upstream"""
+    HALF_OPEN = "half_open"
+    """A single probe call is let through to test recovery"""
+
+
+class CircuitBreaker:
+    """
+    Stops calling an upstream after consecutive failures, then probes it for recovery.
+
+    After `failure_threshold` consecutive upstream failures the circuit opens and calls
+    raise `CircuitOpenError` immediately. Once `recovery_timeout` has passed, one probe call
+    is let through: success closes the circuit, failure opens it again. Errors that are not
+    upstream failures (e.g. 4xx) count as successes, since the upstream did answer.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Args:
+            name: Endpoint name, used in errors and logs
+            failure_threshold: Consecutive failures that open the circuit. 0 disables the breaker
+            recovery_timeout: Seconds the circuit stays open before a probe is allowed
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: float | None = None
+
+    @property
+    def state(self) -> CircuitState:
+        if (
+            self._state == CircuitState.OPEN
+            and monotonic() - self._opened_at >= self.recovery_timeout
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probe_started_at = None
+        return self._state
+
+    def check(self) -> None:
+        """Raise `CircuitOpenError` if the circuit is open, without claiming the probe."""
+        if self.failure_threshold > 0 and self.state == CircuitState.OPEN:
+            raise CircuitOpenError(self.name, self._retry_after())
+
+    def before_call(self) -> None:
+        """Claim permission for a call, raising `CircuitOpenError` if it may not proceed."""
+        if self.failure_threshold <= 0:
+            return
+        state = self.state
+        if state == CircuitState.OPEN:
+            raise CircuitOpenError(self.name, self._retry_after())
+        if state == CircuitState.HALF_OPEN:
+            # A probe that never reported back (e.g. cancelled) is given up on after a timeout
+            now = monotonic()
+            if (
+                self._probe_started_at is not None
+                and now - self._probe_started_at < self.recovery_timeout
+            ):
+                raise CircuitOpenError(self.name, self.recovery_timeout)
+            self._probe_started_at = now
+
+    def record_success(self) -> None:
+        if self._state != CircuitState.CLOSED:
+            logger.info(f"[CircuitBreaker] Circuit closed for {self.name}")
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._state == CircuitState.HALF_OPEN or (
+            self.failure_threshold > 0 and self._failures >= self.failure_threshold
+        ):
+            if self._state != CircuitState.OPEN:
+                logger.warning(
+                    f"[CircuitBreaker] Circuit opened for {self.name} after "
+                    f"{self._failures} failures"
+                )
+            self._state = CircuitState.OPEN
+            self._opened_at = monotonic()
+            self._probe_started_at = None
+
+    def record(self, error: BaseException) -> None:
+        """Record the outcome of a call that raised `error`."""
+        if is_upstream_failure(error):
+            self.record_failure()
+        else:
+            self.record_success()
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` through the breaker."""
+        self.before_call()
+        try:
+            result = await fn()
+        except Exception as e:
+            self.record(e)
+            raise
+        self.record_success()
+        return result
+
+    def _retry_after(self) -> float:
+        return max(0.0, self._opened_at + self.recovery_timeout - monotonic())
+
+
+class RetryBudget:
+    """
+    Token bucket limiting retries to a fraction of request volume.
+
+    Each request deposits `ratio` tokens and each retry withdraws one, so during an outage
+    retries add at most `ratio` extra load instead of multiplying it.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0):
+        """
+        Args:
+            ratio: Retries earned per request
+            max_tokens: Bucket capacity; the bucket starts full
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        self.tokens = min(self.tokens + self.ratio, self.max_tokens)
+
+    def try_withdraw(self) -> bool:
+        """Take a token for a retry. Returns False if the budget is spent."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class UpstreamGuard:
+    """Circuit breaker plus budgeted retries for calls to one upstream endpoint."""
+
+    def __init__(
+        self,
+        name: str,
+        config: ProxyConfig,
+        max_retries: int | None = None,
+        timeout: float | None = None,
+    ):
+        """
+        Args:
+            name: Endpoint name, used in errors and logs
+            config: Server configuration
+            max_retries: Retries per call. Defaults to `config.upstream_max_retries`
+            timeout: Seconds each attempt may take. A timed out attempt counts as an upstream
+                failure. If None, attempts are only bounded by the HTTP client's timeouts
+        """
+        self.name = name
+        self.max_retries = config.upstream_max_retries if max_retries is None else max_retries
+        self.timeout = timeout
+        self.breaker = CircuitBreaker(
+            name, config.circuit_failure_threshold, config.circuit_recovery_timeout
+        )
+        self.retry_budget = RetryBudget(config.retry_budget_ratio)
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run `fn` through the circuit breaker, retrying retryable errors within budget."""
+        self.retry_budget.deposit()
+
+        # The timeout is enforced inside the breaker, so it is recorded as a failure; a
+        # timeout around the whole call would cancel it before the breaker sees the outcome
+        async def run_attempt() -> T:
+            if self.timeout is None:
+                return await fn()
+            return await asyncio.wait_for(fn(), self.timeout)
+
+        attempt = 0
+        while True:
+            try:
+                return await self.breaker.call(run_attempt)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                retry_after = get_retry_after(e)
+                if (
+                    attempt >= self.max_retries
+                    or not is_retryable(e)
+                    # The upstream wants a longer pause than a request should wait for
+                    or (retry_after is not None and retry_after > RETRY_BACKOFF_MAX)
+                    or not self.retry_budget.try_withdraw()
+                ):
+                    raise
+                attempt += 1
+                delay = min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1))
+                delay = retry_after if retry_after is not None else delay * uniform(0.5, 1.0)
+                logger.info(
+                    f"[Resilience] Retrying {self.name} after {type(e).__name__} "
+                    f"(attempt {attempt}/{self.max_retries})"
+                )
+                await asyncio.sleep(delay)
+
+
+class GuardedStreamManager(AsyncChatCompletionStreamManager[Any]):
+    """
+    Stream manager that opens the upstream stream through an `UpstreamGuard`.
+
+    Each attempt builds a fresh manager with `open_manager`, since an SDK manager's request
+    can only be awaited once.
+    """
+
+    def __init__(
+        self,
+        open_manager: Callable[[], AsyncChatCompletionStreamManager[Any]],
+        guard: UpstreamGuard,
+    ):
+        # The base initializer is deliberately not called; the inner manager makes the request
+        self._open_manager = open_manager
+        self._guard = guard
+        self._manager: AsyncChatCompletionStreamManager[Any] | None = None
+
+    async def __aenter__(self) -> AsyncChatCompletionStream[Any]:
+        async def enter() -> AsyncChatCompletionStream[Any]:
+            manager = self._open_manager()
+            stream = await manager.__aenter__()
+            self._manager = manager
+            return stream
+
+        return await self._guard.call(enter)
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._manager is not None:
+            await self._manager.__aexit__(*exc_info)
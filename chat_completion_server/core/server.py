@@ -1,30 +1,75 @@
 import asyncio
+import hmac
+import weakref
+from contextlib import asynccontextmanager
 from logging import getLogger
-from time import time
+from math import ceil
+from time import monotonic, time
+from types import MappingProxyType
 
-from typing import Any, AsyncIterator
+from typing import Any, AsyncIterator, Awaitable, Callable, Mapping
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
-from openai.lib.streaming.chat import AsyncChatCompletionStreamManager, ChatCompletionStreamEvent
+from fastapi.responses import Response, StreamingResponse
+from openai.lib.streaming.chat import (
+    AsyncChatCompletionStream,
+    AsyncChatCompletionStreamManager,
+    ChatCompletionStreamEvent,
+    ChatCompletionStreamState,
+)
 from openai.pagination import SyncPage
 from openai.types import Model
-from openai.types.chat import ChatCompletion, CompletionCreateParams
+from openai.types.chat import (
+    ChatCompletion,
+    ChatCompletionChunk,
+    ChatCompletionMessageFunctionToolCall,
+    ChatCompletionMessageToolCallUnion,
+    ChatCompletionToolMessageParam,
+    CompletionCreateParams,
+)
+from openai.types.chat.chat_completion_message_function_tool_call import Function
+from openai.types.completion_usage import CompletionUsage
+from pydantic import BaseModel
+from pydantic_core import to_json
 
 from chat_completion_server.models.config import ProxyConfig
+from chat_completion_server.core.cache import LRUCache, canonical_hash
 from chat_completion_server.core.constants import (
-    SSE_DATA_PREFIX,
-    SSE_LINE_ENDING,
-    SSE_DONE_MESSAGE,
+    CACHE_BYPASS_DIRECTIVES,
+    CACHE_CONTROL_HEADER,
+    RETRY_AFTER_HEADER,
     STREAMING_HEADERS,
 )
+from chat_completion_server.core.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    Permit,
+)
+from chat_completion_server.core.plugin_pipeline import PluginPipeline, get_stream_events_mode
+from chat_completion_server.core.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE
+from chat_completion_server.core.metrics import ServerMetrics
+from chat_completion_server.core.timing import StreamTimer
+from chat_completion_server.core.hedging import Hedger
+from chat_completion_server.core.hook_executor import HookExecutor
+from chat_completion_server.core.load_balancer import LoadBalancedProxyHandler
 from chat_completion_server.core.proxy_handler import OpenAIProxyHandler, ProxyHandler
+from chat_completion_server.core.rate_limit import (
+    RateLimiter,
+    RateLimitExceededError,
+    caller_ctx_var,
+    get_usage_tokens,
+)
+from chat_completion_server.core.resilience import CircuitOpenError
 from chat_completion_server.core.logging import generate_request_id, set_request_id
 from chat_completion_server.core.model_manager import ModelManager
+from chat_completion_server.core.model_registry import ModelRegistry, ModelRegistryError
 from chat_completion_server.core.normalizer import normalize_chat_completion
+from chat_completion_server.core.single_flight import SingleFlight
+from chat_completion_server.core.sse import SSEDataTee, SSEEncoder
 from chat_completion_server.core.tool_use import ProxyToolClient
-from chat_completion_server.models.plugin import ProxyPlugin
+from chat_completion_server.core.transport import create_http_client
+from chat_completion_server.models.plugin import ProxyPlugin, StreamEvents, StreamTiming
 from chat_completion_server.models import create_model_metadata, ModelConfig
 from chat_completion_server.plugins.guardrails import GuardrailsPlugin
 from chat_completion_server.plugins.logging import LoggingPlugin
@@ -33,6 +78,101 @@ from chat_completion_server.plugins.logging import LoggingPlugin
 logger = getLogger(__name__)
 
 MAX_TOOL_ROUNDS = 5
+TOOL_CALL_FINISH_REASONS = ("tool_calls", "tool_use")
+
+
+def _should_retain_event(event: ChatCompletionStreamEvent, mode: StreamEvents) -> bool:
+    """Check whether `event` is needed by a plugin with the given `stream_events` mode."""
+    return mode == StreamEvents.ALL or (mode == StreamEvents.CHUNKS and event.type == "chunk")
+
+
+def _filter_stream_events(
+    events: list[ChatCompletionStreamEvent], mode: StreamEvents
+) -> list[ChatCompletionStreamEvent]:
+    """Narrow retained stream events down to what `mode` asks for."""
+    if mode == StreamEvents.ALL:
+        return events
+    return [event for event in events if _should_retain_event(event, mode)]
+
+
+def _is_tool_call_chunk(chunk: ChatCompletionChunk) -> bool:
+    """Check whether a stream chunk carries tool call deltas or ends a tool call turn."""
+    return any(
+        choice.delta.tool_calls or choice.finish_reason in TOOL_CALL_FINISH_REASONS
+        for choice in chunk.choices
+    )
+
+
+def _end_tool_call_chunk(chunk: ChatCompletionChunk) -> ChatCompletionChunk | None:
+    """
+    Strip tool calls from a chunk once no more tool rounds may run.
+
+    Choices ending the turn with tool calls end it with `length` instead, like the
+    non-streaming tool loop. Returns None if nothing is left to send.
+    """
+    choices = []
+    for choice in chunk.choices:
+        if choice.finish_reason in TOOL_CALL_FINISH_REASONS:
+            delta = choice.delta.model_copy(update={"tool_calls": None})
+            choices.append(choice.model_copy(update={"delta": delta, "finish_reason": "length"}))
+        elif not choice.delta.tool_calls:
+            choices.append(choice)
+    return chunk.model_copy(update={"choices": choices}) if choices else None
+
+
+def _get_streamed_completion(stream: Any) -> ChatCompletion:
+    """
+    Return the completion accumulated by a finished stream or `ChatCompletionStreamState`.
+
+    Unlike `get_final_completion()`, this skips the SDK's parse step, which raises for
+    responses ending with `length` or `content_filter`.
+    """
+    return stream.current_completion_snapshot
+
+
+def _get_streamed_tool_call(
+    stream: AsyncChatCompletionStream[Any], index: int
+) -> ChatCompletionMessageFunctionToolCall:
+    """Build the completed tool call at `index` from the stream's accumulated snapshot."""
+    snapshot = stream.current_completion_snapshot.choices[0].message.tool_calls[index]
+    return ChatCompletionMessageFunctionToolCall(
+        id=snapshot.id,
+        type="function",
+        function=Function(name=snapshot.function.name, arguments=snapshot.function.arguments),
+    )
+
+
+def _add_usage(
+    total: CompletionUsage | None, usage: CompletionUsage | None
+) -> CompletionUsage | None:
+    """Add up the token usage of two upstream calls, e.g. tool rounds; None counts as unknown."""
+    if total is None or usage is None:
+        return usage or total
+    return CompletionUsage(
+        prompt_tokens=total.prompt_tokens + usage.prompt_tokens,
+        completion_tokens=total.completion_tokens + usage.completion_tokens,
+        total_tokens=total.total_tokens + usage.total_tokens,
+    )
+
+
+class StreamContext:
+    """State of a streaming request, carried from `process_request` to the code sending it."""
+
+    def __init__(
+        self,
+        model_label: str,
+        started_at: float,
+        upstream_started_at: float,
+        permit: Permit | None,
+    ):
+        self.model_label = model_label
+        self.started_at = started_at
+        self.upstream_started_at = upstream_started_at
+        self.permit = permit
+        self.timer: StreamTimer | None = None
+        """Timer of the stream, once its content has started"""
+        self.outcome = "cancelled"
+        """Set to "ok" or "error" once the stream has been sent; "cancelled" otherwise"""
 
 
 class ChatCompletionServer:
@@ -72,25 +212,42 @@ class ChatCompletionServer:
         proxy_tool_client: ProxyToolClient | None = None,
         plugins: list[ProxyPlugin] | None = None,
         models: dict[str, ModelConfig] | None = None,
+        response_cache: LRUCache[bytes] | None = None,
+        rate_limiter: RateLimiter | None = None,
     ):
         """
         Initialize the chat completion server.
 
         Args:
             config: Server configuration. Defaults to ProxyConfig()
-            handler: Custom handler for executing requests. Defaults to OpenAIProxyHandler
+            handler: Custom handler for executing requests. Defaults to OpenAIProxyHandler, or
+                LoadBalancedProxyHandler if `config.upstream_targets` is set
             plugins: List of plugins. Defaults to [GuardrailsPlugin(), LoggingPlugin()]
             models: Custom model configurations. Defaults to {}
+            response_cache: Cache for non-streaming responses. Defaults to an LRUCache sized
+                by `config.response_cache_max_entries` and `config.response_cache_max_bytes`
+            rate_limiter: Per-caller rate limiter. Defaults to one configured by the
+                `config.rate_limit_*` settings, with in-memory buckets
         """
         self.config = config or ProxyConfig()
-        self.proxy_handler = proxy_handler or OpenAIProxyHandler(self.config)
-        self.proxy_tool_client = proxy_tool_client or ProxyToolClient(self.config)
+        # One connection pool shared by the default handler and tool client
+        self.http_client = create_http_client(self.config)
+        self.proxy_handler = proxy_handler or (
+            LoadBalancedProxyHandler(self.config, http_client=self.http_client)
+            if self.config.upstream_targets
+            else OpenAIProxyHandler(self.config, self.http_client)
+        )
+        self.proxy_tool_client = proxy_tool_client or ProxyToolClient(
+            self.config, self.http_client
+        )
         self.plugins = (
             plugins
             if plugins is not None
             else [
                 GuardrailsPlugin(),
-                LoggingPlugin(),
+                LoggingPlugin(
+                    self.config.request_log_sample_rate, self.config.request_log_max_bytes
+                ),
             ]
         )
 
@@ -100,64 +257,343 @@ class ChatCompletionServer:
             models = {"custom-model": ModelConfig(id="custom-model")}
 
         self.model_manager = ModelManager(models)
+        self.model_registry: ModelRegistry | None = None
+        if self.config.models_file:
+            self.model_registry = ModelRegistry(
+                self.config.models_file,
+                self.model_manager,
+                base_models=models,
+                poll_interval=self.config.models_reload_interval,
+                on_reload=self._on_models_reloaded,
+            )
+            self.model_registry.reload()
+        self.response_cache = (
+            response_cache
+            if response_cache is not None
+            else LRUCache(
+                max_entries=self.config.response_cache_max_entries,
+                max_bytes=self.config.response_cache_max_bytes,
+            )
+        )
+        self._single_flight: SingleFlight[ChatCompletion] = SingleFlight()
+        # Per-model hedgers, created on first use; see `ModelConfig.hedge_percentile`
+        self.hedgers: dict[str, Hedger[ChatCompletion]] = {}
+        self.admission = AdmissionController()
+        self.rate_limiter = rate_limiter or RateLimiter(self.config)
+        # Runs after_* and on_error hooks off the request path, drained on shutdown
+        self.hook_executor = HookExecutor(
+            self.config.hook_workers, self.config.hook_queue_size, self.config.hook_overflow_policy
+        )
+        self.metrics = ServerMetrics()
+        # State of streams returned by `process_request`, finished once fully sent (or collected)
+        self._streams: weakref.WeakKeyDictionary[Any, tuple[StreamContext, weakref.finalize]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.sse_encoder = SSEEncoder(coalesce_window=self.config.sse_coalesce_window)
         self._app = self._create_app()
 
+    async def aclose(self) -> None:
+        """
+        Release resources held by the server: finish queued background hooks, then close the
+        shared upstream connection pool.
+        """
+        if self.model_registry is not None:
+            await self.model_registry.stop()
+        await self.hook_executor.drain(self.config.hook_drain_timeout)
+        await self.http_client.aclose()
+
+    @property
+    def plugins(self) -> list[ProxyPlugin]:
+        """Registered plugins. Assign a new list to change them; do not mutate it in place."""
+        return self._pipeline.plugins
+
+    @plugins.setter
+    def plugins(self, plugins: list[ProxyPlugin]) -> None:
+        self._pipeline = PluginPipeline(plugins)
+
     async def process_request(
-        self, params: CompletionCreateParams
-    ) -> ChatCompletion | AsyncChatCompletionStreamManager[Any]:
+        self, params: CompletionCreateParams, headers: Mapping[str, str] | None = None
+    ) -> ChatCompletion | AsyncChatCompletionStreamManager[Any] | AsyncIterator[bytes]:
         """
         Process a chat completion request through the plugin pipeline.
 
         Flow:
-        1. Synchronous before_request hooks (blocking)
-        2. Execute request via handler
-        3. Split into streaming/non-streaming processing
+        1. Synchronous before_request hooks (blocking): mutating hooks in order, then read-only
+           hooks concurrently
+        2. Split into streaming/non-streaming processing
+        3. Non-streaming: serve from the response cache if eligible, otherwise execute via
+           handler, sharing one upstream call between concurrent identical deterministic requests
+        4. Upstream calls hold an admission permit for the model (see `ModelConfig.max_in_flight`);
+           streams keep theirs until fully sent
 
         Args:
             params: Chat completion parameters
+            headers: Incoming HTTP request headers, if any
 
         Returns:
-            ChatCompletion for non-streaming, AsyncStream (stream manager) for streaming
+            ChatCompletion for non-streaming, AsyncStream (stream manager) for streaming, or the
+            raw upstream SSE bytes for streaming with `config.stream_passthrough`
 
         Raises:
+            RateLimitExceededError: If the caller is over its request or token rate limit
+            AdmissionRejectedError: If the model is saturated and its wait queue is full
             Exception: Any error during processing
         """
+        started_at = monotonic()
+        model_label = self._get_model_label(params.get("model"))
+        self.metrics.requests_in_flight.inc(model_label)
+        # Once a stream is returned, its bookkeeping is finished when it has been sent
+        streaming = False
+        outcome = "ok"
         try:
+            if self.rate_limiter.enabled:
+                caller = self.rate_limiter.identify(headers)
+                # Read back when charging token usage, after the response is complete
+                caller_ctx_var.set(caller)
+                await self.rate_limiter.admit(caller)
+
             # Ensure messages is a list to prevent iterator consumption issues
             if "messages" in params:
                 params["messages"] = list(params["messages"])
 
             # Apply model-specific configuration
+            model = self.model_manager.get_model(params.get("model"))
             params = self.model_manager.apply_model_config(params)
 
             # Synchronous before_request hooks (blocking)
-            for plugin in self.plugins:
-                params = await plugin.before_request(params)
+            params = await self._run_before_request_hooks(params)
 
-            # Execute initial user request
-            response = await self.proxy_handler.execute(params)
-
-            # Split processing based on streaming mode
             if params.get("stream"):
-                return await self._process_streaming_response(params, response)
+                permit = await self.admission.acquire(model)
+                upstream_started_at = monotonic()
+                try:
+                    if self.config.stream_passthrough:
+                        response = await self.proxy_handler.execute_raw_stream(params)
+                    else:
+                        response = await self.proxy_handler.execute(params)
+                        response = await self._process_streaming_response(params, response)
+                except BaseException:
+                    if permit is not None:
+                        permit.release()
+                    raise
+                context = StreamContext(model_label, started_at, upstream_started_at, permit)
+                self._streams[response] = (
+                    context,
+                    weakref.finalize(response, self._finish_stream, context),
+                )
+                streaming = True
+                return response
+
+            # Key on the final params, before the tool loop appends to messages
+            cacheable = self._is_response_cacheable(params, model, headers)
+            coalesce = self.config.coalesce_requests and self._is_deterministic_request(
+                params, headers
+            )
+            request_key = canonical_hash(params) if cacheable or coalesce else None
+
+            if cacheable:
+                cached = self.response_cache.get(request_key)
+                if cached is not None:
+                    logger.info("[ResponseCache] Cache hit")
+                    outcome = "cache_hit"
+                    response = ChatCompletion.model_validate_json(cached)
+                    if self._pipeline.after_request:
+                        await self.hook_executor.submit(
+                            self._run_after_request_hooks, params, response
+                        )
+                    return response
+
+            shared = False
+            if request_key is not None and coalesce:
+                response, shared = await self._single_flight.do(
+                    request_key, lambda: self._execute_non_streaming(params, model)
+                )
+                if shared:
+                    # Each caller gets its own copy, since hooks may mutate the response
+                    response = response.model_copy(deep=True)
             else:
-                return await self._process_non_streaming_response(params, response)
+                response = await self._execute_non_streaming(params, model)
+
+            if cacheable and not shared and model is not None:
+                payload = response.model_dump_json().encode()
+                self.response_cache.set(
+                    request_key, payload, ttl=model.response_cache_ttl, size=len(payload)
+                )
+
+            # Charged inline: hook jobs may be dropped under load, usage charges must not be
+            await self._charge_usage(params, response)
+            if self._pipeline.after_request:
+                await self.hook_executor.submit(self._run_after_request_hooks, params, response)
+            return response
 
         except Exception as e:
+            outcome = (
+                "rejected"
+                if isinstance(
+                    e, (RateLimitExceededError, AdmissionRejectedError, CircuitOpenError)
+                )
+                else "error"
+            )
             # Fire error hooks in background
-            asyncio.create_task(self._run_on_error_hooks(params, e))
+            if self._pipeline.on_error:
+                await self.hook_executor.submit(self._run_on_error_hooks, params, e)
             raise
 
+        finally:
+            if not streaming:
+                self._record_request(model_label, False, outcome, started_at)
+
+    def _get_model_label(self, model_id: str | None) -> str:
+        """Return the metrics label for a model, folding unregistered models into one label."""
+        return model_id if model_id in self.model_manager.models else "other"
+
+    def _record_request(
+        self, model_label: str, stream: bool, outcome: str, started_at: float
+    ) -> None:
+        """Record a finished chat completion request in the metrics."""
+        stream_label = "true" if stream else "false"
+        self.metrics.requests_in_flight.dec(model_label)
+        self.metrics.requests.inc(model_label, stream_label, outcome)
+        self.metrics.request_duration.observe(monotonic() - started_at, model_label, stream_label)
+
+    def _observe_hook(self, plugin: Any, hook: str, started_at: float) -> None:
+        self.metrics.hook_duration.observe(monotonic() - started_at, type(plugin).__name__, hook)
+
+    def _finish_stream(self, context: StreamContext) -> None:
+        """Release a stream's admission permit and record it. Runs once per stream."""
+        if context.permit is not None:
+            context.permit.release()
+        self._record_request(context.model_label, True, context.outcome, context.started_at)
+
+    def _is_deterministic_request(
+        self, params: CompletionCreateParams, headers: Mapping[str, str] | None
+    ) -> bool:
+        """
+        Check whether identical requests for `params` may share one response.
+
+        Only non-streaming requests at temperature 0 qualify. Clients can opt out with
+        `Cache-Control: no-cache` or `no-store`.
+        """
+        if params.get("stream") or params.get("temperature") != 0:
+            return False
+        if headers is not None:
+            cache_control = headers.get(CACHE_CONTROL_HEADER, "").lower()
+            if any(directive in cache_control for directive in CACHE_BYPASS_DIRECTIVES):
+                return False
+        return True
+
+    def _is_response_cacheable(
+        self,
+        params: CompletionCreateParams,
+        model: ModelConfig | None,
+        headers: Mapping[str, str] | None,
+    ) -> bool:
+        """
+        Check whether the response to `params` may be served from and stored in the cache.
+
+        Only deterministic requests (see `_is_deterministic_request`), for models with a
+        `response_cache_ttl`, are cached.
+        """
+        if model is None or model.response_cache_ttl is None:
+            return False
+        return self._is_deterministic_request(params, headers)
+
+    async def _execute_non_streaming(
+        self, params: CompletionCreateParams, model: ModelConfig | None = None
+    ) -> ChatCompletion:
+        """Execute a non-streaming request upstream, including any tool rounds."""
+        permit = await self.admission.acquire(model)
+        try:
+            response = await self._call_upstream(
+                lambda: self.proxy_handler.execute(params), model
+            )
+            return await self._run_tool_loop(params, response, model)
+        finally:
+            if permit is not None:
+                permit.release()
+
+    def _on_models_reloaded(
+        self, previous: dict[str, ModelConfig], models: dict[str, ModelConfig]
+    ) -> None:
+        """Drop per-model state built from configurations that changed or were removed."""
+        for model_id, model in previous.items():
+            if models.get(model_id) != model:
+                # Permits already granted still release into the old limiter
+                self.admission.limiters.pop(model_id, None)
+                self.hedgers.pop(model_id, None)
+
+    def _check_admin_auth(self, request: Request) -> None:
+        """Reject the request unless it carries `config.admin_api_key`."""
+        if self.config.admin_api_key is None:
+            raise HTTPException(status_code=401, detail="Invalid admin API key")
+        authorization = request.headers.get("authorization", "").encode()
+        expected = f"Bearer {self.config.admin_api_key}".encode()
+        if not hmac.compare_digest(authorization, expected):
+            raise HTTPException(status_code=401, detail="Invalid admin API key")
+
+    def _get_hedger(self, model: ModelConfig | None) -> Hedger[ChatCompletion] | None:
+        """Return the hedger for `model`, or None if hedging is disabled for it."""
+        if model is None or model.hedge_percentile is None:
+            return None
+        hedger = self.hedgers.get(model.id)
+        if hedger is None:
+            hedger = Hedger(model.hedge_percentile, model.hedge_budget)
+            self.hedgers[model.id] = hedger
+        return hedger
+
+    async def _call_upstream(
+        self, call: Callable[[], Awaitable[Any]], model: ModelConfig | None
+    ) -> Any:
+        """
+        Make a non-streaming upstream call, hedged if enabled for `model`.
+
+        The outcome is fed into the model's adaptive concurrency limit, if any, without
+        latency, since non-streaming latency grows with output length.
+        """
+        hedger = self._get_hedger(model)
+        limiter = self.admission.get_limiter(model)
+        model_label = model.id if model is not None else "other"
+        start = monotonic()
+        try:
+            response = await (call() if hedger is None else hedger.run(call))
+        except Exception as e:
+            elapsed = monotonic() - start
+            self.metrics.upstream_duration.observe(elapsed, model_label, "error")
+            if limiter is not None:
+                limiter.record_error(e)
+            raise
+        elapsed = monotonic() - start
+        self.metrics.upstream_duration.observe(elapsed, model_label, "ok")
+        if limiter is not None:
+            limiter.record_success()
+        return response
+
     async def _process_streaming_response(
         self, params: CompletionCreateParams, response: AsyncChatCompletionStreamManager[Any]
     ) -> AsyncChatCompletionStreamManager[Any]:
-        """Process streaming response. Tool use support planned for future."""
+        """Process streaming response. Tool rounds are run while streaming, see `_stream_with_hooks`."""
         return response
 
     async def _process_non_streaming_response(
         self, params: CompletionCreateParams, response: ChatCompletion
     ) -> ChatCompletion:
         """Process non-streaming response with tool use support."""
+        response = await self._run_tool_loop(params, response)
+        if self._pipeline.after_request:
+            await self.hook_executor.submit(self._run_after_request_hooks, params, response)
+        return response
+
+    async def _run_tool_loop(
+        self,
+        params: CompletionCreateParams,
+        response: ChatCompletion,
+        model: ModelConfig | None = None,
+    ) -> ChatCompletion:
+        """
+        Normalize the response and run tool rounds until the model stops calling tools.
+
+        The returned response's `usage` is the total over all rounds.
+        """
         response = normalize_chat_completion(response)
 
         # TODO remove this after https://github.com/maximhq/bifrost/issues/617
@@ -167,6 +603,8 @@ class ChatCompletionServer:
         messages = list(params.get("messages", []))
 
         tool_round, tool_call_count = 0, 0
+        # Usage of every round, so tokens spent on tool rounds are reported and charged
+        usage = response.usage
 
         # Handle tool calls
         while (
@@ -175,87 +613,442 @@ class ChatCompletionServer:
             and tool_round < MAX_TOOL_ROUNDS
         ):
             tool_round += 1
-            for tool_call in response.choices[0].message.tool_calls:
-                tool_msg = await self.proxy_tool_client.execute_tool(tool_call)
+            tool_calls = response.choices[0].message.tool_calls
+            tool_msgs = await self._execute_tool_calls(tool_calls)
+            for tool_call, tool_msg in zip(tool_calls, tool_msgs):
                 messages.append(ProxyToolClient.tool_call_to_msg(tool_call))
                 messages.append(tool_msg)
                 tool_call_count += 1
 
             params["messages"] = messages
-            response = await self.proxy_handler.execute_non_streaming(params)
+            response = await self._call_upstream(
+                lambda: self.proxy_handler.execute_non_streaming(params), model
+            )
             response = normalize_chat_completion(response)
+            usage = _add_usage(usage, response.usage)
 
             # TODO remove this after https://github.com/maximhq/bifrost/issues/617
             if response.choices[0].finish_reason == "tool_use":
                 response.choices[0].finish_reason = "tool_calls"
 
+        response.usage = usage
+        self.metrics.tool_rounds.observe(tool_round, "false")
         if tool_round >= MAX_TOOL_ROUNDS:
             logger.warning(f"[ToolCalling] Max tool rounds reached: {MAX_TOOL_ROUNDS}")
             response.choices[0].finish_reason = "length"
         elif tool_round > 0:
             logger.info(f"[ToolCalling] Tool rounds: {tool_round}; tools called: {tool_call_count}")
 
-        asyncio.create_task(self._run_after_request_hooks(params, response))
         return response
 
+    async def _execute_tool_calls(
+        self, tool_calls: list[ChatCompletionMessageToolCallUnion]
+    ) -> list[ChatCompletionToolMessageParam]:
+        """
+        Execute one round of tool calls concurrently.
+
+        Results are returned in the same order as `tool_calls`. At most `config.tool_concurrency`
+        calls run at once, each bounded by `config.tool_timeout`. A failed or timed out tool
+        yields an error tool message instead of failing the whole request.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.config.tool_concurrency))
+        return list(
+            await asyncio.gather(
+                *(self._execute_tool_call(tool_call, semaphore) for tool_call in tool_calls)
+            )
+        )
+
+    async def _execute_tool_call(
+        self, tool_call: ChatCompletionMessageToolCallUnion, semaphore: asyncio.Semaphore
+    ) -> ChatCompletionToolMessageParam:
+        """Execute a single tool call, converting failures and timeouts into error tool messages."""
+        tool_name = tool_call.function.name if tool_call.type == "function" else tool_call.type
+        async with semaphore:
+            start = monotonic()
+            try:
+                # Bounded by `config.tool_timeout` inside the tool client's circuit breaker
+                tool_msg = await self.proxy_tool_client.execute_tool(tool_call)
+            except Exception as e:
+                logger.warning(f"[ToolCalling] Tool call {tool_call.id} failed: {e!r}")
+                self.metrics.tool_calls.inc(tool_name, "error")
+                return ProxyToolClient.tool_error_to_msg(tool_call, e)
+            finally:
+                self.metrics.tool_duration.observe(monotonic() - start, tool_name)
+            self.metrics.tool_calls.inc(tool_name, "ok")
+            return tool_msg
+
+    async def _charge_usage(self, params: CompletionCreateParams, response: ChatCompletion) -> None:
+        """Charge the response's token usage to the current caller's rate limit."""
+        caller = caller_ctx_var.get()
+        if caller is None or self.rate_limiter.tokens_per_minute is None:
+            return
+        try:
+            await self.rate_limiter.charge(caller, get_usage_tokens(params, response))
+        except Exception:
+            logger.exception("[RateLimit] Error charging usage")
+
+    def _get_retained_stream_events(self) -> StreamEvents:
+        """Return the widest `stream_events` mode requested by any stream hook."""
+        return self._pipeline.stream_events
+
+    async def _run_before_request_hooks(
+        self, params: CompletionCreateParams
+    ) -> CompletionCreateParams:
+        """
+        Run before_request hooks.
+
+        Hooks that mutate params run one after another, in plugin order. Read-only hooks
+        (`mutates_params = False`) then run concurrently against a read-only view of the final
+        params; the first one to raise cancels the others and its error is propagated.
+        """
+        for plugin in self._pipeline.before_request:
+            started_at = monotonic()
+            params = await plugin.before_request(params)
+            self._observe_hook(plugin, "before_request", started_at)
+
+        read_only = self._pipeline.validators
+        if not read_only:
+            return params
+
+        snapshot: Any = MappingProxyType(params)
+        if len(read_only) == 1:
+            await self._run_read_only_hook(read_only[0], snapshot)
+            return params
+
+        tasks = [
+            asyncio.ensure_future(self._run_read_only_hook(plugin, snapshot))
+            for plugin in read_only
+        ]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        error = None
+        for task in tasks:
+            # Retrieve every exception so none is reported as unhandled
+            if task.done() and not task.cancelled() and task.exception() is not None:
+                error = error or task.exception()
+        if error is not None:
+            raise error
+        return params
+
+    async def _run_read_only_hook(self, plugin: ProxyPlugin, params: Any) -> None:
+        started_at = monotonic()
+        await plugin.before_request(params)
+        self._observe_hook(plugin, "before_request", started_at)
+
     async def _run_after_request_hooks(
         self, params: CompletionCreateParams, response: ChatCompletion
     ) -> None:
         """Run after_request_async hooks in background."""
-        for plugin in self.plugins:
+        for plugin, hook in self._pipeline.after_request:
+            started_at = monotonic()
             try:
-                await plugin.after_request_async(params, response)
+                await hook(params, response)
             except Exception as e:
                 logger.exception("Error in async hook")
+            self._observe_hook(plugin, "after_request_async", started_at)
 
     async def _run_after_stream_hooks(
         self,
         params: CompletionCreateParams,
         response: ChatCompletion,
         events: list[ChatCompletionStreamEvent],
+        timing: StreamTiming | None = None,
     ) -> None:
-        """Run after_stream_async hooks in background."""
-        for plugin in self.plugins:
+        """
+        Run after_stream_async hooks in background, passing each plugin the events it needs.
+
+        If `timing` is given, after_stream_timing_async hooks are run afterwards.
+        """
+        events_by_mode: dict[StreamEvents, list[ChatCompletionStreamEvent]] = {}
+        for plugin in self._pipeline.after_stream:
+            mode = get_stream_events_mode(plugin)
+            if mode not in events_by_mode:
+                events_by_mode[mode] = _filter_stream_events(events, mode)
+            started_at = monotonic()
             try:
-                await plugin.after_stream_async(params, response, events)
+                await plugin.after_stream_async(params, response, events_by_mode[mode])
             except Exception as e:
                 logger.exception("Error in stream hook")
+            self._observe_hook(plugin, "after_stream_async", started_at)
+
+        if timing is None:
+            return
+        for plugin in self._pipeline.after_stream_timing:
+            started_at = monotonic()
+            try:
+                await plugin.after_stream_timing_async(params, response, timing)
+            except Exception as e:
+                logger.exception("Error in stream timing hook")
+            self._observe_hook(plugin, "after_stream_timing_async", started_at)
 
     async def _run_on_error_hooks(self, params: CompletionCreateParams, error: Exception) -> None:
         """Run on_error_async hooks in background."""
-        for plugin in self.plugins:
+        for plugin in self._pipeline.on_error:
+            started_at = monotonic()
             try:
                 await plugin.on_error_async(params, error)
             except Exception as e:
                 logger.exception("Error in error hook")
+            self._observe_hook(plugin, "on_error_async", started_at)
 
     async def _stream_with_hooks(
         self, stream_manager: AsyncChatCompletionStreamManager[Any], params: CompletionCreateParams
-    ) -> AsyncIterator[str]:
-        """Stream chunks to client and run post-flight hooks."""
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream chunks to client as SSE frames and run post-flight hooks.
+
+        Each upstream chunk is sent as exactly one frame, followed by a final `[DONE]` frame.
+
+        Tool rounds run inside the stream: each tool starts as soon as its arguments are
+        complete, then a follow-up upstream stream is spliced into the same response. Chunks
+        belonging to a tool round are not forwarded, so clients only see the final answer.
+        Once `MAX_TOOL_ROUNDS` is reached, further tool calls are held back and the turn ends
+        with `finish_reason="length"`, as in the non-streaming tool loop.
+
+        The final completion handed to hooks carries the usage summed over all tool rounds.
+        Only the stream events required by the plugins' `stream_events` modes are retained.
+        Timing is measured throughout and handed to `after_stream_timing_async` hooks.
+        """
+        timer = self._create_stream_timer(stream_manager)
+        retain = self._get_retained_stream_events()
         events: list[ChatCompletionStreamEvent] = []
         event_types: dict[str, int] = {}
+        last_event: ChatCompletionStreamEvent | None = None
+        messages = list(params.get("messages", []))
+        semaphore = asyncio.Semaphore(max(1, self.config.tool_concurrency))
+        tool_round, tool_call_count = 0, 0
+        # Usage of every round; streams only report it if `stream_options` asks for it
+        usage: CompletionUsage | None = None
+
+        while True:
+            run_tools = tool_round < MAX_TOOL_ROUNDS
+            tool_tasks: dict[int, tuple[ChatCompletionMessageToolCallUnion, asyncio.Task]] = {}
+            try:
+                # handle more types?
+                # https://github.com/openai/openai-python/blob/main/examples/parsing_stream.py
+                async with stream_manager as stream:
+                    async for event in stream:
+                        if event.type == "chunk":
+                            timer.on_chunk()
+                        if _should_retain_event(event, retain):
+                            events.append(event)
+                        last_event = event
+                        event_types[event.type] = event_types.get(event.type, 0) + 1
+                        if event.type == "tool_calls.function.arguments.done" and run_tools:
+                            tool_call = _get_streamed_tool_call(stream, event.index)
+                            task = asyncio.create_task(
+                                self._execute_tool_call(tool_call, semaphore)
+                            )
+                            tool_tasks[event.index] = (tool_call, task)
+                        if event.type != "chunk":
+                            continue
+                        chunk: ChatCompletionChunk | None = event.chunk
+                        if run_tools and (tool_tasks or _is_tool_call_chunk(event.chunk)):
+                            chunk = None
+                        elif not run_tools and _is_tool_call_chunk(event.chunk):
+                            # Out of tool rounds: hold back the tool calls
+                            chunk = _end_tool_call_chunk(event.chunk)
+                        if chunk is not None:
+                            sent_at = timer.on_send()
+                            yield self.sse_encoder.encode_chunk(chunk)
+                            timer.on_sent(sent_at)
+
+                    final_completion = _get_streamed_completion(stream)
+                usage = _add_usage(usage, final_completion.usage)
+
+                if not tool_tasks:
+                    break
+
+                # Append tool results in tool call order, then continue with a follow-up stream
+                tool_round += 1
+                for index in sorted(tool_tasks):
+                    tool_call, task = tool_tasks[index]
+                    messages.append(ProxyToolClient.tool_call_to_msg(tool_call))
+                    messages.append(await task)
+                    tool_call_count += 1
+            finally:
+                for _, task in tool_tasks.values():
+                    task.cancel()
 
-        # handle more types?
-        # https://github.com/openai/openai-python/blob/main/examples/parsing_stream.py
-        async with stream_manager as stream:
-            async for event in stream:
-                events.append(event)
-                event_types[event.type] = event_types.get(event.type, 0) + 1
-                if event.type == "content.delta" or event.type == "refusal.delta":
-                    yield f"{SSE_DATA_PREFIX}{event.delta}{SSE_LINE_ENDING}"
-                if event.type == "chunk":
-                    yield f"{SSE_DATA_PREFIX}{event.chunk.model_dump_json(exclude_none=True)}{SSE_LINE_ENDING}"
-                if event.type == "refusal.delta":
-                    yield f"{SSE_DATA_PREFIX}{event.delta}{SSE_LINE_ENDING}"
-
-            yield SSE_DONE_MESSAGE
-            final_completion = await stream.get_final_completion()
+            params["messages"] = messages
+            stream_manager = await self.proxy_handler.execute(params)
+
+        sent_at = timer.on_send()
+        yield self.sse_encoder.encode_done()
+        timer.on_sent(sent_at)
+        final_completion.usage = usage
+        timing = timer.finish(final_completion, event_types, tool_round)
+
+        self.metrics.tool_rounds.observe(tool_round, "true")
+        if tool_round >= MAX_TOOL_ROUNDS:
+            logger.warning(f"[ToolCalling] Max tool rounds reached: {MAX_TOOL_ROUNDS}")
+            for choice in final_completion.choices:
+                if choice.finish_reason in TOOL_CALL_FINISH_REASONS:
+                    choice.finish_reason = "length"
+        elif tool_round > 0:
+            logger.info(f"[ToolCalling] Tool rounds: {tool_round}; tools called: {tool_call_count}")
 
         # debugging output
-        logger.info(f"Final event: {events[-1]}")
+        logger.info(f"Final event: {last_event}")
         logger.info(f"\t{event_types=}")
-        asyncio.create_task(self._run_after_stream_hooks(params, final_completion, events))
+        self._log_stream_timing(timing)
+        await self._charge_usage(params, final_completion)
+        if self._pipeline.has_stream_hooks:
+            await self.hook_executor.submit(
+                self._run_after_stream_hooks, params, final_completion, events, timing
+            )
+
+    def _needs_final_completion(self) -> bool:
+        """Whether finished streams are needed by stream hooks or for token rate limiting."""
+        return self._pipeline.has_stream_hooks or self.rate_limiter.tokens_per_minute is not None
+
+    def _create_stream_timer(self, response: Any) -> StreamTimer:
+        """Create a timer for a stream, starting from when its request arrived if known."""
+        entry = self._streams.get(response)
+        if entry is None:
+            return StreamTimer(monotonic())
+        context, _ = entry
+        context.timer = StreamTimer(context.started_at, context.upstream_started_at)
+        return context.timer
+
+    def _log_stream_timing(self, timing: StreamTiming) -> None:
+        """Log a stream's timing and record its upstream latency."""
+        if timing.time_to_first_chunk is not None and timing.pipeline_duration is not None:
+            self.metrics.upstream_time_to_first_chunk.observe(
+                timing.time_to_first_chunk - timing.pipeline_duration
+            )
+        logger.info(
+            f"[StreamTiming] pipeline={timing.pipeline_duration}s "
+            f"ttfc={timing.time_to_first_chunk}s ttfb={timing.time_to_first_byte}s "
+            f"duration={timing.duration:.3f}s client_wait={timing.client_wait:.3f}s "
+            f"tokens/s={timing.output_tokens_per_second}"
+        )
+
+    async def _send_stream(
+        self, content: AsyncIterator[bytes], response: Any
+    ) -> AsyncIterator[bytes]:
+        """
+        Yield from `content`, recording stream timing, then finish the stream's bookkeeping.
+
+        The stream's outcome is fed into the adaptive concurrency limit, with the upstream
+        time to first chunk as its latency, since that does not depend on output length.
+        """
+        context, finish = self._streams[response]
+        limiter = context.permit.limiter if context.permit is not None else None
+        last_sent_at: float | None = None
+        try:
+            async for data in content:
+                now = monotonic()
+                if last_sent_at is None:
+                    self.metrics.time_to_first_token.observe(
+                        now - context.started_at, context.model_label
+                    )
+                else:
+                    self.metrics.inter_token.observe(now - last_sent_at, context.model_label)
+                last_sent_at = now
+                yield data
+        except Exception as e:
+            context.outcome = "error"
+            if limiter is not None:
+                limiter.record_error(e)
+            raise
+        else:
+            context.outcome = "ok"
+            if limiter is not None:
+                timer = context.timer
+                limiter.record_success(
+                    timer.upstream_time_to_first_chunk if timer is not None else None
+                )
+        finally:
+            self._streams.pop(response, None)
+            finish()
+
+    async def _relay_with_hooks(
+        self, raw_stream: AsyncIterator[bytes], params: CompletionCreateParams
+    ) -> AsyncIterator[bytes]:
+        """
+        Relay upstream SSE bytes to the client unchanged and run post-flight hooks.
+
+        Nothing is parsed while streaming. If any plugin has a stream hook, `data:` payloads
+        are teed off and only parsed into a final completion after the stream has ended.
+        """
+        tee = SSEDataTee() if self._needs_final_completion() else None
+        timer = self._create_stream_timer(raw_stream)
+
+        async for data in raw_stream:
+            timer.on_chunk()
+            if tee is not None:
+                tee.feed(data)
+            sent_at = timer.on_send()
+            yield data
+            timer.on_sent(sent_at)
+
+        if tee is None:
+            self._log_stream_timing(timer.finish())
+            return
+        tee.close()
+        ended_at = monotonic()
+        if self.rate_limiter.tokens_per_minute is None:
+            await self.hook_executor.submit(
+                self._run_relayed_stream_hooks, params, tee.payloads, timer, ended_at
+            )
+            return
+
+        # Usage is charged before the stream ends rather than in a hook job, which may be
+        # dropped under load, so the completion is rebuilt here
+        rebuilt = self._rebuild_relayed_stream(tee.payloads)
+        if rebuilt is None:
+            self._log_stream_timing(timer.finish(ended_at=ended_at))
+            return
+        final_completion, events = rebuilt
+        timing = timer.finish(final_completion, ended_at=ended_at)
+        self._log_stream_timing(timing)
+        await self._charge_usage(params, final_completion)
+        if self._pipeline.has_stream_hooks:
+            await self.hook_executor.submit(
+                self._run_after_stream_hooks, params, final_completion, events, timing
+            )
+
+    async def _run_relayed_stream_hooks(
+        self,
+        params: CompletionCreateParams,
+        payloads: list[bytes],
+        timer: StreamTimer | None = None,
+        ended_at: float | None = None,
+    ) -> None:
+        """Rebuild the final completion from relayed chunk payloads, then run stream hooks."""
+        rebuilt = self._rebuild_relayed_stream(payloads)
+        if rebuilt is None:
+            return
+        final_completion, events = rebuilt
+
+        timing = None
+        if timer is not None:
+            timing = timer.finish(final_completion, ended_at=ended_at)
+            self._log_stream_timing(timing)
+        await self._run_after_stream_hooks(params, final_completion, events, timing)
+
+    def _rebuild_relayed_stream(
+        self, payloads: list[bytes]
+    ) -> tuple[ChatCompletion, list[ChatCompletionStreamEvent]] | None:
+        """Parse relayed chunk payloads into the final completion and the retained events."""
+        retain = self._get_retained_stream_events()
+        events: list[ChatCompletionStreamEvent] = []
+        try:
+            state: ChatCompletionStreamState[Any] = ChatCompletionStreamState()
+            for payload in payloads:
+                chunk = ChatCompletionChunk.model_validate_json(payload)
+                for event in state.handle_chunk(chunk):
+                    if _should_retain_event(event, retain):
+                        events.append(event)
+            return _get_streamed_completion(state), events
+        except Exception:
+            logger.exception("Error rebuilding relayed stream")
+            return None
 
     def _create_app(self) -> FastAPI:
         """
@@ -268,6 +1061,9 @@ class ChatCompletionServer:
         - GET /models - Alias without /v1 prefix
         - GET /v1/models/{model} - Retrieve specific model metadata
         - GET /models/{model} - Alias without /v1 prefix
+        - GET /metrics - Prometheus metrics, if `config.enable_metrics`
+        - POST /admin/models/reload - Reload `config.models_file`, if it and
+          `config.admin_api_key` are set
 
         Consumers can add custom routes after instantiation:
             server = ChatCompletionServer()
@@ -280,7 +1076,15 @@ class ChatCompletionServer:
         Returns:
             Configured FastAPI application with CORS enabled
         """
-        app = FastAPI(title="Chat Completion Proxy Server")
+
+        @asynccontextmanager
+        async def lifespan(app: FastAPI):
+            if self.model_registry is not None:
+                self.model_registry.start()
+            yield
+            await self.aclose()
+
+        app = FastAPI(title="Chat Completion Proxy Server", lifespan=lifespan)
 
         # Add CORS middleware, and header configs
         app.add_middleware(
@@ -301,6 +1105,13 @@ class ChatCompletionServer:
             response = await call_next(request)
             process_time = time() - start_time
 
+            # Label by route template, not raw path, to keep label cardinality bounded
+            route = request.scope.get("route")
+            route_label = getattr(route, "path", "unmatched")
+            self.metrics.http_requests.inc(route_label, request.method, str(response.status_code))
+            # For streams this is the time until the response starts, not until it ends
+            self.metrics.http_request_duration.observe(process_time, route_label, request.method)
+
             logger.info(
                 f"Request completed: {request.method} {request.url.path} - elapsed={process_time:.3f}s"
             )
@@ -310,23 +1121,52 @@ class ChatCompletionServer:
         # Register routes inline
         @app.post("/v1/chat/completions", response_model=None)
         @app.post("/chat/completions", response_model=None)
-        async def chat_completions(params: CompletionCreateParams):
+        async def chat_completions(params: CompletionCreateParams, request: Request):
             """
             OpenAI `/chat/completions` compatible endpoint.
             """
             try:
-                response = await self.process_request(params)
+                response = await self.process_request(params, request.headers)
 
                 if params.get("stream"):
-                    assert isinstance(response, AsyncChatCompletionStreamManager)
+                    if isinstance(response, AsyncChatCompletionStreamManager):
+                        content = self._stream_with_hooks(response, params)
+                    else:
+                        content = self._relay_with_hooks(response, params)
+                    if response in self._streams:
+                        content = self._send_stream(content, response)
                     return StreamingResponse(
-                        self._stream_with_hooks(response, params),
+                        self.sse_encoder.coalesce(content),
                         media_type="text/event-stream",
                         headers=STREAMING_HEADERS,
                     )
 
+                if self.config.fast_json_responses and isinstance(response, BaseModel):
+                    # Serialize once, in Rust, instead of jsonable_encoder + json.dumps
+                    return Response(content=to_json(response), media_type="application/json")
                 return response
 
+            except RateLimitExceededError as e:
+                logger.warning(f"[RateLimit] Rejected request: {e}")
+                raise HTTPException(
+                    status_code=429,
+                    detail=str(e),
+                    headers={RETRY_AFTER_HEADER: str(ceil(e.retry_after))},
+                )
+            except AdmissionRejectedError as e:
+                logger.warning(f"[Admission] Rejected request: {e}")
+                raise HTTPException(
+                    status_code=429,
+                    detail=str(e),
+                    headers={RETRY_AFTER_HEADER: str(ceil(e.retry_after))},
+                )
+            except CircuitOpenError as e:
+                logger.warning(f"[CircuitBreaker] Rejected request: {e}")
+                raise HTTPException(
+                    status_code=503,
+                    detail=str(e),
+                    headers={RETRY_AFTER_HEADER: str(ceil(e.retry_after))},
+                )
             except Exception as e:
                 logger.exception("Error in chat_completions")
                 raise HTTPException(status_code=500, detail=str(e))
@@ -348,4 +1188,37 @@ class ChatCompletionServer:
                 return create_model_metadata(model)
             return None
 
+        if self.model_registry is not None and self.config.admin_api_key is not None:
+
+            @app.post("/admin/models/reload", include_in_schema=False)
+            async def reload_models(request: Request) -> dict[str, Any]:
+                """Reload the models file now, keeping the current models if it is invalid."""
+                self._check_admin_auth(request)
+                try:
+                    reloaded = self.model_registry.reload()
+                except ModelRegistryError as e:
+                    logger.error(f"[ModelRegistry] Keeping current models: {e}")
+                    raise HTTPException(status_code=400, detail=str(e))
+                return {"reloaded": reloaded, "models": list(self.model_manager.models)}
+
+        if self.config.enable_metrics:
+
+            @app.get("/metrics", include_in_schema=False)
+            def metrics() -> Response:
+                """Return server metrics in the Prometheus text format."""
+                self._collect_metrics()
+                return Response(content=self.metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
         return app
+
+    def _collect_metrics(self) -> None:
+        """Copy state kept outside the metrics registry into it, before a scrape."""
+        for name, limiter in self.admission.limiters.items():
+            self.metrics.admission_in_flight.set(name, value=limiter.in_flight)
+            self.metrics.admission_queued.set(name, value=limiter.queued)
+            self.metrics.admission_limit.set(name, value=limiter.max_in_flight)
+        for name, hedger in self.hedgers.items():
+            self.metrics.hedged_requests.set_total(name, value=hedger.metrics.hedged)
+            self.metrics.hedge_wins.set_total(name, value=hedger.metrics.hedge_wins)
+        self.metrics.hook_jobs_queued.set(value=self.hook_executor.queued)
+        self.metrics.hook_jobs_dropped.set_total(value=self.hook_executor.dropped)
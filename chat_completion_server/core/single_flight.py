@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, TypeVar
+
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Coalesces concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the work; callers arriving while it is in flight
+    await the same result. The work runs in its own task, so a cancelled caller does not
+    cancel the call for everyone else.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[str, asyncio.Future[T]] = {}
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Run `fn` once for all concurrent callers of `key`.
+
+        Returns:
+            Tuple of (result, shared). `shared` is True when the result was produced by
+            another caller's execution.
+        """
+        future = self._in_flight.get(key)
+        shared = future is not None
+
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda done: self._forget(key, done))
+
+        return await asyncio.shield(future), shared
+
+    def _forget(self, key: str, future: asyncio.Future[Any]) -> None:
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not future.cancelled():
+            future.exception()
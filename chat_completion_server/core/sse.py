@@ -0,0 +1,125 @@
+import asyncio
+from typing import AsyncIterator
+
+from openai.types.chat import ChatCompletionChunk
+
+from chat_completion_server.core.constants import (
+    SSE_DATA_PREFIX,
+    SSE_DONE_MESSAGE,
+    SSE_LINE_ENDING,
+)
+
+
+_DATA_PREFIX = SSE_DATA_PREFIX.encode()
+_LINE_ENDING = SSE_LINE_ENDING.encode()
+_DONE_FRAME = SSE_DONE_MESSAGE.encode()
+_DATA_FIELD = SSE_DATA_PREFIX.strip().encode()
+_DONE_PAYLOAD = SSE_DONE_MESSAGE[len(SSE_DATA_PREFIX) :].strip().encode()
+
+
+class SSEEncoder:
+    """
+    Encodes streamed chunks as OpenAI-compatible SSE frames: one `data:` frame per chunk.
+
+    Optionally coalesces frames produced within `coalesce_window` seconds into a single
+    write, trading a bounded amount of latency for fewer, larger writes.
+    """
+
+    def __init__(self, coalesce_window: float = 0.0, coalesce_max_bytes: int = 16 * 1024):
+        """
+        Args:
+            coalesce_window: Seconds to hold frames before writing them together. 0 disables
+            coalesce_max_bytes: Write immediately once this many bytes are buffered
+        """
+        self.coalesce_window = coalesce_window
+        self.coalesce_max_bytes = coalesce_max_bytes
+
+    @staticmethod
+    def encode_chunk(chunk: ChatCompletionChunk) -> bytes:
+        """Encode a chunk as a single SSE frame."""
+        return _DATA_PREFIX + chunk.model_dump_json(exclude_none=True).encode() + _LINE_ENDING
+
+    @staticmethod
+    def encode_done() -> bytes:
+        """Return the `[DONE]` frame that terminates the stream."""
+        return _DONE_FRAME
+
+    async def coalesce(self, frames: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        """
+        Merge frames arriving within `coalesce_window` of the first buffered frame.
+
+        Frames are never held longer than the window, even if the upstream stalls.
+        """
+        if self.coalesce_window <= 0:
+            async for frame in frames:
+                yield frame
+            return
+
+        loop = asyncio.get_running_loop()
+        buffer: list[bytes] = []
+        buffered_bytes = 0
+        deadline = 0.0
+        next_frame = asyncio.ensure_future(anext(frames))
+        try:
+            while True:
+                timeout = max(0.0, deadline - loop.time()) if buffer else None
+                done, _ = await asyncio.wait({next_frame}, timeout=timeout)
+                if not done:
+                    # Window elapsed while waiting; flush and keep waiting for the same frame
+                    yield b"".join(buffer)
+                    buffer, buffered_bytes = [], 0
+                    continue
+
+                try:
+                    frame = next_frame.result()
+                except StopAsyncIteration:
+                    break
+
+                if not buffer:
+                    deadline = loop.time() + self.coalesce_window
+                buffer.append(frame)
+                buffered_bytes += len(frame)
+                if buffered_bytes >= self.coalesce_max_bytes:
+                    yield b"".join(buffer)
+                    buffer, buffered_bytes = [], 0
+
+                next_frame = asyncio.ensure_future(anext(frames))
+
+            if buffer:
+                yield b"".join(buffer)
+        finally:
+            next_frame.cancel()
+
+
+class SSEDataTee:
+    """
+    Collects the `data:` payloads of a raw SSE byte stream as it is relayed.
+
+    Bytes are split into lines incrementally, so payloads spanning several network
+    reads are reassembled. Comments, other fields and the `[DONE]` sentinel are skipped.
+    """
+
+    def __init__(self) -> None:
+        self.payloads: list[bytes] = []
+        self._buffer = b""
+
+    def feed(self, data: bytes) -> None:
+        """Consume the next piece of the byte stream."""
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            self._handle_line(line)
+
+    def close(self) -> None:
+        """Flush a trailing line that was not newline-terminated."""
+        if self._buffer:
+            self._handle_line(self._buffer)
+            self._buffer = b""
+
+    def _handle_line(self, line: bytes) -> None:
+        line = line.rstrip(b"\r")
+        if not line.startswith(_DATA_FIELD):
+            return
+        payload = line[len(_DATA_FIELD) :].strip()
+        if payload and payload != _DONE_PAYLOAD:
+            self.payloads.append(payload)
@@ -0,0 +1,102 @@
+from time import monotonic
+
+from openai.types.chat import ChatCompletion
+from openai.types.completion_usage import CompletionUsage
+
+from chat_completion_server.models.plugin import StreamTiming
+
+
+class StreamTimer:
+    """Accumulates the timing of one stream as it is relayed, producing a `StreamTiming`."""
+
+    def __init__(self, started_at: float, upstream_started_at: float | None = None):
+        """
+        Args:
+            started_at: `monotonic()` time the request arrived
+            upstream_started_at: `monotonic()` time the upstream request was issued, if known
+        """
+        self.started_at = started_at
+        self.upstream_started_at = upstream_started_at
+        self.first_chunk_at: float | None = None
+        self.last_chunk_at: float | None = None
+        self.first_byte_at: float | None = None
+        self.chunk_count = 0
+        self.gap_total = 0.0
+        self.max_gap: float | None = None
+        self.client_wait = 0.0
+
+    @property
+    def upstream_time_to_first_chunk(self) -> float | None:
+        """Seconds from issuing the upstream request to its first chunk, if both are known."""
+        if self.upstream_started_at is None or self.first_chunk_at is None:
+            return None
+        return self.first_chunk_at - self.upstream_started_at
+
+    def on_chunk(self) -> None:
+        """Record that a chunk arrived from upstream."""
+        now = monotonic()
+        if self.last_chunk_at is None:
+            self.first_chunk_at = now
+        else:
+            gap = now - self.last_chunk_at
+            self.gap_total += gap
+            if self.max_gap is None or gap > self.max_gap:
+                self.max_gap = gap
+        self.last_chunk_at = now
+        self.chunk_count += 1
+
+    def on_send(self) -> float:
+        """Record that a frame is about to be handed to the client. Returns the current time."""
+        now = monotonic()
+        if self.first_byte_at is None:
+            self.first_byte_at = now
+        return now
+
+    def on_sent(self, sent_at: float) -> None:
+        """Record that the client accepted the frame handed over at `sent_at`."""
+        self.client_wait += monotonic() - sent_at
+
+    def finish(
+        self,
+        completion: ChatCompletion | None = None,
+        event_counts: dict[str, int] | None = None,
+        tool_rounds: int = 0,
+        ended_at: float | None = None,
+    ) -> StreamTiming:
+        """
+        Return the timing of the finished stream.
+
+        Args:
+            completion: Final completion, used for its `usage` if reported
+            event_counts: Number of stream events by type
+            tool_rounds: Tool rounds run within the stream
+            ended_at: `monotonic()` time the stream ended. Defaults to now
+        """
+        ended_at = monotonic() if ended_at is None else ended_at
+        output_tokens = self.chunk_count
+        usage = getattr(completion, "usage", None)
+        if isinstance(usage, CompletionUsage):
+            output_tokens = usage.completion_tokens
+
+        tokens_per_second = None
+        if self.first_chunk_at is not None and ended_at > self.first_chunk_at:
+            tokens_per_second = output_tokens / (ended_at - self.first_chunk_at)
+
+        gaps = self.chunk_count - 1
+        return StreamTiming(
+            pipeline_duration=self._since_start(self.upstream_started_at),
+            time_to_first_chunk=self._since_start(self.first_chunk_at),
+            time_to_first_byte=self._since_start(self.first_byte_at),
+            duration=ended_at - self.started_at,
+            chunk_count=self.chunk_count,
+            mean_inter_chunk_gap=self.gap_total / gaps if gaps > 0 else None,
+            max_inter_chunk_gap=self.max_gap,
+            client_wait=self.client_wait,
+            output_tokens=output_tokens,
+            output_tokens_per_second=tokens_per_second,
+            tool_rounds=tool_rounds,
+            event_counts=event_counts or {},
+        )
+
+    def _since_start(self, at: float | None) -> float | None:
+        return at - self.started_at if at is not None else None
@@ -1,13 +1,18 @@
+import json
 import httpx
 from typing import Any
 
 from openai.types.chat import ChatCompletionMessageToolCallUnion, ChatCompletionToolMessageParam, ChatCompletionMessageParam, ChatCompletionAssistantMessageParam
 
+from chat_completion_server.core.cache import LRUCache, canonical_hash
+from chat_completion_server.core.resilience import UpstreamGuard
+from chat_completion_server.core.single_flight import SingleFlight
+from chat_completion_server.core.transport import create_http_client
 from chat_completion_server.models.config import ProxyConfig
 
 
 class ProxyToolClient:
-    def __init__(self, config: ProxyConfig):
+    def __init__(self, config: ProxyConfig, http_client: httpx.AsyncClient | None = None):
         self.config = config
         self.base_url = config.upstream_url.rstrip("/")
         self.tool_exec_url = f"{self.base_url}{config.tool_exec_path}"
@@ -15,18 +20,74 @@ class ProxyToolClient:
             "Authorization": f"Bearer {config.upstream_api_key}",
             "Content-Type": "application/json",
         }
-        self.client = httpx.AsyncClient()
+        self.client = http_client or create_http_client(config)
+        self.cacheable_tools: dict[str, float] = dict(config.tool_cache_ttls)
+        self.cache: LRUCache[ChatCompletionToolMessageParam] = LRUCache(
+            max_entries=config.tool_cache_max_entries
+        )
+        self._single_flight: SingleFlight[ChatCompletionToolMessageParam] = SingleFlight()
+        # Tools may have side effects, so failed calls are never retried
+        self.guard = UpstreamGuard(
+            self.tool_exec_url, config, max_retries=0, timeout=config.tool_timeout
+        )
+
+    def register_cacheable_tool(self, name: str, ttl: float) -> None:
+        """Mark a deterministic tool as cacheable, keeping its results for `ttl` seconds."""
+        self.cacheable_tools[name] = ttl
 
     async def execute_tool(
         self, tool_call: ChatCompletionMessageToolCallUnion
     ) -> ChatCompletionToolMessageParam:
-        """Execute a tool call via the upstream proxy."""
+        """
+        Execute a tool call via the upstream proxy.
+
+        Results of cacheable tools are served from the tool result cache, and identical
+        cacheable calls in flight at the same time share one upstream request.
+        """
+        cache_key = self._get_cache_key(tool_call)
+        if cache_key is None:
+            return await self._post_tool_call(tool_call)
+
+        tool_msg = self.cache.get(cache_key)
+        if tool_msg is None:
+            tool_msg, shared = await self._single_flight.do(
+                cache_key, lambda: self._post_tool_call(tool_call)
+            )
+            if not shared:
+                ttl = self.cacheable_tools[tool_call.function.name]
+                self.cache.set(cache_key, tool_msg, ttl=ttl)
+
+        # Cached results belong to an earlier call; re-address them to this one
+        return ChatCompletionToolMessageParam({**tool_msg, "tool_call_id": tool_call.id})
+
+    async def _post_tool_call(
+        self, tool_call: ChatCompletionMessageToolCallUnion
+    ) -> ChatCompletionToolMessageParam:
+        return await self.guard.call(lambda: self._send_tool_call(tool_call))
+
+    async def _send_tool_call(
+        self, tool_call: ChatCompletionMessageToolCallUnion
+    ) -> ChatCompletionToolMessageParam:
         response = await self.client.post(
-            self.tool_exec_url, json=tool_call.model_dump(), headers=self.headers
+            self.tool_exec_url,
+            json=tool_call.model_dump(),
+            headers=self.headers,
+            timeout=self.config.tool_timeout,
         )
         response.raise_for_status()
         return ChatCompletionToolMessageParam(response.json())
 
+    def _get_cache_key(self, tool_call: ChatCompletionMessageToolCallUnion) -> str | None:
+        """Return the cache key for a cacheable tool call, keyed on name and canonical arguments."""
+        if tool_call.type != "function" or tool_call.function.name not in self.cacheable_tools:
+            return None
+
+        try:
+            arguments: Any = json.loads(tool_call.function.arguments or "{}")
+        except json.JSONDecodeError:
+            arguments = tool_call.function.arguments
+        return canonical_hash({"name": tool_call.function.name, "arguments": arguments})
+
     async def close(self):
         """Close the HTTP client."""
         await self.client.aclose()
@@ -40,4 +101,13 @@ class ProxyToolClient:
             tool_calls=[tool_call],
         )
 
+    @staticmethod
+    def tool_error_to_msg(tool_call: ChatCompletionMessageToolCallUnion, error: Exception) -> ChatCompletionToolMessageParam:
+        """Convert a failed tool call into a tool message the model can react to."""
+        return ChatCompletionToolMessageParam(
+            role="tool",
+            tool_call_id=tool_call.id,
+            content=f"Tool execution failed: {type(error).__name__}: {error}",
+        )
+
         
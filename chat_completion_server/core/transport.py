@@ -0,0 +1,34 @@
+from importlib.util import find_spec
+from logging import getLogger
+
+import httpx
+
+from chat_completion_server.models.config import ProxyConfig
+
+
+logger = getLogger(__name__)
+
+
+def create_http_client(config: ProxyConfig) -> httpx.AsyncClient:
+    """
+    Create the HTTP client shared by all upstream calls (completions and tool execution).
+
+    Pool sizes, keep-alive expiry, HTTP/2 and timeouts come from `ProxyConfig`. Individual
+    calls may still override the timeout.
+    """
+    http2 = config.upstream_http2
+    if http2 and find_spec("h2") is None:
+        logger.warning(
+            "[Transport] upstream_http2 requires the `http2` extra; falling back to HTTP/1.1"
+        )
+        http2 = False
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=config.upstream_max_connections,
+            max_keepalive_connections=config.upstream_max_keepalive_connections,
+            keepalive_expiry=config.upstream_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(config.proxy_timeout, connect=config.upstream_connect_timeout),
+    )
@@ -1,16 +1,21 @@
 from dotenv import load_dotenv
 
-from chat_completion_server import ChatCompletionServer
+from chat_completion_server import ChatCompletionServer, ProxyConfig
 from chat_completion_server.models.model import ModelConfig
 from chat_completion_server.core.logging import setup_logging
 
 load_dotenv()
-logger = setup_logging()
+config = ProxyConfig()
+logger = setup_logging(
+    json_output=config.log_json,
+    sample_rates=config.log_sample_rates,
+    max_queued=config.log_queue_size,
+)
 
 # Initialize server and get FastAPI app
 custom_model: ModelConfig = ModelConfig(
     id="custom-model",
     upstream_model="bedrock/global.anthropic.claude-sonnet-4-20250514-v1:0",
 )
-server = ChatCompletionServer(models={"custom-model": custom_model})
+server = ChatCompletionServer(config=config, models={"custom-model": custom_model})
 app = server.app
@@ -1,4 +1,11 @@
 from chat_completion_server.models.model import create_model_metadata, ModelConfig, SystemPromptBehavior
-from chat_completion_server.models.plugin import ProxyPlugin
+from chat_completion_server.models.plugin import ProxyPlugin, StreamEvents, StreamTiming
 
-__all__ = ["create_model_metadata", "ModelConfig", "SystemPromptBehavior", "ProxyPlugin"]
+__all__ = [
+    "create_model_metadata",
+    "ModelConfig",
+    "SystemPromptBehavior",
+    "ProxyPlugin",
+    "StreamEvents",
+    "StreamTiming",
+]
@@ -1,7 +1,46 @@
-from pydantic import Field
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+class LoadBalancingStrategy(str, Enum):
+    """How `LoadBalancedProxyHandler` picks an upstream target for each request."""
+
+    EWMA = "ewma"
+    """Lowest latency EWMA, scaled by outstanding requests and recent errors"""
+    LEAST_OUTSTANDING = "least_outstanding"
+    """Fewest in-flight requests relative to weight"""
+    WEIGHTED_ROUND_ROBIN = "weighted_round_robin"
+    """Smooth weighted round-robin"""
+
+
+class HookOverflowPolicy(str, Enum):
+    """What the background hook executor does with new jobs when its queue is full."""
+
+    DROP = "drop"
+    """Discard the new job"""
+    BLOCK = "block"
+    """Make the request wait until the queue has room"""
+    SAMPLE = "sample"
+    """Once the queue is half full, accept a shrinking fraction of new jobs; drop when full"""
+
+
+class UpstreamTarget(BaseModel):
+    """An upstream OpenAI-compatible endpoint that requests can be load-balanced across."""
+
+    url: str
+    """Base URL of the upstream"""
+
+    api_key: str | None = None
+    """API key for this upstream. If None, uses `ProxyConfig.upstream_api_key`"""
+
+    weight: float = 1.0
+    """Relative share of traffic this upstream should receive"""
+
+    model_config = ConfigDict(use_attribute_docstrings=True)
+
+
 class ProxyConfig(BaseSettings):
     """Configuration for the chat completion proxy server."""
 
@@ -17,6 +56,12 @@ class ProxyConfig(BaseSettings):
     upstream_api_key: str = "sk-1234"
     """API key for upstream service authentication"""
 
+    upstream_targets: list[UpstreamTarget] = []
+    """Upstreams to load-balance completions across. If empty, only `upstream_url` is used"""
+
+    load_balancing_strategy: LoadBalancingStrategy = LoadBalancingStrategy.EWMA
+    """How to pick among `upstream_targets`"""
+
     host: str = "0.0.0.0"
     """Server bind address"""
 
@@ -26,11 +71,123 @@ class ProxyConfig(BaseSettings):
     enable_streaming: bool = True
     """Support streaming responses"""
 
+    sse_coalesce_window: float = 0.0
+    """Seconds to buffer streamed SSE frames so they are written together. 0 disables"""
+
+    stream_passthrough: bool = False
+    """Relay upstream SSE bytes to streaming clients without parsing them. Disables tool rounds"""
+
+    fast_json_responses: bool = True
+    """Serialize non-streaming responses straight to JSON bytes, bypassing `jsonable_encoder`"""
+
+    enable_metrics: bool = True
+    """Expose Prometheus metrics on `/metrics`"""
+
+    models_file: str | None = None
+    """JSON or YAML file of model configurations, merged over the models passed in code and
+    reloaded when it changes"""
+
+    models_reload_interval: float = 5.0
+    """Seconds between checks of `models_file` for changes. 0 only reloads via `/admin`"""
+
+    admin_api_key: str | None = None
+    """Bearer token required by `/admin` endpoints. If None, they are not registered"""
+
     enable_telemetry: bool = False
     """Enable built-in telemetry plugin"""
 
+    log_json: bool = False
+    """Write logs as one JSON object per line, for `setup_logging`"""
+
+    log_sample_rates: dict[str, float] = {}
+    """Fraction of log records below WARNING to keep, by logger name, for `setup_logging`"""
+
+    log_queue_size: int = 10000
+    """Maximum log records waiting to be written before new ones are dropped"""
+
+    request_log_sample_rate: float = 1.0
+    """Fraction of successful requests logged by the default LoggingPlugin. Errors are always
+    logged"""
+
+    request_log_max_bytes: int = 4096
+    """Maximum size of a request summary logged by the default LoggingPlugin"""
+
     tool_exec_path: str = "/mcp/tool/execute"
     """Path on upstream server for tool execution"""
     
     proxy_timeout: float = 20.0
     """Timeout (in seconds) for default client"""
+
+    proxy_non_streaming_timeout: float = 60.0
+    """Timeout (in seconds) for non-streaming upstream requests"""
+
+    upstream_connect_timeout: float = 5.0
+    """Timeout (in seconds) for establishing an upstream connection"""
+
+    upstream_max_connections: int = 200
+    """Maximum number of concurrent connections in the shared upstream pool"""
+
+    upstream_max_keepalive_connections: int = 50
+    """Maximum number of idle keep-alive connections kept in the shared upstream pool"""
+
+    upstream_keepalive_expiry: float = 30.0
+    """Seconds an idle keep-alive connection is kept before being closed"""
+
+    upstream_http2: bool = False
+    """Multiplex upstream requests over HTTP/2. Requires the `http2` extra"""
+
+    rate_limit_requests_per_minute: float | None = None
+    """Requests per minute allowed per caller. If None, unlimited"""
+
+    rate_limit_tokens_per_minute: float | None = None
+    """Upstream tokens (prompt + completion) per minute allowed per caller. If None, unlimited"""
+
+    rate_limit_tenant_header: str | None = None
+    """Header naming the caller's tenant. If set and present, limits apply per tenant
+    instead of per API key"""
+
+    upstream_max_retries: int = 2
+    """Retries for a failed upstream completion request, subject to the retry budget"""
+
+    retry_budget_ratio: float = 0.1
+    """Retries allowed per upstream request, as a fraction of request volume"""
+
+    circuit_failure_threshold: int = 5
+    """Consecutive upstream failures that open an endpoint's circuit. 0 disables the breaker"""
+
+    circuit_recovery_timeout: float = 30.0
+    """Seconds an open circuit fails fast before a probe request is let through"""
+
+    tool_concurrency: int = 8
+    """Maximum tool calls executed concurrently within one tool round. 1 runs them sequentially"""
+
+    tool_timeout: float | None = 30.0
+    """Timeout (in seconds) for a single tool call. If None, tool calls never time out"""
+
+    tool_cache_ttls: dict[str, float] = {}
+    """Deterministic tools whose results may be cached, mapped to result TTL (in seconds)"""
+
+    tool_cache_max_entries: int = 1024
+    """Maximum number of tool results held in the tool result cache"""
+
+    hook_workers: int = 4
+    """Workers running background plugin hooks (after_* and on_error) concurrently"""
+
+    hook_queue_size: int = 1000
+    """Maximum background hook jobs waiting for a worker"""
+
+    hook_overflow_policy: HookOverflowPolicy = HookOverflowPolicy.DROP
+    """What to do with background hook jobs when the queue is full"""
+
+    hook_drain_timeout: float = 10.0
+    """Seconds to wait for queued background hooks to finish on shutdown"""
+
+    coalesce_requests: bool = True
+    """Share one upstream call between concurrent identical non-streaming requests at
+    temperature 0, unless the client sends `Cache-Control: no-cache` or `no-store`"""
+
+    response_cache_max_entries: int = 1024
+    """Maximum number of non-streaming responses held in the response cache"""
+
+    response_cache_max_bytes: int = 64 * 1024 * 1024
+    """Maximum total size (in bytes) of serialized responses held in the response cache"""
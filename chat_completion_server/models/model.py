@@ -51,6 +51,32 @@ class ModelConfig(BaseModel):
     transform_params: Callable[[CompletionCreateParams], CompletionCreateParams] | None = None
     """Optional function to transform request params"""
 
+    response_cache_ttl: float | None = None
+    """Seconds to cache deterministic (temperature=0) non-streaming responses. If None, disabled"""
+
+    hedge_percentile: float | None = None
+    """Percentile (0-100) of recent upstream latency after which a non-streaming request is
+    hedged with a second identical request. If None, hedging is disabled"""
+
+    hedge_budget: float = 0.05
+    """Maximum fraction of extra upstream requests hedging may add"""
+
+    max_in_flight: int | None = None
+    """Maximum concurrent upstream requests for this model. If None, unlimited"""
+
+    max_queued: int = 100
+    """Maximum requests waiting for a slot once `max_in_flight` is reached; more are rejected"""
+
+    queue_timeout: float | None = 30.0
+    """Seconds a request may wait for a slot before being rejected. If None, waits indefinitely"""
+
+    adaptive_concurrency: bool = False
+    """Adapt the concurrency limit (AIMD) to upstream 429s, 5xx, timeouts and stream latency
+    spikes, between `min_in_flight` and `max_in_flight`. Requires `max_in_flight`"""
+
+    min_in_flight: int = 1
+    """Lowest concurrency limit `adaptive_concurrency` may shrink to"""
+
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
         use_attribute_docstrings=True,
@@ -1,7 +1,70 @@
 from abc import ABC
+from enum import Enum
 from typing import Any
 from openai.types.chat import ChatCompletion, CompletionCreateParams
 from openai.lib.streaming.chat import ChatCompletionStreamEvent
+from pydantic import BaseModel, ConfigDict
+
+
+class StreamEvents(str, Enum):
+    """Stream events a plugin needs in `after_stream_async`. The server retains only those."""
+
+    NONE = "none"
+    """Final completion only; `events` is empty. For counts only, read `chunk_count` and
+    `event_counts` from the `StreamTiming` passed to `after_stream_timing_async`"""
+    CHUNKS = "chunks"
+    """Raw `chunk` events only; memory grows linearly with output length"""
+    ALL = "all"
+    """Every SDK event, including delta events carrying growing snapshots"""
+
+
+class StreamTiming(BaseModel):
+    """
+    Timing of one streamed response, measured by the server. Durations are in seconds,
+    relative to when the request arrived unless noted otherwise.
+
+    `pipeline_duration` covers our own work before the upstream call (rate limiting, admission
+    queueing, before_request hooks); `time_to_first_chunk` minus it is upstream latency;
+    `client_wait` is time spent blocked on a slow client.
+    """
+
+    pipeline_duration: float | None = None
+    """Until the upstream request was issued"""
+
+    time_to_first_chunk: float | None = None
+    """Until the first chunk arrived from upstream"""
+
+    time_to_first_byte: float | None = None
+    """Until the first frame was handed to the client"""
+
+    duration: float = 0.0
+    """Until the stream ended"""
+
+    chunk_count: int = 0
+    """Upstream chunks received, across tool rounds (network reads for raw passthrough)"""
+
+    mean_inter_chunk_gap: float | None = None
+    """Mean gap between consecutive upstream chunks"""
+
+    max_inter_chunk_gap: float | None = None
+    """Longest gap between consecutive upstream chunks"""
+
+    client_wait: float = 0.0
+    """Total time spent waiting for the client to accept frames (backpressure)"""
+
+    output_tokens: int = 0
+    """Completion tokens, from `usage` if reported, otherwise the number of chunks"""
+
+    output_tokens_per_second: float | None = None
+    """Output tokens per second, from the first chunk to the end of the stream"""
+
+    tool_rounds: int = 0
+    """Server-side tool rounds run within the stream"""
+
+    event_counts: dict[str, int] = {}
+    """Number of stream events by type. Empty for raw passthrough streams"""
+
+    model_config = ConfigDict(use_attribute_docstrings=True)
 
 
 class ProxyPlugin(ABC):
@@ -14,8 +77,22 @@ class ProxyPlugin(ABC):
     Asynchronous hooks (non-blocking - executed after response):
     - after_request_async: Log/telemetry without blocking response
     - on_error_async: Error logging/telemetry
+    - after_stream_timing_async: Stream latency/throughput telemetry
+
+    Set `stream_events` to the narrowest `StreamEvents` mode the plugin needs, so the
+    server does not have to hold every stream event in memory.
+
+    Set `mutates_params` to False if `before_request` only validates or inspects the
+    request. Such hooks run concurrently after all mutating hooks, against a read-only view
+    of the params, and the first one to raise rejects the request and cancels the others.
     """
 
+    stream_events: StreamEvents = StreamEvents.ALL
+    """Stream events passed to `after_stream_async`"""
+
+    mutates_params: bool = True
+    """Whether `before_request` modifies or replaces the params"""
+
     async def before_request(
         self, params: CompletionCreateParams
     ) -> CompletionCreateParams:
@@ -29,10 +106,11 @@ class ProxyPlugin(ABC):
         - Modify model parameters
         
         Args:
-            params: Chat completion parameters
+            params: Chat completion parameters. A read-only mapping if `mutates_params`
+                is False
             
         Returns:
-            Modified parameters
+            Modified parameters. Ignored if `mutates_params` is False
         """
         return params
 
@@ -75,7 +153,26 @@ class ProxyPlugin(ABC):
         Args:
             params: Original request parameters
             response: Final accumulated ChatCompletion
-            events: All stream events received during streaming (empty for non-streaming)
+            events: Stream events received during streaming, filtered by `stream_events`
+                (empty for non-streaming)
+        """
+        pass
+
+    async def after_stream_timing_async(
+        self, params: CompletionCreateParams, response: ChatCompletion, timing: StreamTiming
+    ) -> None:
+        """
+        Asynchronous hook called with timing data after a streaming response completes.
+        DOES NOT BLOCK - runs in background, after `after_stream_async`.
+
+        Use cases:
+        - Track time-to-first-token and throughput SLOs
+        - Attribute slowness to upstream, plugins or clients
+
+        Args:
+            params: Original request parameters
+            response: Final accumulated ChatCompletion
+            timing: Timing of the stream
         """
         pass
 
@@ -10,6 +10,8 @@ logger = getLogger(__name__)
 class GuardrailsPlugin(ProxyPlugin):
     """Default guardrails plugin for content validation."""
 
+    mutates_params = False
+
     async def before_request(
         self, params: CompletionCreateParams
     ) -> CompletionCreateParams:
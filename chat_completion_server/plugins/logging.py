@@ -1,66 +1,160 @@
-from logging import getLogger
+import json
+import random
+import zlib
+from logging import INFO, getLogger
 from typing import Any
 
 from openai.types.chat import ChatCompletion, CompletionCreateParams
-from openai.lib.streaming.chat import ChatCompletionStreamEvent
 
-from chat_completion_server.models.plugin import ProxyPlugin
+from chat_completion_server.core.logging import request_id_ctx_var
+from chat_completion_server.models.plugin import ProxyPlugin, StreamEvents, StreamTiming
 
 logger = getLogger(__name__)
 
+# Placeholders for content parts that are never logged verbatim
+CONTENT_PART_PLACEHOLDERS = {
+    "image_url": "[image]",
+    "input_audio": "[audio]",
+    "file": "[file]",
+}
+
 
 class LoggingPlugin(ProxyPlugin):
-    """Plugin that logs request and response details asynchronously."""
+    """
+    Plugin that logs request and response details asynchronously.
+
+    Requests are sampled by request ID, so a request's records are either all kept or all
+    skipped; errors are always logged. Request records carry a bounded summary: the last
+    few messages with long text truncated, placeholders for images, audio and files, and
+    tool names instead of their schemas.
+    """
+
+    # Streams are logged with the chunk count from their timing, so no events are retained
+    stream_events = StreamEvents.NONE
+    mutates_params = False
+
+    def __init__(
+        self, sample_rate: float = 1.0, max_record_bytes: int = 4096, max_messages: int = 4
+    ):
+        """
+        Args:
+            sample_rate: Fraction of successful requests to log
+            max_record_bytes: Maximum size of the request summary in a log record
+            max_messages: Number of most recent messages included in the request summary
+        """
+        self.sample_rate = sample_rate
+        self.max_record_bytes = max_record_bytes
+        self.max_messages = max_messages
 
     async def before_request(
         self, params: CompletionCreateParams
     ) -> CompletionCreateParams:
-        log_data = {
-            "model": params.get("model"),
-            "messages": params.get("messages"),
-        }
-        
+        # Skip building the summary entirely if it will not be logged
+        if not logger.isEnabledFor(INFO) or not self._is_sampled():
+            return params
+
+        log_data: dict[str, Any] = {"model": params.get("model")}
+
         if params.get("stream") is not None:
             log_data["stream"] = params.get("stream")
-        
+
         if params.get("max_completion_tokens") is not None:
             log_data["max_completion_tokens"] = params.get("max_completion_tokens")
-        
-        messages = log_data.get("messages")
-        if messages and isinstance(messages, (list, tuple)) and len(messages) > 4:
-            messages = messages[-4:]
-            
-        if messages:
-            truncated_messages = []
-            for msg in messages:
-                if isinstance(msg, dict) and "content" in msg:
-                    truncated_msg = msg.copy()
-                    if isinstance(msg["content"], str):
-                        truncated_msg["content"] = self._truncate_message(msg["content"])
-                    truncated_messages.append(truncated_msg)
-                else:
-                    truncated_messages.append(msg)
-            log_data["messages"] = truncated_messages
-        
-        logger.info(f"Chat completion request: {log_data}")
+
+        messages = params.get("messages")
+        if messages and isinstance(messages, (list, tuple)):
+            log_data["message_count"] = len(messages)
+            log_data["messages"] = [
+                self._summarize_message(msg) for msg in messages[-self.max_messages :]
+            ]
+
+        tools = params.get("tools")
+        if tools:
+            log_data["tools"] = [_get_tool_name(tool) for tool in tools]
+
+        response_format = params.get("response_format")
+        if isinstance(response_format, dict):
+            log_data["response_format"] = response_format.get("type")
+
+        logger.info("Chat completion request: %s", self._cap(log_data))
         return params
 
+    def _is_sampled(self) -> bool:
+        """Check whether the current request is logged, consistently across its hooks."""
+        if self.sample_rate >= 1.0:
+            return True
+        if self.sample_rate <= 0.0:
+            return False
+        request_id = request_id_ctx_var.get()
+        if request_id is None:
+            return random.random() < self.sample_rate
+        return zlib.crc32(request_id.encode()) / 2**32 < self.sample_rate
+
+    def _summarize_message(self, msg: Any) -> Any:
+        if not isinstance(msg, dict):
+            return msg
+        summary = {"role": msg.get("role")}
+        content = msg.get("content")
+        if isinstance(content, str):
+            summary["content"] = self._truncate_message(content)
+        elif isinstance(content, (list, tuple)):
+            summary["content"] = [self._summarize_content_part(part) for part in content]
+        if msg.get("tool_calls"):
+            summary["tool_calls"] = [_get_tool_name(call) for call in msg["tool_calls"]]
+        if msg.get("tool_call_id"):
+            summary["tool_call_id"] = msg["tool_call_id"]
+        return summary
+
+    def _summarize_content_part(self, part: Any) -> Any:
+        if not isinstance(part, dict):
+            return part
+        if part.get("type") == "text" and isinstance(part.get("text"), str):
+            return self._truncate_message(part["text"])
+        return CONTENT_PART_PLACEHOLDERS.get(part.get("type"), f"[{part.get('type')}]")
+
+    def _cap(self, log_data: dict[str, Any]) -> str:
+        """Serialize the summary, truncated to `max_record_bytes`."""
+        record = json.dumps(log_data, ensure_ascii=False, default=str)
+        encoded = record.encode()
+        if len(encoded) <= self.max_record_bytes:
+            return record
+        dropped = len(encoded) - self.max_record_bytes
+        kept = encoded[: self.max_record_bytes].decode(errors="ignore")
+        return f"{kept}...[{dropped} bytes truncated]"
+
     def _truncate_message(self, msg: str, start_len: int = 64, end_len: int = 128) -> str:
         if len(msg) <= start_len + end_len:
             return msg
         return f"{msg[:start_len]}...{msg[-end_len:]}"
 
-    async def after_stream_async(
-        self, params: CompletionCreateParams, response: ChatCompletion, events: list[ChatCompletionStreamEvent]
+    async def after_request_async(
+        self, params: CompletionCreateParams, response: ChatCompletion
+    ) -> None:
+        if not logger.isEnabledFor(INFO) or not self._is_sampled():
+            return
+        logger.info(f"Chat completion response: model={response.model}, usage={response.usage}")
+
+    async def after_stream_timing_async(
+        self, params: CompletionCreateParams, response: ChatCompletion, timing: StreamTiming
     ) -> None:
-        model = response.model
-        usage = response.usage
-        if events:
-            logger.info(f"Chat completion stream: model={model}, usage={usage}, events={len(events)}")
-        else:
-            logger.info(f"Chat completion response: model={model}, usage={usage}")
+        if not logger.isEnabledFor(INFO) or not self._is_sampled():
+            return
+        logger.info(
+            f"Chat completion stream: model={response.model}, usage={response.usage}, "
+            f"chunks={timing.chunk_count}"
+        )
 
     async def on_error_async(
         self, params: CompletionCreateParams, error: Exception
     ) -> None:
         logger.error(f"Chat completion error: {error}", exc_info=True)
+
+
+def _get_tool_name(tool: Any) -> Any:
+    """Return the function name of a tool definition or tool call, without its schema."""
+    if isinstance(tool, dict):
+        function = tool.get("function")
+        if isinstance(function, dict):
+            return function.get("name")
+        return tool.get("type")
+    return str(tool)
@@ -0,0 +1,220 @@
+import asyncio
+
+import pytest
+
+from chat_completion_server.core.admission import (
+    AdmissionController,
+    AdmissionRejectedError,
+    ConcurrencyLimiter,
+)
+from chat_completion_server.models.model import ModelConfig
+
+
+@pytest.mark.asyncio
+async def test_limiter_admits_up_to_max_in_flight():
+    limiter = ConcurrencyLimiter("model", max_in_flight=2)
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert limiter.in_flight == 2
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await limiter.acquire()
+    assert exc_info.value.retry_after >= 1
+
+
+@pytest.mark.asyncio
+async def test_limiter_queues_in_fifo_order():
+    limiter = ConcurrencyLimiter("model", max_in_flight=1, max_queued=2)
+    first = await limiter.acquire()
+    admitted = []
+
+    async def wait(name):
+        permit = await limiter.acquire()
+        admitted.append(name)
+        return permit
+
+    tasks = [asyncio.create_task(wait("a")), asyncio.create_task(wait("b"))]
+    await asyncio.sleep(0)
+    assert limiter.queued == 2
+
+    first.release()
+    permit_a = await tasks[0]
+    permit_a.release()
+    permit_b = await tasks[1]
+    permit_b.release()
+
+    assert admitted == ["a", "b"]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_rejects_when_queue_full():
+    limiter = ConcurrencyLimiter("model", max_in_flight=1, max_queued=1)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejectedError):
+        await limiter.acquire()
+
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert limiter.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_queue_timeout_rejects():
+    limiter = ConcurrencyLimiter("model", max_in_flight=1, max_queued=1, queue_timeout=0.01)
+    await limiter.acquire()
+
+    with pytest.raises(AdmissionRejectedError):
+        await limiter.acquire()
+
+    assert limiter.queued == 0
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_permit_release_is_idempotent():
+    limiter = ConcurrencyLimiter("model", max_in_flight=1)
+    permit = await limiter.acquire()
+
+    permit.release()
+    permit.release()
+
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_controller_only_limits_configured_models():
+    controller = AdmissionController()
+
+    assert await controller.acquire(None) is None
+    assert await controller.acquire(ModelConfig(id="open")) is None
+
+    model = ModelConfig(id="limited", max_in_flight=1, max_queued=0)
+    assert await controller.acquire(model) is not None
+    with pytest.raises(AdmissionRejectedError):
+        await controller.acquire(model)
+
+
+def _rate_limited(retry_after=None):
+    import httpx
+
+    headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+    request = httpx.Request("POST", "http://upstream")
+    response = httpx.Response(429, request=request, headers=headers)
+    return httpx.HTTPStatusError("rate limited", request=request, response=response)
+
+
+def test_aimd_grows_additively_and_backs_off_multiplicatively():
+    from chat_completion_server.core.admission import AIMDLimit
+
+    aimd = AIMDLimit(initial=4, min_limit=1, max_limit=8)
+    for _ in range(4):
+        aimd.on_success()
+    assert aimd.limit == pytest.approx(5, abs=0.1)
+
+    aimd.on_overload()
+    assert aimd.limit == pytest.approx(2.5, abs=0.1)
+
+    # Repeated overload signals within the decrease interval back off once
+    aimd.on_overload()
+    assert aimd.limit == pytest.approx(2.5, abs=0.1)
+
+
+def test_aimd_respects_bounds():
+    from chat_completion_server.core.admission import AIMDLimit
+
+    aimd = AIMDLimit(initial=2, min_limit=2, max_limit=3)
+    aimd.on_overload()
+    assert aimd.limit == 2
+
+    for _ in range(20):
+        aimd.on_success()
+    assert aimd.limit == 3
+
+
+def test_aimd_backs_off_on_latency_spike_but_not_outliers():
+    from chat_completion_server.core.admission import AIMD_LATENCY_WINDOW, AIMDLimit
+
+    aimd = AIMDLimit(initial=8, min_limit=1, max_limit=8)
+    for _ in range(AIMD_LATENCY_WINDOW):
+        aimd.on_success(0.1)
+    for i in range(AIMD_LATENCY_WINDOW):
+        aimd.on_success(5.0 if i % 4 == 0 else 0.1)
+    assert aimd.limit == 8
+
+    for _ in range(AIMD_LATENCY_WINDOW):
+        aimd.on_success(1.0)
+    assert aimd.limit == pytest.approx(4)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_shrinks_on_timeout():
+    limiter = AdmissionController().get_limiter(
+        ModelConfig(id="adaptive", max_in_flight=8, adaptive_concurrency=True)
+    )
+
+    limiter.record_error(asyncio.TimeoutError())
+
+    assert limiter.max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_shrinks_on_429_and_honors_retry_after():
+    controller = AdmissionController()
+    model = ModelConfig(id="adaptive", max_in_flight=8, adaptive_concurrency=True)
+    limiter = controller.get_limiter(model)
+
+    limiter.record_error(_rate_limited(retry_after=5))
+
+    assert limiter.max_in_flight == 4
+    with pytest.raises(AdmissionRejectedError) as exc_info:
+        await limiter.acquire()
+    assert 4 < exc_info.value.retry_after <= 5
+
+
+@pytest.mark.asyncio
+async def test_adaptive_limiter_ignores_client_errors():
+    import httpx
+
+    limiter = AdmissionController().get_limiter(
+        ModelConfig(id="adaptive", max_in_flight=8, adaptive_concurrency=True)
+    )
+    request = httpx.Request("POST", "http://upstream")
+    error = httpx.HTTPStatusError(
+        "bad request", request=request, response=httpx.Response(400, request=request)
+    )
+
+    limiter.record_error(error)
+
+    assert limiter.max_in_flight == 8
+
+
+@pytest.mark.asyncio
+async def test_static_limiter_ignores_feedback():
+    limiter = ConcurrencyLimiter("model", max_in_flight=2)
+
+    limiter.record_error(_rate_limited(retry_after=5))
+
+    assert limiter.max_in_flight == 2
+    await limiter.acquire()
+
+
+@pytest.mark.asyncio
+async def test_raised_limit_admits_queued_requests():
+    from chat_completion_server.core.admission import AIMDLimit
+
+    aimd = AIMDLimit(initial=1, min_limit=1, max_limit=2)
+    limiter = ConcurrencyLimiter("model", 1, max_queued=1, aimd=aimd)
+    await limiter.acquire()
+    waiter = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    limiter.record_success()
+
+    await asyncio.wait_for(waiter, timeout=1)
+    assert limiter.in_flight == 2
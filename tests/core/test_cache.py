@@ -0,0 +1,84 @@
+import pytest
+from unittest.mock import patch
+
+from chat_completion_server.core.cache import LRUCache, canonical_hash
+
+
+def test_canonical_hash_ignores_key_order():
+    a = {"model": "m", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+    b = {"temperature": 0, "messages": [{"content": "hi", "role": "user"}], "model": "m"}
+
+    assert canonical_hash(a) == canonical_hash(b)
+
+
+def test_canonical_hash_differs_on_content():
+    a = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+    b = {"model": "m", "messages": [{"role": "user", "content": "hello"}]}
+
+    assert canonical_hash(a) != canonical_hash(b)
+
+
+def test_get_missing_returns_none():
+    cache = LRUCache()
+    assert cache.get("missing") is None
+
+
+def test_set_and_get():
+    cache = LRUCache()
+    cache.set("key", b"value", size=5)
+
+    assert cache.get("key") == b"value"
+    assert cache.size_bytes == 5
+
+
+def test_evicts_least_recently_used_by_entry_count():
+    cache = LRUCache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_evicts_by_size():
+    cache = LRUCache(max_entries=10, max_bytes=10)
+    cache.set("a", b"aaaa", size=4)
+    cache.set("b", b"bbbb", size=4)
+    cache.set("c", b"cccc", size=4)
+
+    assert cache.get("a") is None
+    assert len(cache) == 2
+    assert cache.size_bytes == 8
+
+
+def test_rejects_oversized_value():
+    cache = LRUCache(max_bytes=4)
+
+    assert cache.set("a", b"too large", size=9) is False
+    assert len(cache) == 0
+
+
+def test_overwrite_updates_size():
+    cache = LRUCache(max_bytes=100)
+    cache.set("a", b"aaaa", size=4)
+    cache.set("a", b"aa", size=2)
+
+    assert cache.get("a") == b"aa"
+    assert cache.size_bytes == 2
+
+
+@patch("chat_completion_server.core.cache.monotonic")
+def test_entry_expires_after_ttl(mock_monotonic):
+    mock_monotonic.return_value = 100.0
+    cache = LRUCache()
+    cache.set("a", 1, ttl=10)
+
+    mock_monotonic.return_value = 105.0
+    assert cache.get("a") == 1
+
+    mock_monotonic.return_value = 111.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
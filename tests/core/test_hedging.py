@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from chat_completion_server.core.hedging import MIN_SAMPLES, Hedger
+
+
+def _warm(hedger, latency=0.01, count=MIN_SAMPLES):
+    for _ in range(count):
+        hedger.record_latency(latency)
+
+
+def test_hedge_delay_requires_samples():
+    hedger = Hedger(percentile=50)
+    assert hedger.hedge_delay() is None
+
+    _warm(hedger, 0.02)
+    assert hedger.hedge_delay() == 0.02
+
+
+@pytest.mark.asyncio
+async def test_fast_primary_is_not_hedged():
+    hedger = Hedger(budget=1.0)
+    _warm(hedger)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        return "ok"
+
+    assert await hedger.run(call) == "ok"
+    assert calls == 1
+    assert hedger.metrics.hedged == 0
+
+
+@pytest.mark.asyncio
+async def test_stalled_primary_is_hedged_and_cancelled():
+    hedger = Hedger(budget=1.0)
+    _warm(hedger)
+    primary_cancelled = asyncio.Event()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                primary_cancelled.set()
+                raise
+        return f"attempt-{calls}"
+
+    assert await hedger.run(call) == "attempt-2"
+    await asyncio.sleep(0)
+
+    assert primary_cancelled.is_set()
+    assert hedger.metrics.hedged == 1
+    assert hedger.metrics.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_budget_caps_hedges():
+    hedger = Hedger(percentile=50, budget=0.05)
+    _warm(hedger, count=200)
+
+    async def call():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    for _ in range(40):
+        await hedger.run(call)
+
+    assert 1 <= hedger.metrics.hedged <= 2
+    assert hedger.metrics.budget_exhausted > 0
+
+
+@pytest.mark.asyncio
+async def test_primary_error_is_raised_when_all_attempts_fail():
+    hedger = Hedger(budget=1.0)
+    _warm(hedger)
+
+    async def call():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("upstream down")
+
+    with pytest.raises(RuntimeError, match="upstream down"):
+        await hedger.run(call)
+
+
+@pytest.mark.asyncio
+async def test_hedge_error_falls_back_to_primary():
+    hedger = Hedger(budget=1.0)
+    _warm(hedger)
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(0.03)
+            return "primary"
+        raise RuntimeError("hedge failed")
+
+    assert await hedger.run(call) == "primary"
+    assert hedger.metrics.hedge_wins == 0
@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from chat_completion_server.core.hook_executor import HookExecutor
+from chat_completion_server.core.server import ChatCompletionServer
+from chat_completion_server.models.config import HookOverflowPolicy, ProxyConfig
+
+
+class Recorder:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, value):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            self.calls.append(value)
+        finally:
+            self.running -= 1
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_job_in_background():
+    executor = HookExecutor()
+    recorder = Recorder()
+
+    assert await executor.submit(recorder, 1)
+    await asyncio.sleep(0.01)
+
+    assert recorder.calls == [1]
+    await executor.drain()
+
+
+@pytest.mark.asyncio
+async def test_workers_bound_concurrency():
+    """Test no more jobs run at once than there are workers."""
+    executor = HookExecutor(workers=2)
+    recorder = Recorder(delay=0.01)
+
+    for i in range(6):
+        await executor.submit(recorder, i)
+    await executor.drain()
+
+    assert sorted(recorder.calls) == list(range(6))
+    assert recorder.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_drop_policy_discards_when_full():
+    executor = HookExecutor(workers=1, max_queued=2, policy=HookOverflowPolicy.DROP)
+    recorder = Recorder(delay=0.05)
+
+    results = [await executor.submit(recorder, i) for i in range(4)]
+
+    # Workers only pick jobs up once the loop runs, so the first two fill the queue
+    assert results == [True, True, False, False]
+    assert executor.dropped == 2
+    await executor.drain()
+    assert recorder.calls == [0, 1]
+
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_room():
+    executor = HookExecutor(workers=1, max_queued=1, policy=HookOverflowPolicy.BLOCK)
+    recorder = Recorder(delay=0.01)
+
+    for i in range(3):
+        assert await executor.submit(recorder, i)
+    await executor.drain()
+
+    assert recorder.calls == [0, 1, 2]
+    assert executor.dropped == 0
+
+
+@pytest.mark.asyncio
+async def test_sample_policy_sheds_load_before_full():
+    """Test SAMPLE accepts everything below half capacity, then drops a growing share."""
+    executor = HookExecutor(workers=1, max_queued=100, policy=HookOverflowPolicy.SAMPLE)
+    recorder = Recorder()
+
+    accepted = [await executor.submit(recorder, i) for i in range(200)]
+
+    assert all(accepted[:50])
+    assert not all(accepted[50:100])
+    assert executor.dropped == accepted.count(False)
+    await executor.drain()
+
+
+@pytest.mark.asyncio
+async def test_failing_job_does_not_stop_worker():
+    executor = HookExecutor(workers=1)
+    recorder = Recorder()
+
+    async def fail():
+        raise RuntimeError("sink down")
+
+    await executor.submit(fail)
+    await executor.submit(recorder, "after")
+    await executor.drain()
+
+    assert recorder.calls == ["after"]
+
+
+@pytest.mark.asyncio
+async def test_drain_cancels_jobs_after_timeout():
+    executor = HookExecutor(workers=1)
+    recorder = Recorder(delay=10)
+
+    await executor.submit(recorder, 1)
+    await executor.drain(timeout=0.01)
+
+    assert recorder.calls == []
+    assert recorder.running == 0
+    assert executor.queued == 0
+
+
+@pytest.mark.asyncio
+async def test_server_aclose_drains_hooks():
+    """Test shutting the server down waits for queued hooks."""
+    server = ChatCompletionServer(config=ProxyConfig(hook_drain_timeout=1), plugins=[])
+    recorder = Recorder(delay=0.01)
+
+    await server.hook_executor.submit(recorder, 1)
+    await server.aclose()
+
+    assert recorder.calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_job_runs_in_submitter_context():
+    """Test context variables set by the submitter are visible to the job."""
+    import contextvars
+
+    var = contextvars.ContextVar("var", default=None)
+    executor = HookExecutor(workers=1)
+    seen = []
+
+    async def read():
+        seen.append(var.get())
+
+    for value in ("a", "b"):
+        var.set(value)
+        await executor.submit(read)
+    await executor.drain()
+
+    assert seen == ["a", "b"]
@@ -0,0 +1,178 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from chat_completion_server.core.load_balancer import LoadBalancedProxyHandler
+from chat_completion_server.core.server import ChatCompletionServer
+from chat_completion_server.models.config import (
+    LoadBalancingStrategy,
+    ProxyConfig,
+    UpstreamTarget,
+)
+
+
+def _handler(strategy, weights=(1.0, 1.0)):
+    targets = [
+        UpstreamTarget(url=f"http://upstream-{i}/v1", weight=weight)
+        for i, weight in enumerate(weights)
+    ]
+    return LoadBalancedProxyHandler(ProxyConfig(), targets=targets, strategy=strategy)
+
+
+def test_targets_get_own_handlers_with_shared_client():
+    config = ProxyConfig(
+        upstream_api_key="default-key",
+        upstream_targets=[
+            UpstreamTarget(url="http://a/v1", api_key="key-a"),
+            UpstreamTarget(url="http://b/v1"),
+        ],
+    )
+    handler = LoadBalancedProxyHandler(config)
+
+    assert [str(h.client.base_url) for h in handler.handlers] == ["http://a/v1/", "http://b/v1/"]
+    assert [h.client.api_key for h in handler.handlers] == ["key-a", "default-key"]
+    assert handler.handlers[0].http_client is handler.handlers[1].http_client
+
+
+def test_weighted_round_robin_respects_weights():
+    handler = _handler(LoadBalancingStrategy.WEIGHTED_ROUND_ROBIN, weights=(3.0, 1.0))
+
+    picks = [handler.select() for _ in range(8)]
+
+    assert picks.count(0) == 6
+    assert picks.count(1) == 2
+    # Smooth: the heavy target is never picked more than 3 times in a row
+    assert "0000" not in "".join(map(str, picks))
+
+
+def test_least_outstanding_picks_idle_target():
+    handler = _handler(LoadBalancingStrategy.LEAST_OUTSTANDING)
+    handler.stats[0].outstanding = 2
+
+    assert handler.select() == 1
+
+
+def test_ewma_prefers_faster_and_healthier_targets():
+    handler = _handler(LoadBalancingStrategy.EWMA)
+    handler.stats[0].record(0.5, error=False)
+    handler.stats[1].record(0.1, error=False)
+
+    assert handler.select() == 1
+
+    for _ in range(5):
+        handler.stats[1].record(0.1, error=True)
+
+    assert handler.select() == 0
+
+
+def test_ewma_explores_untried_targets_first():
+    handler = _handler(LoadBalancingStrategy.EWMA)
+    handler.stats[0].record(0.1, error=False)
+
+    assert handler.select() == 1
+
+
+@pytest.mark.asyncio
+async def test_ewma_avoids_always_failing_target():
+    """Test a target that fails fast (e.g. a bad API key) does not win every selection."""
+    handler = _handler(LoadBalancingStrategy.EWMA)
+    handler.handlers[0].execute_non_streaming = AsyncMock(return_value=Mock())
+    handler.handlers[1].execute_non_streaming = AsyncMock(side_effect=RuntimeError("401"))
+
+    picks = []
+    for _ in range(20):
+        picks.append(handler.select())
+        try:
+            await handler.execute({"model": "m"})
+        except RuntimeError:
+            pass
+
+    assert handler.stats[1].latency_ewma is None
+    assert picks.count(1) == 1
+    assert handler.select() == 0
+
+
+def test_ewma_scores_error_only_target_above_zero():
+    handler = _handler(LoadBalancingStrategy.EWMA)
+    handler.stats[0].record(0.1, error=True)
+
+    assert handler.stats[0].ewma_score(0.5) > 0
+    assert handler.select() == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_non_streaming_tracks_outstanding_and_latency():
+    handler = _handler(LoadBalancingStrategy.LEAST_OUTSTANDING)
+    release = asyncio.Event()
+
+    async def slow_response(params):
+        await release.wait()
+        return Mock()
+
+    for target_handler in handler.handlers:
+        target_handler.execute_non_streaming = AsyncMock(side_effect=slow_response)
+
+    tasks = [asyncio.create_task(handler.execute({"model": "m"})) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    assert [stats.outstanding for stats in handler.stats] == [1, 1]
+
+    release.set()
+    await asyncio.gather(*tasks)
+
+    assert [stats.outstanding for stats in handler.stats] == [0, 0]
+    assert all(stats.latency_ewma is not None for stats in handler.stats)
+
+
+@pytest.mark.asyncio
+async def test_execute_non_streaming_records_errors():
+    handler = _handler(LoadBalancingStrategy.EWMA, weights=(1.0,))
+    handler.handlers[0].execute_non_streaming = AsyncMock(side_effect=RuntimeError("down"))
+
+    with pytest.raises(RuntimeError):
+        await handler.execute({"model": "m"})
+
+    assert handler.stats[0].outstanding == 0
+    assert handler.stats[0].error_rate > 0
+
+
+@pytest.mark.asyncio
+async def test_execute_raw_stream_relays_selected_target():
+    handler = _handler(LoadBalancingStrategy.LEAST_OUTSTANDING)
+    handler.stats[0].outstanding = 1
+
+    async def raw_stream():
+        yield b"data: {}\n\n"
+
+    handler.handlers[1].execute_raw_stream = AsyncMock(return_value=raw_stream())
+
+    stream = await handler.execute_raw_stream({"model": "m"})
+
+    assert handler.stats[1].outstanding == 1
+    chunks = [chunk async for chunk in stream]
+
+    assert chunks == [b"data: {}\n\n"]
+    assert handler.stats[1].outstanding == 0
+    assert handler.stats[1].latency_ewma is not None
+
+
+@pytest.mark.asyncio
+async def test_execute_raw_stream_records_open_errors():
+    handler = _handler(LoadBalancingStrategy.EWMA, weights=(1.0,))
+    handler.handlers[0].execute_raw_stream = AsyncMock(side_effect=RuntimeError("down"))
+
+    with pytest.raises(RuntimeError):
+        await handler.execute_raw_stream({"model": "m"})
+
+    assert handler.stats[0].outstanding == 0
+    assert handler.stats[0].error_rate > 0
+
+
+def test_server_uses_load_balancer_when_targets_configured():
+    server = ChatCompletionServer(
+        ProxyConfig(upstream_targets=[UpstreamTarget(url="http://a/v1")])
+    )
+
+    assert isinstance(server.proxy_handler, LoadBalancedProxyHandler)
+    assert server.proxy_handler.handlers[0].http_client is server.http_client
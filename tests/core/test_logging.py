@@ -0,0 +1,95 @@
+import io
+import json
+import logging
+from queue import Queue
+from unittest.mock import patch
+
+import pytest
+
+from chat_completion_server.core import logging as logging_module
+from chat_completion_server.core.logging import (
+    JsonFormatter,
+    NonBlockingQueueHandler,
+    RequestIdFilter,
+    SamplingFilter,
+    set_request_id,
+    setup_logging,
+)
+
+
+def make_record(name="app", level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    logging_module._stop_listener()
+    root.handlers[:] = handlers
+    root.setLevel(level)
+
+
+def test_sampling_filter_uses_most_specific_prefix():
+    sampling = SamplingFilter({"app": 0.0, "app.keep": 1.0})
+
+    assert not sampling.filter(make_record("app.plugins"))
+    assert sampling.filter(make_record("app.keep.child"))
+    assert sampling.filter(make_record("other"))
+
+
+def test_sampling_filter_keeps_warnings():
+    sampling = SamplingFilter({"": 0.0})
+
+    assert not sampling.filter(make_record())
+    assert sampling.filter(make_record(level=logging.WARNING))
+
+
+def test_json_formatter():
+    record = make_record()
+    record.request_id = "req-1"
+
+    entry = json.loads(JsonFormatter().format(record))
+
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "app"
+    assert entry["request_id"] == "req-1"
+
+
+def test_queue_handler_defers_formatting_and_drops_when_full():
+    handler = NonBlockingQueueHandler(Queue(1))
+    first, second = make_record(), make_record()
+
+    handler.handle(first)
+    handler.handle(second)
+
+    queued = handler.queue.get_nowait()
+    assert queued is first
+    assert queued.args == ("world",)
+    assert handler.dropped == 1
+
+
+def test_request_id_is_captured_by_caller():
+    """Test the request ID is attached before the record leaves the calling context."""
+    handler = NonBlockingQueueHandler(Queue())
+    handler.addFilter(RequestIdFilter())
+
+    set_request_id("req-42")
+    handler.handle(make_record())
+    set_request_id(None)
+
+    assert handler.queue.get_nowait().request_id == "req-42"
+
+
+def test_setup_logging_writes_from_listener_thread(restore_root_logger):
+    stream = io.StringIO()
+    with patch.object(logging_module.sys, "stdout", stream):
+        setup_logging(json_output=True)
+        logging.getLogger("app").info("hello %s", "world")
+        logging_module._stop_listener()
+
+    entry = json.loads(stream.getvalue())
+    assert entry["message"] == "hello world"
+    assert isinstance(logging.getLogger().handlers[0], NonBlockingQueueHandler)
@@ -0,0 +1,69 @@
+import pytest
+
+from chat_completion_server.core.metrics import MetricsRegistry, ServerMetrics
+
+
+def test_counter_and_gauge_render():
+    registry = MetricsRegistry()
+    counter = registry.counter("requests_total", "Requests", ("model",))
+    gauge = registry.gauge("in_flight", "In flight")
+
+    counter.inc("a")
+    counter.inc("a", amount=2)
+    gauge.inc()
+    gauge.dec()
+    gauge.inc(amount=3)
+
+    text = registry.render()
+
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{model="a"} 3' in text
+    assert "in_flight 3" in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0))
+
+    histogram.observe(0.05, "/x")
+    histogram.observe(0.5, "/x")
+    histogram.observe(5.0, "/x")
+
+    text = registry.render()
+
+    assert 'latency_seconds_bucket{route="/x",le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{route="/x",le="1"} 2' in text
+    assert 'latency_seconds_bucket{route="/x",le="+Inf"} 3' in text
+    assert 'latency_seconds_sum{route="/x"} 5.55' in text
+    assert 'latency_seconds_count{route="/x"} 3' in text
+    assert histogram.get_count("/x") == 3
+
+
+def test_label_values_are_escaped():
+    registry = MetricsRegistry()
+    registry.counter("c", "C", ("name",)).inc('a"b\\c')
+
+    assert 'c{name="a\\"b\\\\c"} 1' in registry.render()
+
+
+def test_duplicate_metric_names_rejected():
+    registry = MetricsRegistry()
+    registry.counter("c", "C")
+
+    with pytest.raises(ValueError):
+        registry.gauge("c", "C")
+
+
+def test_server_metrics_render_every_family():
+    text = ServerMetrics().render()
+
+    for name in (
+        "chat_request_duration_seconds",
+        "upstream_request_duration_seconds",
+        "stream_time_to_first_token_seconds",
+        "stream_inter_token_seconds",
+        "tool_call_duration_seconds",
+        "plugin_hook_duration_seconds",
+        "chat_requests_in_flight",
+    ):
+        assert f"# TYPE {name} " in text
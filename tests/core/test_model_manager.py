@@ -166,3 +166,74 @@ def test_apply_system_prompt_passthrough(manager):
     result = manager.apply_model_config(params)
 
     assert result["messages"][0]["content"] == "Original"
+
+
+@pytest.mark.parametrize(
+    "behavior",
+    [SystemPromptBehavior.OVERRIDE, SystemPromptBehavior.PREPEND, SystemPromptBehavior.APPEND],
+)
+def test_apply_system_prompt_does_not_mutate_caller(manager, behavior):
+    """Test only copies of the params, message list and system message are changed."""
+    manager.register_model(
+        ModelConfig(
+            id="m", upstream_model="up", system_prompt="New", system_prompt_behavior=behavior
+        )
+    )
+    system = {"role": "system", "content": "Old"}
+    user = {"role": "user", "content": "Hi"}
+    messages = [system, user]
+    params = {"model": "m", "messages": messages}
+
+    result = manager.apply_model_config(params)
+
+    assert params == {"model": "m", "messages": [system, user]}
+    assert messages == [{"role": "system", "content": "Old"}, user]
+    assert result["model"] == "up"
+    assert result["messages"][0] is not system
+    # Untouched messages are shared, not copied
+    assert result["messages"][1] is user
+
+
+def test_apply_system_prompt_finds_system_message_after_first(manager, system_prompt_model):
+    manager.register_model(system_prompt_model)
+    params = {
+        "model": "system-model",
+        "messages": [{"role": "user", "content": "Hi"}, {"role": "system", "content": "Old"}],
+    }
+
+    result = manager.apply_model_config(params)
+
+    assert len(result["messages"]) == 2
+    assert result["messages"][1]["content"] == "You are a helpful assistant."
+
+
+def test_apply_system_prompt_prepend_to_content_parts(manager):
+    manager.register_model(
+        ModelConfig(
+            id="prepend-model",
+            system_prompt="New",
+            system_prompt_behavior=SystemPromptBehavior.PREPEND,
+        )
+    )
+    parts = [{"type": "text", "text": "Old"}]
+    params = {"model": "prepend-model", "messages": [{"role": "system", "content": parts}]}
+
+    result = manager.apply_model_config(params)
+
+    assert result["messages"][0]["content"] == [{"type": "text", "text": "New"}, *parts]
+
+
+def test_apply_model_config_noop_model_returns_params_unchanged(manager):
+    manager.register_model(ModelConfig(id="plain"))
+    params = {"model": "plain", "messages": [{"role": "user", "content": "Hi"}]}
+
+    assert manager.apply_model_config(params) is params
+
+
+def test_register_model_is_copy_on_write(manager, basic_model):
+    snapshot = manager.models
+
+    manager.register_model(basic_model)
+
+    assert snapshot == {}
+    assert manager.get_model("test-model") == basic_model
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from chat_completion_server.core.model_manager import ModelManager
+from chat_completion_server.core.model_registry import (
+    ModelRegistry,
+    ModelRegistryError,
+    load_models_file,
+)
+from chat_completion_server.core.server import ChatCompletionServer
+from chat_completion_server.models.config import ProxyConfig
+from chat_completion_server.models.model import ModelConfig
+
+
+def write_models(path, models):
+    path.write_text(json.dumps({"models": models}))
+    # Make sure the change is visible even on filesystems with coarse mtimes
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def models_file(tmp_path):
+    path = tmp_path / "models.json"
+    write_models(path, [{"id": "fast", "upstream_model": "gpt-4o-mini"}])
+    return path
+
+
+def test_load_models_file_json(models_file):
+    models = load_models_file(models_file)
+
+    assert models == {"fast": ModelConfig(id="fast", upstream_model="gpt-4o-mini")}
+
+
+def test_load_models_file_yaml(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "models.yaml"
+    path.write_text("- id: fast\n  system_prompt: Be brief.\n  system_prompt_behavior: override\n")
+
+    models = load_models_file(path)
+
+    assert models["fast"].system_prompt == "Be brief."
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "not json",
+        json.dumps({"models": {"id": "fast"}}),
+        json.dumps([{"id": "fast", "max_in_flight": "many"}]),
+        json.dumps([{"id": "fast"}, {"id": "fast"}]),
+    ],
+)
+def test_load_models_file_rejects_invalid(tmp_path, content):
+    path = tmp_path / "models.json"
+    path.write_text(content)
+
+    with pytest.raises(ModelRegistryError):
+        load_models_file(path)
+
+
+def test_reload_swaps_models_and_keeps_base_models(models_file):
+    base = {"local": ModelConfig(id="local")}
+    manager = ModelManager(base)
+    changes = []
+    registry = ModelRegistry(
+        models_file, manager, base_models=base, on_reload=lambda old, new: changes.append(new)
+    )
+
+    assert registry.reload()
+    snapshot = manager.models
+    assert set(snapshot) == {"local", "fast"}
+
+    write_models(models_file, [{"id": "fast", "upstream_model": "gpt-4o"}])
+    assert registry.reload()
+
+    assert manager.models["fast"].upstream_model == "gpt-4o"
+    # The previous snapshot is untouched
+    assert snapshot["fast"].upstream_model == "gpt-4o-mini"
+    assert len(changes) == 2
+    assert not registry.reload()
+
+
+def test_invalid_reload_keeps_current_models(models_file):
+    manager = ModelManager()
+    registry = ModelRegistry(models_file, manager)
+    registry.reload()
+
+    models_file.write_text("{")
+    with pytest.raises(ModelRegistryError):
+        registry.reload()
+
+    assert set(manager.models) == {"fast"}
+
+
+@pytest.mark.asyncio
+async def test_watch_reloads_changed_file(models_file):
+    manager = ModelManager()
+    registry = ModelRegistry(models_file, manager, poll_interval=0.01)
+    registry.reload()
+    registry.start()
+
+    write_models(models_file, [{"id": "slow"}])
+    await asyncio.sleep(0.1)
+    await registry.stop()
+
+    assert set(manager.models) == {"slow"}
+
+
+def test_server_loads_models_file_and_resets_changed_limiters(models_file):
+    write_models(models_file, [{"id": "fast", "max_in_flight": 2}])
+    server = ChatCompletionServer(
+        config=ProxyConfig(models_file=str(models_file)), plugins=[]
+    )
+    limiter = server.admission.get_limiter(server.model_manager.get_model("fast"))
+    assert limiter is not None
+
+    write_models(models_file, [{"id": "fast", "max_in_flight": 4}])
+    server.model_registry.reload()
+
+    assert "fast" not in server.admission.limiters
+    assert server.admission.get_limiter(server.model_manager.get_model("fast")).max_in_flight == 4
+
+
+def test_admin_reload_endpoint(models_file):
+    server = ChatCompletionServer(
+        config=ProxyConfig(models_file=str(models_file), admin_api_key="secret"), plugins=[]
+    )
+    client = TestClient(server.app)
+    write_models(models_file, [{"id": "fast"}, {"id": "slow"}])
+
+    assert client.post("/admin/models/reload").status_code == 401
+
+    response = client.post(
+        "/admin/models/reload", headers={"Authorization": "Bearer secret"}
+    )
+    assert response.status_code == 200
+    assert response.json()["reloaded"] is True
+    assert set(response.json()["models"]) == {"custom-model", "fast", "slow"}
+
+    models_file.write_text("{")
+    response = client.post(
+        "/admin/models/reload", headers={"Authorization": "Bearer secret"}
+    )
+    assert response.status_code == 400
+    assert "slow" in server.model_manager.models
+
+
+def test_admin_reload_endpoint_absent_without_models_file():
+    client = TestClient(ChatCompletionServer(plugins=[]).app)
+
+    assert client.post("/admin/models/reload").status_code == 404
+
+
+def test_admin_reload_endpoint_absent_without_admin_api_key(models_file):
+    server = ChatCompletionServer(config=ProxyConfig(models_file=str(models_file)), plugins=[])
+    client = TestClient(server.app)
+
+    assert client.post("/admin/models/reload").status_code == 404
@@ -0,0 +1,95 @@
+import pytest
+from unittest.mock import AsyncMock, Mock
+
+from chat_completion_server.core.plugin_pipeline import PluginPipeline, overrides_hook
+from chat_completion_server.core.server import ChatCompletionServer
+from chat_completion_server.models.plugin import ProxyPlugin, StreamEvents
+from chat_completion_server.plugins.guardrails import GuardrailsPlugin
+from chat_completion_server.plugins.logging import LoggingPlugin
+
+
+class NoopPlugin(ProxyPlugin):
+    pass
+
+
+class StreamPlugin(ProxyPlugin):
+    stream_events = StreamEvents.CHUNKS
+
+    def __init__(self):
+        self.calls = []
+
+    async def after_stream_async(self, params, response, events):
+        self.calls.append((params, response, events))
+
+
+class ErrorPlugin(ProxyPlugin):
+    stream_events = StreamEvents.ALL
+
+    async def on_error_async(self, params, error):
+        pass
+
+
+def test_overrides_hook():
+    """Test only hooks a plugin implements itself count as overridden."""
+    assert not overrides_hook(NoopPlugin(), "before_request")
+    assert overrides_hook(GuardrailsPlugin(), "before_request")
+    assert not overrides_hook(GuardrailsPlugin(), "on_error_async")
+    assert overrides_hook(Mock(), "on_error_async")
+
+    plugin = NoopPlugin()
+    plugin.on_error_async = AsyncMock()
+    assert overrides_hook(plugin, "on_error_async")
+
+
+def test_pipeline_compiles_per_hook_lists():
+    """Test each hook list only holds plugins overriding that hook, in order."""
+    guardrails, logging, stream, error = (
+        GuardrailsPlugin(),
+        LoggingPlugin(),
+        StreamPlugin(),
+        ErrorPlugin(),
+    )
+    pipeline = PluginPipeline([NoopPlugin(), guardrails, logging, stream, error])
+
+    assert pipeline.before_request == []
+    assert pipeline.validators == [guardrails, logging]
+    assert [plugin for plugin, _ in pipeline.after_request] == [logging, stream]
+    assert pipeline.after_stream == [stream]
+    assert pipeline.after_stream_timing == [logging]
+    assert pipeline.on_error == [logging, error]
+    # ErrorPlugin's ALL mode does not count, since it has no after_stream_async hook
+    assert pipeline.stream_events == StreamEvents.CHUNKS
+    assert pipeline.has_stream_hooks
+
+
+def test_empty_pipeline():
+    pipeline = PluginPipeline([NoopPlugin()])
+
+    assert pipeline.after_request == []
+    assert pipeline.stream_events == StreamEvents.NONE
+    assert not pipeline.has_stream_hooks
+
+
+@pytest.mark.asyncio
+async def test_after_request_calls_after_stream_directly():
+    """Test plugins relying on the default after_request_async get after_stream_async."""
+    plugin = StreamPlugin()
+    server = ChatCompletionServer(plugins=[plugin])
+    response = Mock()
+
+    await server._run_after_request_hooks({"model": "test"}, response)
+
+    assert plugin.calls == [({"model": "test"}, response, [])]
+
+
+@pytest.mark.asyncio
+async def test_reassigning_plugins_recompiles():
+    """Test assigning `plugins` rebuilds the pipeline."""
+    server = ChatCompletionServer(plugins=[])
+    assert server._pipeline.after_stream == []
+
+    plugin = StreamPlugin()
+    server.plugins = [plugin]
+
+    assert server.plugins == [plugin]
+    assert server._pipeline.after_stream == [plugin]
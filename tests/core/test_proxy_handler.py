@@ -1,3 +1,5 @@
+import httpx
+import openai
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from openai.types.chat import ChatCompletion, ChatCompletionMessage
@@ -5,6 +7,7 @@ from openai.types.chat.chat_completion import Choice
 from openai.types.completion_usage import CompletionUsage
 
 from chat_completion_server.core.proxy_handler import OpenAIProxyHandler
+from chat_completion_server.core.resilience import CircuitOpenError, GuardedStreamManager
 from chat_completion_server.models.config import ProxyConfig
 
 
@@ -53,23 +56,37 @@ async def test_execute_non_streaming(
 
 
 @pytest.mark.asyncio
-async def test_execute_streaming(handler: OpenAIProxyHandler) -> None:
-    mock_stream = MagicMock()
+async def test_execute_streaming_accepts_non_strict_tools(config: ProxyConfig) -> None:
+    """Test streams are opened with `create(stream=True)`, so non-strict tools are accepted."""
+    body = (
+        b'data: {"id":"1","object":"chat.completion.chunk","created":1,"model":"gpt-4",'
+        b'"choices":[{"index":0,"delta":{"role":"assistant","content":"Hi"}}]}\n\n'
+        b'data: {"id":"1","object":"chat.completion.chunk","created":1,"model":"gpt-4",'
+        b'"choices":[{"index":0,"delta":{},"finish_reason":"stop"}]}\n\n'
+        b"data: [DONE]\n\n"
+    )
+    requests = []
 
-    with patch.object(handler.client.chat.completions, "stream") as mock_stream_method:
-        mock_stream_method.return_value = mock_stream
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
 
-        params = {
-            "model": "gpt-4",
-            "messages": [{"role": "user", "content": "Hello"}],
-            "stream": True,
-        }
-        result = await handler.execute(params)
+    handler = OpenAIProxyHandler(config, httpx.AsyncClient(transport=httpx.MockTransport(respond)))
+    params = {
+        "model": "gpt-4",
+        "messages": [{"role": "user", "content": "Hello"}],
+        "tools": [{"type": "function", "function": {"name": "f", "parameters": {}}}],
+        "stream": True,
+    }
+
+    result = await handler.execute(params)
 
-        assert result == mock_stream
-        mock_stream_method.assert_called_once_with(
-            model="gpt-4", messages=[{"role": "user", "content": "Hello"}]
-        )
+    assert isinstance(result, GuardedStreamManager)
+    async with result as stream:
+        chunks = [event.chunk async for event in stream if event.type == "chunk"]
+    assert len(chunks) == 2
+    assert stream.current_completion_snapshot.choices[0].message.content == "Hi"
+    assert b'"stream":true' in requests[0].content.replace(b" ", b"")
 
 
 def test_handler_initialization() -> None:
@@ -84,3 +101,104 @@ def test_handler_initialization() -> None:
         "https://test.api.com/v1/"
     )  # client may append /
     assert handler.client.timeout == config.proxy_timeout
+
+
+def test_handler_clients_share_connection_pool(config: ProxyConfig) -> None:
+    handler = OpenAIProxyHandler(config)
+
+    assert handler.high_timeout_client._client is handler.http_client
+    assert handler.client._client is handler.http_client
+    assert handler.high_timeout_client.timeout == config.proxy_non_streaming_timeout
+
+
+def test_handler_uses_injected_http_client(config: ProxyConfig) -> None:
+    http_client = httpx.AsyncClient()
+    handler = OpenAIProxyHandler(config, http_client)
+
+    assert handler.http_client is http_client
+    assert handler.client._client is http_client
+
+
+@pytest.mark.asyncio
+async def test_execute_raw_stream_relays_upstream_bytes(config: ProxyConfig) -> None:
+    body = b'data: {"id":"1"}\n\ndata: [DONE]\n\n'
+    requests = []
+
+    def respond(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, content=body, headers={"content-type": "text/event-stream"})
+
+    handler = OpenAIProxyHandler(config, httpx.AsyncClient(transport=httpx.MockTransport(respond)))
+
+    params = {"model": "gpt-4", "messages": [{"role": "user", "content": "Hello"}], "stream": True}
+    stream = await handler.execute_raw_stream(params)
+    data = b"".join([chunk async for chunk in stream])
+
+    assert data == body
+    assert requests[0].url.path.endswith("/chat/completions")
+    assert b'"stream":true' in requests[0].content.replace(b" ", b"")
+
+
+def _failing_transport(status_code: int, calls: list[httpx.Request]) -> httpx.MockTransport:
+    def respond(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(status_code, json={"error": {"message": "unavailable"}})
+
+    return httpx.MockTransport(respond)
+
+
+@pytest.mark.asyncio
+async def test_execute_non_streaming_retries_then_opens_circuit() -> None:
+    config = ProxyConfig(
+        upstream_url="https://test.api.com/v1",
+        upstream_max_retries=1,
+        circuit_failure_threshold=2,
+    )
+    calls: list[httpx.Request] = []
+    handler = OpenAIProxyHandler(config, httpx.AsyncClient(transport=_failing_transport(503, calls)))
+    params = {"model": "gpt-4", "messages": [{"role": "user", "content": "Hello"}]}
+
+    with patch("chat_completion_server.core.resilience.RETRY_BACKOFF_BASE", 0):
+        with pytest.raises(Exception):
+            await handler.execute(params)
+
+    # One retry, then the second failure opens the circuit
+    assert len(calls) == 2
+    with pytest.raises(CircuitOpenError):
+        await handler.execute(params)
+    with pytest.raises(CircuitOpenError):
+        await handler.execute({**params, "stream": True})
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_raw_stream_raises_before_returning() -> None:
+    """Test upstream errors and an open circuit are raised when the raw stream is opened."""
+    config = ProxyConfig(
+        upstream_url="https://test.api.com/v1",
+        upstream_max_retries=0,
+        circuit_failure_threshold=1,
+    )
+    calls: list[httpx.Request] = []
+    handler = OpenAIProxyHandler(config, httpx.AsyncClient(transport=_failing_transport(503, calls)))
+    params = {"model": "gpt-4", "messages": [{"role": "user", "content": "Hello"}]}
+
+    with pytest.raises(openai.InternalServerError):
+        await handler.execute_raw_stream(params)
+    with pytest.raises(CircuitOpenError):
+        await handler.execute_raw_stream(params)
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_non_streaming_does_not_retry_client_errors() -> None:
+    calls: list[httpx.Request] = []
+    handler = OpenAIProxyHandler(
+        ProxyConfig(upstream_url="https://test.api.com/v1"),
+        httpx.AsyncClient(transport=_failing_transport(400, calls)),
+    )
+
+    with pytest.raises(Exception):
+        await handler.execute({"model": "gpt-4", "messages": []})
+
+    assert len(calls) == 1
@@ -0,0 +1,101 @@
+import pytest
+from openai.types.chat import ChatCompletion
+
+from chat_completion_server.core.rate_limit import (
+    ANONYMOUS_CALLER,
+    InMemoryRateLimitBackend,
+    RateLimiter,
+    RateLimitExceededError,
+    get_usage_tokens,
+)
+from chat_completion_server.models.config import ProxyConfig
+
+
+def _completion(content="hello", usage=None):
+    data = {
+        "id": "id",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "m",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}
+        ],
+    }
+    if usage is not None:
+        data["usage"] = usage
+    return ChatCompletion.model_validate(data)
+
+
+def test_identify_hashes_api_keys():
+    limiter = RateLimiter(ProxyConfig(rate_limit_requests_per_minute=10))
+
+    caller = limiter.identify({"authorization": "Bearer sk-secret"})
+
+    assert caller.startswith("key:")
+    assert "sk-secret" not in caller
+    assert caller == limiter.identify({"authorization": "Bearer sk-secret"})
+    assert caller != limiter.identify({"authorization": "Bearer sk-other"})
+    assert limiter.identify({}) == ANONYMOUS_CALLER
+    assert limiter.identify(None) == ANONYMOUS_CALLER
+
+
+def test_identify_prefers_tenant_header():
+    limiter = RateLimiter(
+        ProxyConfig(rate_limit_requests_per_minute=10, rate_limit_tenant_header="x-tenant-id")
+    )
+
+    assert limiter.identify({"x-tenant-id": "acme", "authorization": "Bearer k"}) == "tenant:acme"
+
+
+def test_disabled_by_default():
+    assert not RateLimiter(ProxyConfig()).enabled
+
+
+@pytest.mark.asyncio
+async def test_in_memory_backend_refills_over_time(monkeypatch):
+    now = 100.0
+    monkeypatch.setattr("chat_completion_server.core.rate_limit.monotonic", lambda: now)
+    backend = InMemoryRateLimitBackend()
+
+    assert await backend.consume("k", 2, capacity=2, refill_rate=1) == 0
+    assert await backend.consume("k", 1, capacity=2, refill_rate=1) == pytest.approx(1)
+
+    now += 1
+    assert await backend.consume("k", 1, capacity=2, refill_rate=1) == 0
+
+
+@pytest.mark.asyncio
+async def test_requests_per_minute_limit():
+    limiter = RateLimiter(ProxyConfig(rate_limit_requests_per_minute=2))
+
+    await limiter.admit("a")
+    await limiter.admit("a")
+    with pytest.raises(RateLimitExceededError) as exc_info:
+        await limiter.admit("a")
+
+    assert exc_info.value.retry_after == pytest.approx(30, abs=1)
+    # Other callers are unaffected
+    await limiter.admit("b")
+
+
+@pytest.mark.asyncio
+async def test_token_usage_charged_after_the_fact():
+    limiter = RateLimiter(ProxyConfig(rate_limit_tokens_per_minute=100))
+
+    await limiter.admit("a")
+    await limiter.charge("a", 150)
+
+    with pytest.raises(RateLimitExceededError, match="tokens per minute"):
+        await limiter.admit("a")
+
+
+def test_get_usage_tokens_prefers_reported_usage():
+    usage = {"prompt_tokens": 3, "completion_tokens": 4, "total_tokens": 7}
+
+    assert get_usage_tokens({"messages": []}, _completion(usage=usage)) == 7
+
+
+def test_get_usage_tokens_estimates_without_usage():
+    params = {"messages": [{"role": "user", "content": "x" * 8}]}
+
+    assert get_usage_tokens(params, _completion(content="y" * 4)) == 3
@@ -0,0 +1,189 @@
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from chat_completion_server.core.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    RetryBudget,
+    UpstreamGuard,
+    is_retryable,
+    is_upstream_failure,
+)
+from chat_completion_server.models.config import ProxyConfig
+
+
+def _status_error(status_code):
+    request = httpx.Request("POST", "http://upstream")
+    response = httpx.Response(status_code, request=request)
+    return httpx.HTTPStatusError("error", request=request, response=response)
+
+
+def test_error_classification():
+    assert is_upstream_failure(httpx.ConnectError("refused"))
+    assert is_upstream_failure(_status_error(502))
+    assert not is_upstream_failure(_status_error(429))
+    assert is_retryable(_status_error(429))
+    assert not is_retryable(_status_error(400))
+    assert not is_retryable(ValueError("bad"))
+
+
+def test_breaker_opens_after_threshold_and_recovers():
+    breaker = CircuitBreaker("upstream", failure_threshold=2, recovery_timeout=30)
+
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    with pytest.raises(CircuitOpenError) as exc_info:
+        breaker.before_call()
+    assert 0 < exc_info.value.retry_after <= 30
+
+    breaker._opened_at -= 30
+    assert breaker.state == CircuitState.HALF_OPEN
+
+    breaker.before_call()
+    # Only one probe at a time
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_failed_probe_reopens_circuit():
+    breaker = CircuitBreaker("upstream", failure_threshold=1, recovery_timeout=30)
+    breaker.record_failure()
+    breaker._opened_at -= 30
+
+    breaker.before_call()
+    breaker.record_failure()
+
+    assert breaker.state == CircuitState.OPEN
+
+
+def test_client_errors_do_not_trip_breaker():
+    breaker = CircuitBreaker("upstream", failure_threshold=1)
+
+    breaker.record(_status_error(404))
+
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_breaker_disabled_with_zero_threshold():
+    breaker = CircuitBreaker("upstream", failure_threshold=0)
+    for _ in range(10):
+        breaker.record_failure()
+
+    breaker.before_call()
+
+
+def test_retry_budget_limits_withdrawals():
+    budget = RetryBudget(ratio=0.5, max_tokens=1)
+
+    assert budget.try_withdraw()
+    assert not budget.try_withdraw()
+
+    budget.deposit()
+    budget.deposit()
+    assert budget.try_withdraw()
+
+
+@pytest.mark.asyncio
+@patch("chat_completion_server.core.resilience.RETRY_BACKOFF_BASE", 0)
+async def test_guard_retries_retryable_errors():
+    guard = UpstreamGuard("upstream", ProxyConfig(upstream_max_retries=2))
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        if attempts < 3:
+            raise httpx.ConnectError("refused")
+        return "ok"
+
+    assert await guard.call(call) == "ok"
+    assert attempts == 3
+
+
+@pytest.mark.asyncio
+@patch("chat_completion_server.core.resilience.RETRY_BACKOFF_BASE", 0)
+async def test_guard_stops_retrying_when_budget_spent():
+    guard = UpstreamGuard("upstream", ProxyConfig(upstream_max_retries=5))
+    guard.retry_budget.tokens = 1
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        raise httpx.ConnectError("refused")
+
+    with pytest.raises(httpx.ConnectError):
+        await guard.call(call)
+
+    assert attempts == 2
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    guard = UpstreamGuard("upstream", ProxyConfig(circuit_failure_threshold=1))
+    guard.breaker.record_failure()
+
+    async def call():
+        await asyncio.sleep(10)
+
+    with pytest.raises(CircuitOpenError):
+        await asyncio.wait_for(guard.call(call), timeout=0.1)
+
+
+@pytest.mark.asyncio
+async def test_guard_timeout_counts_as_failure():
+    guard = UpstreamGuard(
+        "tools", ProxyConfig(circuit_failure_threshold=2), max_retries=0, timeout=0.01
+    )
+
+    async def call():
+        await asyncio.sleep(1)
+
+    for _ in range(2):
+        with pytest.raises(asyncio.TimeoutError):
+            await guard.call(call)
+
+    assert guard.breaker.state == CircuitState.OPEN
+
+
+def test_get_retry_after_parses_seconds_and_milliseconds():
+    from chat_completion_server.core.resilience import get_retry_after
+
+    request = httpx.Request("POST", "http://upstream")
+
+    def error(headers):
+        response = httpx.Response(429, request=request, headers=headers)
+        return httpx.HTTPStatusError("error", request=request, response=response)
+
+    assert get_retry_after(error({"retry-after": "3"})) == 3
+    assert get_retry_after(error({"retry-after-ms": "250"})) == 0.25
+    assert get_retry_after(error({})) is None
+    assert get_retry_after(ValueError()) is None
+
+
+@pytest.mark.asyncio
+async def test_guard_does_not_retry_long_retry_after():
+    guard = UpstreamGuard("upstream", ProxyConfig(upstream_max_retries=2))
+    request = httpx.Request("POST", "http://upstream")
+    attempts = 0
+
+    async def call():
+        nonlocal attempts
+        attempts += 1
+        response = httpx.Response(429, request=request, headers={"retry-after": "60"})
+        raise httpx.HTTPStatusError("rate limited", request=request, response=response)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await guard.call(call)
+
+    assert attempts == 1
@@ -0,0 +1,263 @@
+import json
+
+import httpx
+import pytest
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from openai.types.chat import ChatCompletion
+
+from chat_completion_server.core.proxy_handler import OpenAIProxyHandler
+from chat_completion_server.core.server import ChatCompletionServer
+from chat_completion_server.models.config import ProxyConfig
+
+
+@pytest.fixture
+def completion():
+    return ChatCompletion.model_validate(
+        {
+            "id": "test-id",
+            "object": "chat.completion",
+            "created": 1234567890,
+            "model": "test-model",
+            "choices": [
+                {
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": "héllo"},
+                }
+            ],
+            "usage": {"prompt_tokens": 1, "completion_tokens": 2, "total_tokens": 3},
+        }
+    )
+
+
+def post_completion(server, completion):
+    with patch.object(server, "process_request", new_callable=AsyncMock) as mock_process:
+        mock_process.return_value = completion
+        client = TestClient(server.app)
+        return client.post(
+            "/v1/chat/completions",
+            json={"model": "custom-model", "messages": [{"role": "user", "content": "hi"}]},
+        )
+
+
+def test_fast_json_response_matches_default_encoding(completion):
+    fast = post_completion(ChatCompletionServer(plugins=[]), completion)
+    default = post_completion(
+        ChatCompletionServer(config=ProxyConfig(fast_json_responses=False), plugins=[]),
+        completion,
+    )
+
+    assert fast.status_code == default.status_code == 200
+    assert fast.headers["content-type"] == "application/json"
+    assert fast.content == default.content
+
+
+def test_chat_completions_passes_request_headers(completion):
+    server = ChatCompletionServer(plugins=[])
+    with patch.object(server, "process_request", new_callable=AsyncMock) as mock_process:
+        mock_process.return_value = completion
+        client = TestClient(server.app)
+        client.post(
+            "/v1/chat/completions",
+            json={"model": "custom-model", "messages": [{"role": "user", "content": "hi"}]},
+            headers={"Cache-Control": "no-cache"},
+        )
+
+    headers = mock_process.call_args[0][1]
+    assert headers["cache-control"] == "no-cache"
+
+
+def test_open_circuit_returns_503_with_retry_after():
+    from chat_completion_server.core.resilience import CircuitOpenError
+
+    server = ChatCompletionServer(plugins=[])
+    with patch.object(server, "process_request", new_callable=AsyncMock) as mock_process:
+        mock_process.side_effect = CircuitOpenError("upstream", retry_after=12.3)
+        response = TestClient(server.app).post(
+            "/v1/chat/completions",
+            json={"model": "custom-model", "messages": [{"role": "user", "content": "hi"}]},
+        )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "13"
+
+
+def test_passthrough_open_circuit_returns_503_with_retry_after():
+    """Test an open circuit fails a passthrough stream with 503 instead of an empty 200."""
+    server = ChatCompletionServer(
+        config=ProxyConfig(stream_passthrough=True, circuit_failure_threshold=1), plugins=[]
+    )
+    server.proxy_handler.guard.breaker.record_failure()
+
+    response = TestClient(server.app).post(
+        "/v1/chat/completions",
+        json={
+            "model": "custom-model",
+            "messages": [{"role": "user", "content": "hi"}],
+            "stream": True,
+        },
+    )
+
+    assert response.status_code == 503
+    assert int(response.headers["retry-after"]) > 0
+
+
+def test_passthrough_upstream_error_is_not_a_200():
+    server = ChatCompletionServer(config=ProxyConfig(stream_passthrough=True), plugins=[])
+    server.proxy_handler.execute_raw_stream = AsyncMock(side_effect=RuntimeError("refused"))
+
+    response = TestClient(server.app).post(
+        "/v1/chat/completions",
+        json={
+            "model": "custom-model",
+            "messages": [{"role": "user", "content": "hi"}],
+            "stream": True,
+        },
+    )
+
+    assert response.status_code == 500
+
+
+def _sse_chunks(*choices):
+    frames = [
+        "data: "
+        + json.dumps(
+            {
+                "id": "chunk-id",
+                "object": "chat.completion.chunk",
+                "created": 1,
+                "model": "custom-model",
+                "choices": [choice],
+            }
+        )
+        + "\n\n"
+        for choice in choices
+    ]
+    return ("".join(frames) + "data: [DONE]\n\n").encode()
+
+
+def test_streaming_tool_round_with_non_strict_tool():
+    """Test a streamed tool round end to end, with a tool not marked `strict`."""
+    tool_call = {
+        "index": 0,
+        "id": "call_a",
+        "type": "function",
+        "function": {"name": "lookup", "arguments": '{"q": "x"}'},
+    }
+    bodies = [
+        _sse_chunks(
+            {"index": 0, "delta": {"role": "assistant", "tool_calls": [tool_call]}},
+            {"index": 0, "delta": {}, "finish_reason": "tool_calls"},
+        ),
+        _sse_chunks(
+            {"index": 0, "delta": {"role": "assistant", "content": "Found it"}},
+            {"index": 0, "delta": {}, "finish_reason": "stop"},
+        ),
+    ]
+    requests = []
+
+    def respond(request):
+        requests.append(json.loads(request.content))
+        return httpx.Response(
+            200, content=bodies[len(requests) - 1], headers={"content-type": "text/event-stream"}
+        )
+
+    config = ProxyConfig()
+    handler = OpenAIProxyHandler(config, httpx.AsyncClient(transport=httpx.MockTransport(respond)))
+    server = ChatCompletionServer(config=config, proxy_handler=handler, plugins=[])
+    server.proxy_tool_client.execute_tool = AsyncMock(
+        return_value={"role": "tool", "tool_call_id": "call_a", "content": "result"}
+    )
+
+    response = TestClient(server.app).post(
+        "/v1/chat/completions",
+        json={
+            "model": "custom-model",
+            "messages": [{"role": "user", "content": "hi"}],
+            "tools": [{"type": "function", "function": {"name": "lookup", "parameters": {}}}],
+            "stream": True,
+        },
+    )
+
+    assert response.status_code == 200
+    assert "Found it" in response.text
+    assert "tool_calls" not in response.text
+    assert response.text.endswith("data: [DONE]\n\n")
+    assert len(requests) == 2
+    assert requests[1]["messages"][-1]["tool_call_id"] == "call_a"
+
+
+def test_admission_rejection_returns_429_with_retry_after():
+    from chat_completion_server.core.admission import AdmissionRejectedError
+
+    server = ChatCompletionServer(plugins=[])
+    with patch.object(server, "process_request", new_callable=AsyncMock) as mock_process:
+        mock_process.side_effect = AdmissionRejectedError("custom-model", retry_after=2.5)
+        response = TestClient(server.app).post(
+            "/v1/chat/completions",
+            json={"model": "custom-model", "messages": [{"role": "user", "content": "hi"}]},
+        )
+
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
+
+
+def test_rate_limited_request_returns_429():
+    server = ChatCompletionServer(
+        config=ProxyConfig(rate_limit_requests_per_minute=1), plugins=[]
+    )
+    client = TestClient(server.app)
+    body = {"model": "custom-model", "messages": [{"role": "user", "content": "hi"}]}
+
+    with patch.object(server, "_execute_non_streaming", new_callable=AsyncMock) as mock_execute:
+        mock_execute.return_value = ChatCompletion.model_validate(
+            {
+                "id": "id",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "m",
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": "ok"},
+                    }
+                ],
+            }
+        )
+        first = client.post("/v1/chat/completions", json=body, headers={"Authorization": "Bearer a"})
+        second = client.post("/v1/chat/completions", json=body, headers={"Authorization": "Bearer a"})
+
+    assert first.status_code == 200
+    assert second.status_code == 429
+    assert int(second.headers["retry-after"]) > 0
+
+
+def test_metrics_endpoint_reports_requests(completion):
+    server = ChatCompletionServer(plugins=[])
+    client = TestClient(server.app)
+
+    with patch.object(server, "_execute_non_streaming", new_callable=AsyncMock) as mock_execute:
+        mock_execute.return_value = completion
+        client.post(
+            "/v1/chat/completions",
+            json={"model": "custom-model", "messages": [{"role": "user", "content": "hi"}]},
+        )
+
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'chat_requests_total{model="custom-model",stream="false",outcome="ok"} 1' in response.text
+    assert 'chat_requests_in_flight{model="custom-model"} 0' in response.text
+    assert (
+        'http_requests_total{route="/v1/chat/completions",method="POST",status="200"} 1'
+        in response.text
+    )
+
+
+def test_metrics_endpoint_can_be_disabled():
+    server = ChatCompletionServer(config=ProxyConfig(enable_metrics=False), plugins=[])
+
+    assert TestClient(server.app).get("/metrics").status_code == 404
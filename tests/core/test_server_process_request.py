@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from unittest.mock import Mock, patch, AsyncMock
 from openai.types.chat import ChatCompletion, ChatCompletionMessage
@@ -5,6 +7,7 @@ from openai.types.chat.chat_completion import Choice
 from openai.lib.streaming.chat import AsyncChatCompletionStreamManager, ChatCompletionStreamEvent
 
 from chat_completion_server.core.server import ChatCompletionServer
+from chat_completion_server.models.plugin import ProxyPlugin, StreamEvents
 
 
 @pytest.fixture
@@ -146,6 +149,68 @@ async def test_process_request_calls_plugins(server, mock_response):
     plugin.before_request.assert_called_once()
 
 
+class ValidatorPlugin(ProxyPlugin):
+    mutates_params = False
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.seen = None
+        self.cancelled = False
+
+    async def before_request(self, params):
+        self.seen = params
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error is not None:
+            raise self.error
+        return params
+
+
+class MutatingPlugin(ProxyPlugin):
+    async def before_request(self, params):
+        params["temperature"] = 0.5
+        return params
+
+
+@pytest.mark.asyncio
+async def test_read_only_hooks_run_concurrently_after_mutators(server):
+    """Test read-only before_request hooks run in parallel and see mutated params."""
+    validators = [ValidatorPlugin(delay=0.1) for _ in range(3)]
+    server.plugins = [validators[0], MutatingPlugin(), *validators[1:]]
+
+    started_at = asyncio.get_running_loop().time()
+    params = await server._run_before_request_hooks({"model": "test", "messages": []})
+    elapsed = asyncio.get_running_loop().time() - started_at
+
+    assert params["temperature"] == 0.5
+    assert elapsed < 0.25
+    for validator in validators:
+        assert validator.seen["temperature"] == 0.5
+        with pytest.raises(TypeError):
+            validator.seen["model"] = "other"
+
+
+@pytest.mark.asyncio
+async def test_failing_read_only_hook_cancels_others(server):
+    """Test the first failing read-only hook rejects the request and cancels the rest."""
+    slow = ValidatorPlugin(delay=10)
+    failing = ValidatorPlugin(error=ValueError("policy violation"))
+    server.plugins = [slow, failing]
+    server.proxy_handler.execute = AsyncMock()
+
+    with pytest.raises(ValueError, match="policy violation"):
+        await asyncio.wait_for(
+            server.process_request({"model": "test", "messages": []}), timeout=1
+        )
+
+    assert slow.cancelled
+    server.proxy_handler.execute.assert_not_called()
+
+
 # _stream_with_hooks tests
 @pytest.mark.asyncio
 @patch("chat_completion_server.core.server.logger")
@@ -171,7 +236,7 @@ async def test_stream_with_hooks_content_delta(mock_logger, server):
             yield event
 
     mock_stream.__aiter__ = lambda self: mock_aiter()
-    mock_stream.get_final_completion = AsyncMock(return_value=Mock())
+    mock_stream.current_completion_snapshot = Mock()
 
     params = {"model": "test"}
 
@@ -180,8 +245,8 @@ async def test_stream_with_hooks_content_delta(mock_logger, server):
     async for chunk in server._stream_with_hooks(mock_stream_manager, params):
         chunks.append(chunk)
 
-    # Verify output
-    assert chunks == ["data: Hello\n\n", "data:  world\n\n", "data: [DONE]\n\n"]
+    # Delta events are not sent as frames of their own; only chunks and [DONE] are
+    assert chunks == [b"data: [DONE]\n\n"]
     mock_logger.info.assert_called()
 
 
@@ -194,7 +259,7 @@ async def test_stream_with_hooks_chunk_events(server):
     mock_stream_manager.__aexit__ = AsyncMock(return_value=None)
 
     # Mock chunk event
-    mock_chunk = Mock()
+    mock_chunk = Mock(choices=[])
     mock_chunk.model_dump_json = Mock(return_value='{"id":"test"}')
 
     event = Mock(spec=ChatCompletionStreamEvent)
@@ -205,13 +270,13 @@ async def test_stream_with_hooks_chunk_events(server):
         yield event
 
     mock_stream.__aiter__ = lambda self: mock_aiter()
-    mock_stream.get_final_completion = AsyncMock(return_value=Mock())
+    mock_stream.current_completion_snapshot = Mock()
 
     chunks = []
     async for chunk in server._stream_with_hooks(mock_stream_manager, {}):
         chunks.append(chunk)
 
-    assert chunks == ['data: {"id":"test"}\n\n', "data: [DONE]\n\n"]
+    assert chunks == [b'data: {"id":"test"}\n\n', b"data: [DONE]\n\n"]
     mock_chunk.model_dump_json.assert_called_once_with(exclude_none=True)
 
 
@@ -231,13 +296,14 @@ async def test_stream_with_hooks_refusal_delta(server):
         yield event
 
     mock_stream.__aiter__ = lambda self: mock_aiter()
-    mock_stream.get_final_completion = AsyncMock(return_value=Mock())
+    mock_stream.current_completion_snapshot = Mock()
 
     chunks = []
     async for chunk in server._stream_with_hooks(mock_stream_manager, {}):
         chunks.append(chunk)
 
-    assert chunks == ["data: I cannot\n\n", "data: I cannot\n\n", "data: [DONE]\n\n"]
+    # Refusal deltas reach the client through their chunk frame only
+    assert chunks == [b"data: [DONE]\n\n"]
 
 
 @pytest.mark.asyncio
@@ -261,7 +327,7 @@ async def test_stream_with_hooks_calls_after_stream_hooks(server):
 
     mock_stream.__aiter__ = lambda self: mock_aiter()
     final_completion = Mock()
-    mock_stream.get_final_completion = AsyncMock(return_value=final_completion)
+    mock_stream.current_completion_snapshot = final_completion
 
     params = {"model": "test"}
 
@@ -291,7 +357,7 @@ async def test_stream_with_hooks_tracks_event_types(server):
         Mock(
             spec=ChatCompletionStreamEvent,
             type="chunk",
-            chunk=Mock(model_dump_json=Mock(return_value="{}")),
+            chunk=Mock(choices=[], model_dump_json=Mock(return_value="{}")),
         ),
     ]
 
@@ -300,7 +366,7 @@ async def test_stream_with_hooks_tracks_event_types(server):
             yield event
 
     mock_stream.__aiter__ = lambda self: mock_aiter()
-    mock_stream.get_final_completion = AsyncMock(return_value=Mock())
+    mock_stream.current_completion_snapshot = Mock()
 
     with patch("chat_completion_server.core.server.logger") as mock_logger:
         async for _ in server._stream_with_hooks(mock_stream_manager, {}):
@@ -372,6 +438,59 @@ async def test_process_non_streaming_single_tool_call(mock_normalize, server):
     server.proxy_handler.execute_non_streaming.assert_called_once()
 
 
+@pytest.mark.asyncio
+async def test_process_non_streaming_sums_usage_across_tool_rounds(server):
+    """Test the returned usage covers every tool round, not just the last one."""
+    from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall
+    from openai.types.chat.chat_completion_message_tool_call import Function
+    from openai.types.completion_usage import CompletionUsage
+
+    tool_call = ChatCompletionMessageToolCall(
+        id="call_123", function=Function(name="test_tool", arguments="{}"), type="function"
+    )
+    tool_response = ChatCompletion(
+        id="test-id",
+        choices=[
+            Choice(
+                finish_reason="tool_calls",
+                index=0,
+                message=ChatCompletionMessage(
+                    role="assistant", content=None, tool_calls=[tool_call]
+                ),
+            )
+        ],
+        created=1234567890,
+        model="test-model",
+        object="chat.completion",
+        usage=CompletionUsage(prompt_tokens=10, completion_tokens=5, total_tokens=15),
+    )
+    final_response = ChatCompletion(
+        id="test-id-2",
+        choices=[
+            Choice(
+                finish_reason="stop",
+                index=0,
+                message=ChatCompletionMessage(role="assistant", content="Done"),
+            )
+        ],
+        created=1234567890,
+        model="test-model",
+        object="chat.completion",
+        usage=CompletionUsage(prompt_tokens=20, completion_tokens=3, total_tokens=23),
+    )
+    server.proxy_handler.execute_non_streaming = AsyncMock(return_value=final_response)
+    server.proxy_tool_client.execute_tool = AsyncMock(
+        return_value={"role": "tool", "content": "result"}
+    )
+
+    params = {"model": "test", "messages": [{"role": "user", "content": "test"}]}
+    result = await server._process_non_streaming_response(params, tool_response)
+
+    assert result.usage == CompletionUsage(
+        prompt_tokens=30, completion_tokens=8, total_tokens=38
+    )
+
+
 @pytest.mark.asyncio
 @patch("chat_completion_server.core.server.normalize_chat_completion")
 async def test_process_non_streaming_multiple_tool_calls(mock_normalize, server):
@@ -567,3 +686,1019 @@ async def test_process_non_streaming_no_tool_calls(mock_normalize, server):
 
     assert result == normal_response
     server.proxy_tool_client.execute_tool.assert_not_called()
+
+
+# Response cache tests
+@pytest.fixture
+def cached_server():
+    from chat_completion_server.models.model import ModelConfig
+
+    models = {"cached": ModelConfig(id="cached", response_cache_ttl=60)}
+    return ChatCompletionServer(plugins=[], models=models)
+
+
+@pytest.mark.asyncio
+async def test_process_request_serves_cache_hit(cached_server, mock_response):
+    """Test identical temperature=0 requests are served from the response cache."""
+    cached_server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+
+    params = {"model": "cached", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+    first = await cached_server.process_request(dict(params))
+    second = await cached_server.process_request(dict(params))
+
+    cached_server.proxy_handler.execute.assert_called_once()
+    assert second.model_dump() == first.model_dump()
+
+
+@pytest.mark.asyncio
+async def test_process_request_cache_bypassed_for_nonzero_temperature(cached_server, mock_response):
+    """Test non-deterministic requests are not cached."""
+    cached_server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+
+    params = {"model": "cached", "messages": [{"role": "user", "content": "hi"}], "temperature": 1}
+    await cached_server.process_request(dict(params))
+    await cached_server.process_request(dict(params))
+
+    assert cached_server.proxy_handler.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_process_request_cache_bypassed_by_header(cached_server, mock_response):
+    """Test `Cache-Control: no-cache` skips the response cache."""
+    cached_server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+
+    params = {"model": "cached", "messages": [{"role": "user", "content": "hi"}], "temperature": 0}
+    await cached_server.process_request(dict(params))
+    await cached_server.process_request(dict(params), {"cache-control": "no-cache"})
+
+    assert cached_server.proxy_handler.execute.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_process_request_cache_disabled_without_ttl(server, mock_response):
+    """Test models without `response_cache_ttl` are never cached."""
+    server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+
+    params = {"model": "custom-model", "messages": [], "temperature": 0}
+    await server.process_request(dict(params))
+    await server.process_request(dict(params))
+
+    assert server.proxy_handler.execute.call_count == 2
+    assert len(server.response_cache) == 0
+
+
+# Request coalescing tests
+@pytest.mark.asyncio
+async def test_process_request_coalesces_identical_requests(server, mock_response):
+    """Test concurrent identical requests share one upstream call but fire hooks per caller."""
+    import asyncio
+
+    async def slow_execute(params):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    plugin = Mock()
+    plugin.before_request = AsyncMock(side_effect=lambda params: params)
+    plugin.after_request_async = AsyncMock()
+    server.plugins = [plugin]
+    server.proxy_handler.execute = AsyncMock(side_effect=slow_execute)
+
+    params = {"model": "test", "temperature": 0, "messages": [{"role": "user", "content": "hi"}]}
+    results = await asyncio.gather(*(server.process_request(dict(params)) for _ in range(3)))
+    await asyncio.sleep(0.01)
+
+    server.proxy_handler.execute.assert_called_once()
+    assert all(result.model_dump() == mock_response.model_dump() for result in results)
+    assert plugin.after_request_async.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_process_request_coalescing_disabled(mock_response):
+    """Test coalescing can be turned off via config."""
+    import asyncio
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(config=ProxyConfig(coalesce_requests=False), plugins=[])
+
+    async def slow_execute(params):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    server.proxy_handler.execute = AsyncMock(side_effect=slow_execute)
+
+    params = {"model": "test", "temperature": 0, "messages": [{"role": "user", "content": "hi"}]}
+    await asyncio.gather(*(server.process_request(dict(params)) for _ in range(3)))
+
+    assert server.proxy_handler.execute.call_count == 3
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "temperature, headers",
+    [
+        (0.7, None),
+        (None, None),
+        (0, {"cache-control": "no-cache"}),
+        (0, {"cache-control": "no-store"}),
+    ],
+)
+async def test_process_request_only_coalesces_deterministic_requests(
+    server, mock_response, temperature, headers
+):
+    """Test sampled requests and cache bypass headers each get their own upstream call."""
+    import asyncio
+
+    async def slow_execute(params):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    server.proxy_handler.execute = AsyncMock(side_effect=slow_execute)
+
+    params = {"model": "test", "messages": [{"role": "user", "content": "hi"}]}
+    if temperature is not None:
+        params["temperature"] = temperature
+    await asyncio.gather(*(server.process_request(dict(params), headers) for _ in range(3)))
+
+    assert server.proxy_handler.execute.call_count == 3
+
+
+# Hedging tests
+@pytest.mark.asyncio
+async def test_process_request_hedges_stalled_upstream_call(mock_response):
+    """Test a stalled upstream call is hedged for models with `hedge_percentile`."""
+    import asyncio
+    from chat_completion_server.core.hedging import MIN_SAMPLES
+    from chat_completion_server.models.model import ModelConfig
+
+    models = {"hedged": ModelConfig(id="hedged", hedge_percentile=95, hedge_budget=1.0)}
+    server = ChatCompletionServer(plugins=[], models=models)
+    hedger = server._get_hedger(models["hedged"])
+    for _ in range(MIN_SAMPLES):
+        hedger.record_latency(0.01)
+
+    calls = 0
+
+    async def execute(params):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            await asyncio.sleep(10)
+        return mock_response
+
+    server.proxy_handler.execute = AsyncMock(side_effect=execute)
+
+    params = {"model": "hedged", "messages": [{"role": "user", "content": "hi"}]}
+    result = await asyncio.wait_for(server.process_request(params), timeout=1)
+
+    assert result.model_dump() == mock_response.model_dump()
+    assert server.hedgers["hedged"].metrics.hedge_wins == 1
+
+
+@pytest.mark.asyncio
+async def test_process_request_not_hedged_by_default(server, mock_response):
+    """Test hedging is opt-in per model."""
+    server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+
+    await server.process_request({"model": "custom-model", "messages": []})
+
+    assert server.hedgers == {}
+
+
+# Admission control tests
+@pytest.mark.asyncio
+async def test_process_request_rejects_when_model_saturated(mock_response):
+    """Test requests beyond `max_in_flight` plus `max_queued` are rejected."""
+    import asyncio
+    from chat_completion_server.core.admission import AdmissionRejectedError
+    from chat_completion_server.models.model import ModelConfig
+
+    models = {"limited": ModelConfig(id="limited", max_in_flight=1, max_queued=1)}
+    server = ChatCompletionServer(plugins=[], models=models)
+    release = asyncio.Event()
+
+    async def execute(params):
+        await release.wait()
+        return mock_response
+
+    server.proxy_handler.execute = AsyncMock(side_effect=execute)
+
+    def request(content):
+        return server.process_request(
+            {"model": "limited", "messages": [{"role": "user", "content": content}]}
+        )
+
+    running = [asyncio.create_task(request("a")), asyncio.create_task(request("b"))]
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(AdmissionRejectedError):
+        await request("c")
+
+    release.set()
+    await asyncio.gather(*running)
+    assert server.admission.limiters["limited"].in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_process_request_stream_holds_permit_until_released(mock_response):
+    """Test streaming requests keep their permit until the stream has been sent."""
+    from chat_completion_server.models.model import ModelConfig
+
+    models = {"limited": ModelConfig(id="limited", max_in_flight=1)}
+    server = ChatCompletionServer(plugins=[], models=models)
+    stream_manager = Mock()
+    server.proxy_handler.execute = AsyncMock(return_value=stream_manager)
+
+    response = await server.process_request(
+        {"model": "limited", "messages": [], "stream": True}
+    )
+    limiter = server.admission.limiters["limited"]
+    assert limiter.in_flight == 1
+
+    async def content():
+        yield b"data"
+
+    chunks = [c async for c in server._send_stream(content(), response)]
+
+    assert chunks == [b"data"]
+    assert limiter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_process_request_upstream_429_shrinks_adaptive_limit():
+    """Test upstream rate limiting lowers an adaptive model's concurrency limit."""
+    import httpx
+    from chat_completion_server.models.model import ModelConfig
+
+    models = {"adaptive": ModelConfig(id="adaptive", max_in_flight=10, adaptive_concurrency=True)}
+    server = ChatCompletionServer(plugins=[], models=models)
+    request = httpx.Request("POST", "http://upstream")
+    error = httpx.HTTPStatusError(
+        "rate limited", request=request, response=httpx.Response(429, request=request)
+    )
+    server.proxy_handler.execute = AsyncMock(side_effect=error)
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await server.process_request({"model": "adaptive", "messages": []})
+
+    limiter = server.admission.limiters["adaptive"]
+    assert limiter.max_in_flight == 5
+    assert limiter.in_flight == 0
+
+
+async def _send_timed_streams(server, durations):
+    """Send one stream per `(time_to_first_chunk, duration)` pair on a fake clock."""
+    now = [0.0]
+    with (
+        patch("chat_completion_server.core.server.monotonic", lambda: now[0]),
+        patch("chat_completion_server.core.timing.monotonic", lambda: now[0]),
+    ):
+        for time_to_first_chunk, duration in durations:
+            server.proxy_handler.execute = AsyncMock(return_value=Mock())
+            response = await server.process_request(
+                {"model": "adaptive", "messages": [], "stream": True}
+            )
+
+            async def content():
+                timer = server._create_stream_timer(response)
+                now[0] += time_to_first_chunk
+                timer.on_chunk()
+                yield b"first"
+                now[0] += duration - time_to_first_chunk
+                timer.on_chunk()
+                yield b"last"
+
+            [frame async for frame in server._send_stream(content(), response)]
+
+
+@pytest.mark.asyncio
+async def test_long_healthy_streams_do_not_shrink_adaptive_limit():
+    """Test long completions that start promptly are not mistaken for latency spikes."""
+    from chat_completion_server.core.admission import AIMD_LATENCY_WINDOW
+    from chat_completion_server.models.model import ModelConfig
+
+    models = {"adaptive": ModelConfig(id="adaptive", max_in_flight=8, adaptive_concurrency=True)}
+    server = ChatCompletionServer(plugins=[], models=models)
+
+    short = [(0.2, 1.0)] * AIMD_LATENCY_WINDOW
+    long = [(0.2, 120.0)] * AIMD_LATENCY_WINDOW
+    await _send_timed_streams(server, short + long)
+
+    assert server.admission.limiters["adaptive"].max_in_flight == 8
+
+
+@pytest.mark.asyncio
+async def test_slow_first_chunks_shrink_adaptive_limit():
+    """Test a sustained rise in upstream time to first chunk lowers the limit."""
+    from chat_completion_server.core.admission import AIMD_LATENCY_WINDOW
+    from chat_completion_server.models.model import ModelConfig
+
+    models = {"adaptive": ModelConfig(id="adaptive", max_in_flight=8, adaptive_concurrency=True)}
+    server = ChatCompletionServer(plugins=[], models=models)
+
+    healthy = [(0.2, 1.0)] * AIMD_LATENCY_WINDOW
+    congested = [(2.0, 3.0)] * AIMD_LATENCY_WINDOW
+    await _send_timed_streams(server, healthy + congested)
+
+    assert server.admission.limiters["adaptive"].max_in_flight == 4
+
+
+# Rate limiting tests
+@pytest.mark.asyncio
+async def test_process_request_rate_limits_per_api_key(mock_response):
+    """Test callers are limited per API key, independently of each other."""
+    from chat_completion_server.core.rate_limit import RateLimitExceededError
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(
+        config=ProxyConfig(rate_limit_requests_per_minute=1, coalesce_requests=False), plugins=[]
+    )
+    server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+    params = {"model": "custom-model", "messages": []}
+
+    await server.process_request(dict(params), {"authorization": "Bearer a"})
+    with pytest.raises(RateLimitExceededError):
+        await server.process_request(dict(params), {"authorization": "Bearer a"})
+    await server.process_request(dict(params), {"authorization": "Bearer b"})
+
+
+@pytest.mark.asyncio
+async def test_process_request_charges_token_usage(mock_response):
+    """Test response usage is charged to the caller's token bucket."""
+    import asyncio
+    from openai.types.completion_usage import CompletionUsage
+    from chat_completion_server.core.rate_limit import RateLimitExceededError
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(
+        config=ProxyConfig(rate_limit_tokens_per_minute=100, coalesce_requests=False), plugins=[]
+    )
+    mock_response.usage = CompletionUsage(
+        prompt_tokens=100, completion_tokens=50, total_tokens=150
+    )
+    server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+    headers = {"authorization": "Bearer a"}
+
+    await server.process_request({"model": "custom-model", "messages": []}, headers)
+    await asyncio.sleep(0.01)
+
+    with pytest.raises(RateLimitExceededError):
+        await server.process_request({"model": "custom-model", "messages": []}, headers)
+
+
+@pytest.mark.asyncio
+async def test_usage_is_charged_when_hook_jobs_are_dropped(mock_response):
+    """Test usage charges do not go through the hook executor, which may drop jobs."""
+    from openai.types.completion_usage import CompletionUsage
+    from chat_completion_server.core.rate_limit import RateLimitExceededError
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(
+        config=ProxyConfig(rate_limit_tokens_per_minute=100, coalesce_requests=False),
+        plugins=[RecordingPlugin(StreamEvents.NONE)],
+    )
+    server.hook_executor.submit = AsyncMock(return_value=False)
+    mock_response.usage = CompletionUsage(
+        prompt_tokens=100, completion_tokens=50, total_tokens=150
+    )
+    server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+    headers = {"authorization": "Bearer a"}
+
+    await server.process_request({"model": "custom-model", "messages": []}, headers)
+
+    with pytest.raises(RateLimitExceededError):
+        await server.process_request({"model": "custom-model", "messages": []}, headers)
+
+
+@pytest.mark.asyncio
+async def test_streams_are_charged_when_hook_jobs_are_dropped():
+    """Test streamed and relayed responses are charged inline at the end of the stream."""
+    from chat_completion_server.core.rate_limit import RateLimitExceededError, caller_ctx_var
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(config=ProxyConfig(rate_limit_tokens_per_minute=5), plugins=[])
+    server.hook_executor.submit = AsyncMock(return_value=False)
+    params = {"model": "test", "stream": True, "messages": [{"role": "user", "content": "x" * 100}]}
+
+    async def raw_stream():
+        for data in _raw_sse(_answer_chunks()):
+            yield data
+
+    for caller, stream in [
+        ("key:a", server._stream_with_hooks(FakeStreamManager(_answer_chunks()), dict(params))),
+        ("key:b", server._relay_with_hooks(raw_stream(), dict(params))),
+    ]:
+        caller_ctx_var.set(caller)
+        [frame async for frame in stream]
+
+        with pytest.raises(RateLimitExceededError):
+            await server.rate_limiter.admit(caller)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("finish_reason", ["length", "content_filter"])
+async def test_relayed_streams_are_charged_when_truncated(finish_reason):
+    """Test relayed streams ending with `length` or `content_filter` are still charged."""
+    from openai.types.completion_usage import CompletionUsage
+    from chat_completion_server.core.rate_limit import RateLimitExceededError, caller_ctx_var
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(config=ProxyConfig(rate_limit_tokens_per_minute=100), plugins=[])
+    last_chunk = _chunk({}, finish_reason=finish_reason).model_copy(
+        update={
+            "usage": CompletionUsage(prompt_tokens=10, completion_tokens=990, total_tokens=1000)
+        }
+    )
+    raw = _raw_sse([_chunk({"role": "assistant", "content": "Cut"}), last_chunk])
+
+    async def raw_stream():
+        for data in raw:
+            yield data
+
+    caller_ctx_var.set("key:a")
+    [frame async for frame in server._relay_with_hooks(raw_stream(), {"model": "test"})]
+
+    with pytest.raises(RateLimitExceededError):
+        await server.rate_limiter.admit("key:a")
+
+
+# Metrics tests
+@pytest.mark.asyncio
+async def test_send_stream_records_stream_timing_and_in_flight(server):
+    """Test streams stay in flight until sent and record TTFT and inter-token gaps."""
+    stream_manager = Mock()
+    server.proxy_handler.execute = AsyncMock(return_value=stream_manager)
+
+    response = await server.process_request(
+        {"model": "custom-model", "messages": [], "stream": True}
+    )
+    assert server.metrics.requests_in_flight.get("custom-model") == 1
+
+    async def content():
+        for frame in (b"a", b"b", b"c"):
+            yield frame
+
+    frames = [frame async for frame in server._send_stream(content(), response)]
+
+    assert frames == [b"a", b"b", b"c"]
+    assert server.metrics.requests_in_flight.get("custom-model") == 0
+    assert server.metrics.requests.get("custom-model", "true", "ok") == 1
+    assert server.metrics.time_to_first_token.get_count("custom-model") == 1
+    assert server.metrics.inter_token.get_count("custom-model") == 2
+
+
+@pytest.mark.asyncio
+async def test_process_request_records_upstream_and_hook_metrics(mock_response):
+    """Test upstream latency and plugin hook durations are recorded."""
+    plugin = Mock()
+    plugin.before_request = AsyncMock(side_effect=lambda params: params)
+    server = ChatCompletionServer(plugins=[plugin])
+    server.proxy_handler.execute = AsyncMock(return_value=mock_response)
+
+    await server.process_request({"model": "unknown-model", "messages": []})
+
+    assert server.metrics.upstream_duration.get_count("other", "ok") == 1
+    assert server.metrics.hook_duration.get_count("Mock", "before_request") == 1
+    assert server.metrics.requests.get("other", "false", "ok") == 1
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_call_records_metrics(server):
+    """Test tool calls are counted and timed per tool."""
+    import asyncio
+
+    tool_call = _tool_calls(1)[0]
+    server.proxy_tool_client.execute_tool = AsyncMock(side_effect=RuntimeError("boom"))
+
+    await server._execute_tool_call(tool_call, asyncio.Semaphore(1))
+
+    assert server.metrics.tool_calls.get("tool_0", "error") == 1
+    assert server.metrics.tool_duration.get_count("tool_0") == 1
+
+
+# Concurrent tool execution tests
+def _tool_calls(count):
+    from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall
+    from openai.types.chat.chat_completion_message_tool_call import Function
+
+    return [
+        ChatCompletionMessageToolCall(
+            id=f"call_{i}", function=Function(name=f"tool_{i}", arguments="{}"), type="function"
+        )
+        for i in range(count)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_runs_concurrently_and_keeps_order(server):
+    """Test tool calls run concurrently while results keep the tool_calls order."""
+    import asyncio
+
+    tool_calls = _tool_calls(4)
+    running, max_running = 0, 0
+
+    async def execute_tool(tool_call):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        # Later calls finish first
+        await asyncio.sleep(0.01 * (4 - int(tool_call.id.split("_")[1])))
+        running -= 1
+        return {"role": "tool", "tool_call_id": tool_call.id, "content": tool_call.id}
+
+    server.proxy_tool_client.execute_tool = AsyncMock(side_effect=execute_tool)
+
+    results = await server._execute_tool_calls(tool_calls)
+
+    assert [result["content"] for result in results] == ["call_0", "call_1", "call_2", "call_3"]
+    assert max_running == 4
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_respects_concurrency_cap(mock_response):
+    """Test `tool_concurrency` caps the number of tool calls in flight."""
+    import asyncio
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(config=ProxyConfig(tool_concurrency=2), plugins=[])
+    running, max_running = 0, 0
+
+    async def execute_tool(tool_call):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        return {"role": "tool", "tool_call_id": tool_call.id, "content": "ok"}
+
+    server.proxy_tool_client.execute_tool = AsyncMock(side_effect=execute_tool)
+
+    await server._execute_tool_calls(_tool_calls(5))
+
+    assert max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_converts_failures_to_error_messages(server):
+    """Test a failing tool yields an error tool message instead of failing the round."""
+    tool_calls = _tool_calls(2)
+
+    async def execute_tool(tool_call):
+        if tool_call.id == "call_0":
+            raise RuntimeError("tool down")
+        return {"role": "tool", "tool_call_id": tool_call.id, "content": "ok"}
+
+    server.proxy_tool_client.execute_tool = AsyncMock(side_effect=execute_tool)
+
+    results = await server._execute_tool_calls(tool_calls)
+
+    assert results[0]["role"] == "tool"
+    assert results[0]["tool_call_id"] == "call_0"
+    assert "tool down" in results[0]["content"]
+    assert results[1]["content"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_execute_tool_calls_times_out_slow_tools():
+    """Test tools exceeding `tool_timeout` yield an error tool message."""
+    import asyncio
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(config=ProxyConfig(tool_timeout=0.01), plugins=[])
+
+    async def post(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    server.proxy_tool_client.client.post = AsyncMock(side_effect=post)
+
+    results = await server._execute_tool_calls(_tool_calls(1))
+
+    assert results[0]["tool_call_id"] == "call_0"
+    assert "TimeoutError" in results[0]["content"]
+
+
+@pytest.mark.asyncio
+async def test_repeated_tool_timeouts_open_the_circuit():
+    """Test a hung tool endpoint trips the breaker, so later calls fail fast."""
+    import asyncio
+    from chat_completion_server.core.resilience import CircuitState
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(
+        config=ProxyConfig(tool_timeout=0.01, circuit_failure_threshold=3), plugins=[]
+    )
+
+    async def post(*args, **kwargs):
+        await asyncio.sleep(1)
+
+    server.proxy_tool_client.client.post = AsyncMock(side_effect=post)
+
+    for _ in range(3):
+        await server._execute_tool_calls(_tool_calls(1))
+
+    assert server.proxy_tool_client.guard.breaker.state == CircuitState.OPEN
+    results = await server._execute_tool_calls(_tool_calls(1))
+    assert "CircuitOpenError" in results[0]["content"]
+    assert server.proxy_tool_client.client.post.call_count == 3
+
+
+# Streaming tool use tests
+class FakeStream:
+    """Replays real chunks through the SDK's stream state to produce real events."""
+
+    def __init__(self, chunks):
+        from openai.lib.streaming.chat import ChatCompletionStreamState
+
+        self._state = ChatCompletionStreamState()
+        self._chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self._chunks:
+            for event in self._state.handle_chunk(chunk):
+                yield event
+
+    @property
+    def current_completion_snapshot(self):
+        return self._state.current_completion_snapshot
+
+
+class FakeStreamManager:
+    def __init__(self, chunks):
+        self._stream = FakeStream(chunks)
+
+    async def __aenter__(self):
+        return self._stream
+
+    async def __aexit__(self, *args):
+        return None
+
+
+def _chunk(delta, finish_reason=None):
+    from openai.types.chat import ChatCompletionChunk
+
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk-id",
+            "object": "chat.completion.chunk",
+            "created": 1234567890,
+            "model": "test-model",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+    )
+
+
+def _tool_call_chunks():
+    return [
+        _chunk({"role": "assistant"}),
+        _chunk(
+            {
+                "tool_calls": [
+                    {
+                        "index": 0,
+                        "id": "call_a",
+                        "type": "function",
+                        "function": {"name": "tool_a", "arguments": '{"x": 1}'},
+                    }
+                ]
+            }
+        ),
+        _chunk(
+            {
+                "tool_calls": [
+                    {
+                        "index": 1,
+                        "id": "call_b",
+                        "type": "function",
+                        "function": {"name": "tool_b", "arguments": "{}"},
+                    }
+                ]
+            }
+        ),
+        _chunk({}, finish_reason="tool_calls"),
+    ]
+
+
+def _answer_chunks(text="Done"):
+    return [
+        _chunk({"role": "assistant", "content": ""}),
+        _chunk({"content": text}),
+        _chunk({}, finish_reason="stop"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_stream_with_hooks_runs_tool_rounds(server):
+    """Test tool calls in a stream are executed and a follow-up stream is spliced in."""
+    import json
+
+    server.proxy_tool_client.execute_tool = AsyncMock(
+        side_effect=lambda tool_call: {
+            "role": "tool",
+            "tool_call_id": tool_call.id,
+            "content": f"result {tool_call.function.name}",
+        }
+    )
+    server.proxy_handler.execute = AsyncMock(return_value=FakeStreamManager(_answer_chunks()))
+
+    params = {"model": "test", "stream": True, "messages": [{"role": "user", "content": "hi"}]}
+    frames = [
+        frame.decode()
+        async for frame in server._stream_with_hooks(FakeStreamManager(_tool_call_chunks()), params)
+    ]
+
+    # No tool call chunks are forwarded to the client
+    chunk_frames = [json.loads(f[len("data: ") :]) for f in frames if f.startswith("data: {")]
+    assert all("tool_calls" not in c["choices"][0]["delta"] for c in chunk_frames)
+    assert chunk_frames[-1]["choices"][0]["finish_reason"] == "stop"
+    assert frames[-1] == "data: [DONE]\n\n"
+
+    # Tools ran in order and their results were sent upstream
+    assert server.proxy_tool_client.execute_tool.call_count == 2
+    follow_up = server.proxy_handler.execute.call_args[0][0]["messages"]
+    assert [m["role"] for m in follow_up] == ["user", "assistant", "tool", "assistant", "tool"]
+    assert follow_up[2]["tool_call_id"] == "call_a"
+    assert follow_up[4]["tool_call_id"] == "call_b"
+    assert follow_up[1]["tool_calls"][0].function.arguments == '{"x": 1}'
+
+
+@pytest.mark.asyncio
+async def test_stream_with_hooks_sums_usage_across_tool_rounds(server):
+    """Test stream hooks get the usage of every tool round, not just the last one."""
+    import asyncio
+    from openai.types.chat import ChatCompletionChunk
+
+    def usage_chunk(prompt_tokens, completion_tokens):
+        return ChatCompletionChunk.model_validate(
+            {
+                "id": "chunk-id",
+                "object": "chat.completion.chunk",
+                "created": 1234567890,
+                "model": "test-model",
+                "choices": [],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                },
+            }
+        )
+
+    plugin = RecordingPlugin(StreamEvents.NONE)
+    plugin.after_stream_async = AsyncMock()
+    server.plugins = [plugin]
+    server.proxy_tool_client.execute_tool = AsyncMock(
+        return_value={"role": "tool", "content": "result"}
+    )
+    server.proxy_handler.execute = AsyncMock(
+        return_value=FakeStreamManager(_answer_chunks() + [usage_chunk(20, 3)])
+    )
+
+    params = {"model": "test", "stream": True, "messages": [{"role": "user", "content": "hi"}]}
+    stream_manager = FakeStreamManager(_tool_call_chunks() + [usage_chunk(10, 5)])
+    [frame async for frame in server._stream_with_hooks(stream_manager, params)]
+    await asyncio.sleep(0.01)
+
+    _, final_completion, _ = plugin.after_stream_async.call_args[0]
+    assert final_completion.usage.prompt_tokens == 30
+    assert final_completion.usage.completion_tokens == 8
+    assert final_completion.usage.total_tokens == 38
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("finish_reason", ["length", "content_filter"])
+async def test_stream_with_hooks_finishes_truncated_streams(server, finish_reason):
+    """Test streams cut off by max_tokens or a content filter still end with `[DONE]` and hooks."""
+    import asyncio
+
+    plugin = RecordingPlugin(StreamEvents.NONE)
+    plugin.after_stream_async = AsyncMock()
+    server.plugins = [plugin]
+    chunks = [
+        _chunk({"role": "assistant", "content": ""}),
+        _chunk({"content": "Cut"}),
+        _chunk({}, finish_reason=finish_reason),
+    ]
+
+    params = {"model": "test", "stream": True, "messages": [{"role": "user", "content": "hi"}]}
+    frames = [
+        frame.decode()
+        async for frame in server._stream_with_hooks(FakeStreamManager(chunks), params)
+    ]
+    await asyncio.sleep(0.01)
+
+    assert f'"finish_reason":"{finish_reason}"' in frames[-2]
+    assert frames[-1] == "data: [DONE]\n\n"
+    _, final_completion, _ = plugin.after_stream_async.call_args[0]
+    assert final_completion.choices[0].message.content == "Cut"
+    assert final_completion.choices[0].finish_reason == finish_reason
+
+
+@pytest.mark.asyncio
+@patch("chat_completion_server.core.server.MAX_TOOL_ROUNDS", 1)
+async def test_stream_with_hooks_stops_at_max_tool_rounds(server):
+    """Test the streaming tool loop ends with `length` once MAX_TOOL_ROUNDS is reached."""
+    import asyncio
+    import json
+
+    plugin = RecordingPlugin(StreamEvents.NONE)
+    plugin.after_stream_async = AsyncMock()
+    server.plugins = [plugin]
+    server.proxy_tool_client.execute_tool = AsyncMock(
+        return_value={"role": "tool", "content": "result"}
+    )
+    server.proxy_handler.execute = AsyncMock(return_value=FakeStreamManager(_tool_call_chunks()))
+
+    params = {"model": "test", "stream": True, "messages": [{"role": "user", "content": "hi"}]}
+    frames = [
+        frame.decode()
+        async for frame in server._stream_with_hooks(FakeStreamManager(_tool_call_chunks()), params)
+    ]
+    await asyncio.sleep(0.01)
+
+    server.proxy_handler.execute.assert_called_once()
+    assert server.proxy_tool_client.execute_tool.call_count == 2
+    # The last round's tool calls are held back, and the turn ends with `length`
+    chunk_frames = [json.loads(f[len("data: ") :]) for f in frames if f.startswith("data: {")]
+    assert all("tool_calls" not in c["choices"][0]["delta"] for c in chunk_frames)
+    assert chunk_frames[-1]["choices"][0]["finish_reason"] == "length"
+    assert frames[-1] == "data: [DONE]\n\n"
+    _, final_completion, _ = plugin.after_stream_async.call_args[0]
+    assert final_completion.choices[0].finish_reason == "length"
+
+
+# Stream event retention tests
+class RecordingPlugin(ProxyPlugin):
+    def __init__(self, stream_events):
+        self.stream_events = stream_events
+        self.events = None
+
+    async def after_stream_async(self, params, response, events):
+        self.events = events
+
+
+@pytest.mark.asyncio
+async def test_stream_with_hooks_filters_events_per_plugin(server):
+    """Test each plugin receives only the stream events its `stream_events` mode asks for."""
+    import asyncio
+
+    none_plugin = RecordingPlugin(StreamEvents.NONE)
+    chunks_plugin = RecordingPlugin(StreamEvents.CHUNKS)
+    all_plugin = RecordingPlugin(StreamEvents.ALL)
+    server.plugins = [none_plugin, chunks_plugin, all_plugin]
+
+    params = {"model": "test", "stream": True, "messages": []}
+    async for _ in server._stream_with_hooks(FakeStreamManager(_answer_chunks()), params):
+        pass
+    await asyncio.sleep(0.01)
+
+    assert none_plugin.events == []
+    assert len(chunks_plugin.events) == 3
+    assert all(event.type == "chunk" for event in chunks_plugin.events)
+    assert len(all_plugin.events) > len(chunks_plugin.events)
+
+
+@pytest.mark.asyncio
+async def test_stream_with_hooks_retains_nothing_without_event_consumers(server):
+    """Test no events are retained when no plugin needs them."""
+    import asyncio
+
+    plugin = RecordingPlugin(StreamEvents.NONE)
+    server.plugins = [plugin]
+
+    with patch.object(server, "_run_after_stream_hooks", new_callable=AsyncMock) as mock_hooks:
+        async for _ in server._stream_with_hooks(FakeStreamManager(_answer_chunks()), {}):
+            pass
+        await asyncio.sleep(0.01)
+
+    assert mock_hooks.call_args[0][2] == []
+
+
+class TimingPlugin(ProxyPlugin):
+    stream_events = StreamEvents.NONE
+
+    def __init__(self):
+        self.timing = None
+
+    async def after_stream_timing_async(self, params, response, timing):
+        self.timing = timing
+
+
+@pytest.mark.asyncio
+async def test_stream_with_hooks_hands_timing_to_plugins(server):
+    """Test plugins receive a timing object for the stream, measured from request start."""
+    import asyncio
+
+    plugin = TimingPlugin()
+    server.plugins = [plugin]
+    server.proxy_handler.execute = AsyncMock(return_value=FakeStreamManager(_answer_chunks()))
+
+    params = {"model": "custom-model", "stream": True, "messages": []}
+    stream_manager = await server.process_request(params)
+    async for _ in server._stream_with_hooks(stream_manager, params):
+        pass
+    await asyncio.sleep(0.01)
+
+    timing = plugin.timing
+    assert timing.chunk_count == 3
+    assert timing.event_counts["chunk"] == 3
+    assert 0 <= timing.pipeline_duration <= timing.time_to_first_chunk
+    assert timing.time_to_first_chunk <= timing.time_to_first_byte <= timing.duration
+    assert timing.output_tokens == 3
+    assert timing.tool_rounds == 0
+
+
+@pytest.mark.asyncio
+async def test_relay_with_hooks_hands_timing_to_plugins(server):
+    """Test raw passthrough streams also produce a timing object."""
+    import asyncio
+
+    plugin = TimingPlugin()
+    server.plugins = [plugin]
+    raw = _raw_sse(_answer_chunks())
+
+    async def raw_stream():
+        for data in raw:
+            yield data
+
+    async for _ in server._relay_with_hooks(raw_stream(), {"model": "test"}):
+        pass
+    await asyncio.sleep(0.01)
+
+    assert plugin.timing.chunk_count == len(raw)
+    assert plugin.timing.time_to_first_byte is not None
+    assert plugin.timing.event_counts == {}
+
+
+# Raw SSE passthrough tests
+def _raw_sse(chunks):
+    return [f"data: {chunk.model_dump_json()}\n\n".encode() for chunk in chunks] + [
+        b"data: [DONE]\n\n"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_process_request_streaming_passthrough():
+    """Test `stream_passthrough` returns the handler's raw byte stream."""
+    from chat_completion_server.models.config import ProxyConfig
+
+    server = ChatCompletionServer(config=ProxyConfig(stream_passthrough=True), plugins=[])
+    raw_stream = Mock()
+    server.proxy_handler.execute_raw_stream = AsyncMock(return_value=raw_stream)
+    server.proxy_handler.execute = AsyncMock()
+
+    params = {"model": "test", "stream": True, "messages": []}
+    result = await server.process_request(params)
+
+    assert result is raw_stream
+    server.proxy_handler.execute.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_relay_with_hooks_relays_bytes_and_rebuilds_completion(server):
+    """Test relayed bytes are forwarded unchanged and hooks get the rebuilt completion."""
+    import asyncio
+
+    plugin = RecordingPlugin(StreamEvents.CHUNKS)
+    plugin.after_stream_async = AsyncMock()
+    server.plugins = [plugin]
+    raw = _raw_sse(_answer_chunks("Hello"))
+
+    async def raw_stream():
+        for data in raw:
+            yield data
+
+    relayed = [data async for data in server._relay_with_hooks(raw_stream(), {"model": "test"})]
+    await asyncio.sleep(0.01)
+
+    assert relayed == raw
+    _, final_completion, events = plugin.after_stream_async.call_args[0]
+    assert final_completion.choices[0].message.content == "Hello"
+    assert len(events) == 3
+
+
+@pytest.mark.asyncio
+async def test_relay_with_hooks_skips_parsing_without_plugins(server):
+    """Test nothing is teed or parsed when no plugin is registered."""
+    import asyncio
+
+    async def raw_stream():
+        yield b"data: not json\n\n"
+
+    with patch.object(server, "_run_relayed_stream_hooks", new_callable=AsyncMock) as mock_hooks:
+        relayed = [data async for data in server._relay_with_hooks(raw_stream(), {})]
+        await asyncio.sleep(0.01)
+
+    assert relayed == [b"data: not json\n\n"]
+    mock_hooks.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_stream_with_hooks_sends_one_frame_per_chunk(server):
+    """Test content is only sent inside chunk frames, once per upstream chunk."""
+    frames = [
+        frame async for frame in server._stream_with_hooks(FakeStreamManager(_answer_chunks()), {})
+    ]
+
+    assert len(frames) == len(_answer_chunks()) + 1
+    assert all(frame.startswith(b"data: {") for frame in frames[:-1])
+    assert sum(frame.count(b'"content":"Done"') for frame in frames) == 1
+    assert frames[-1] == b"data: [DONE]\n\n"
@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from chat_completion_server.core.single_flight import SingleFlight
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "result"
+
+    results = await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+    assert calls == 1
+    assert [result for result, _ in results] == ["result"] * 5
+    assert [shared for _, shared in results].count(False) == 1
+    assert len(flight) == 0
+
+
+async def test_different_keys_execute_separately():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    await asyncio.gather(flight.do("a", work), flight.do("b", work))
+
+    assert calls == 2
+
+
+async def test_sequential_calls_execute_again():
+    flight = SingleFlight()
+    calls = 0
+
+    async def work():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", work) == (1, False)
+    assert await flight.do("key", work) == (2, False)
+
+
+async def test_error_propagates_to_all_callers():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream failed")
+
+    results = await asyncio.gather(
+        flight.do("key", work), flight.do("key", work), return_exceptions=True
+    )
+
+    assert all(isinstance(result, ValueError) for result in results)
+    assert len(flight) == 0
+
+
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def work():
+        await asyncio.sleep(0.02)
+        return "result"
+
+    first = asyncio.create_task(flight.do("key", work))
+    second = asyncio.create_task(flight.do("key", work))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == ("result", True)
@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+from openai.types.chat import ChatCompletionChunk
+
+from chat_completion_server.core.sse import SSEDataTee, SSEEncoder
+
+
+def make_chunk(content: str) -> ChatCompletionChunk:
+    return ChatCompletionChunk.model_validate(
+        {
+            "id": "chunk-id",
+            "object": "chat.completion.chunk",
+            "created": 1234567890,
+            "model": "test-model",
+            "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+        }
+    )
+
+
+async def frames_from(items):
+    """Yield frames, sleeping for float items to simulate upstream gaps."""
+    for item in items:
+        if isinstance(item, float):
+            await asyncio.sleep(item)
+        else:
+            yield item
+
+
+def test_encode_chunk_produces_single_data_frame():
+    frame = SSEEncoder.encode_chunk(make_chunk("Hi"))
+
+    assert frame.startswith(b"data: {")
+    assert frame.endswith(b"}\n\n")
+    assert frame.count(b"data: ") == 1
+    assert b'"content":"Hi"' in frame
+    assert b"null" not in frame
+
+
+def test_encode_done():
+    assert SSEEncoder.encode_done() == b"data: [DONE]\n\n"
+
+
+@pytest.mark.asyncio
+async def test_coalesce_disabled_passes_frames_through():
+    encoder = SSEEncoder()
+
+    out = [frame async for frame in encoder.coalesce(frames_from([b"a", b"b", b"c"]))]
+
+    assert out == [b"a", b"b", b"c"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_merges_frames_within_window():
+    encoder = SSEEncoder(coalesce_window=0.05)
+
+    out = [frame async for frame in encoder.coalesce(frames_from([b"a", b"b", b"c"]))]
+
+    assert out == [b"abc"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_flushes_when_upstream_stalls():
+    encoder = SSEEncoder(coalesce_window=0.01)
+
+    out = [frame async for frame in encoder.coalesce(frames_from([b"a", b"b", 0.05, b"c"]))]
+
+    assert out == [b"ab", b"c"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_flushes_at_max_bytes():
+    encoder = SSEEncoder(coalesce_window=1.0, coalesce_max_bytes=2)
+
+    out = [frame async for frame in encoder.coalesce(frames_from([b"a", b"b", b"c"]))]
+
+    assert out == [b"ab", b"c"]
+
+
+def test_tee_collects_data_payloads():
+    tee = SSEDataTee()
+    tee.feed(b'data: {"a":1}\n\ndata: {"b":2}\n\ndata: [DONE]\n\n')
+    tee.close()
+
+    assert tee.payloads == [b'{"a":1}', b'{"b":2}']
+
+
+def test_tee_reassembles_payloads_split_across_reads():
+    tee = SSEDataTee()
+    for piece in [b'da', b'ta: {"a"', b':1}\r\n', b"\r\n", b'data: {"b":2}']:
+        tee.feed(piece)
+    tee.close()
+
+    assert tee.payloads == [b'{"a":1}', b'{"b":2}']
+
+
+def test_tee_skips_comments_and_other_fields():
+    tee = SSEDataTee()
+    tee.feed(b': keep-alive\n\nevent: message\nid: 1\ndata: {"a":1}\n\n')
+    tee.close()
+
+    assert tee.payloads == [b'{"a":1}']
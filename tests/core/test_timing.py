@@ -0,0 +1,84 @@
+from unittest.mock import patch
+
+from openai.types.chat import ChatCompletion
+
+from chat_completion_server.core.timing import StreamTimer
+
+
+class FakeClock:
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _completion(completion_tokens=None):
+    data = {
+        "id": "id",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "m",
+        "choices": [
+            {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "x"}}
+        ],
+    }
+    if completion_tokens is not None:
+        data["usage"] = {
+            "prompt_tokens": 1,
+            "completion_tokens": completion_tokens,
+            "total_tokens": completion_tokens + 1,
+        }
+    return ChatCompletion.model_validate(data)
+
+
+def test_stream_timer_measures_phases():
+    clock = FakeClock(0.0)
+    with patch("chat_completion_server.core.timing.monotonic", clock):
+        timer = StreamTimer(started_at=0.0, upstream_started_at=0.1)
+
+        clock.now = 0.5
+        timer.on_chunk()
+        sent_at = timer.on_send()
+        clock.now = 0.7
+        timer.on_sent(sent_at)
+
+        clock.now = 1.0
+        timer.on_chunk()
+        clock.now = 2.5
+        timer.on_chunk()
+
+        timing = timer.finish(_completion(completion_tokens=8), {"chunk": 3}, tool_rounds=1)
+
+    assert timing.pipeline_duration == 0.1
+    assert timing.time_to_first_chunk == 0.5
+    assert timing.time_to_first_byte == 0.5
+    assert timing.client_wait == 0.7 - 0.5
+    assert timing.duration == 2.5
+    assert timing.chunk_count == 3
+    assert timing.max_inter_chunk_gap == 1.5
+    assert timing.mean_inter_chunk_gap == 1.0
+    assert timing.output_tokens == 8
+    assert timing.output_tokens_per_second == 4.0
+    assert timing.tool_rounds == 1
+    assert timing.event_counts == {"chunk": 3}
+
+
+def test_stream_timer_falls_back_to_chunk_count_without_usage():
+    timer = StreamTimer(started_at=0.0)
+    timer.on_chunk()
+    timer.on_chunk()
+
+    timing = timer.finish(_completion())
+
+    assert timing.output_tokens == 2
+    assert timing.pipeline_duration is None
+    assert timing.time_to_first_byte is None
+
+
+def test_stream_timer_without_chunks():
+    timing = StreamTimer(started_at=0.0).finish()
+
+    assert timing.time_to_first_chunk is None
+    assert timing.output_tokens_per_second is None
+    assert timing.mean_inter_chunk_gap is None
@@ -0,0 +1,94 @@
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from openai.types.chat.chat_completion_message_tool_call import (
+    ChatCompletionMessageToolCall,
+    Function,
+)
+
+from chat_completion_server.core.tool_use import ProxyToolClient
+from chat_completion_server.models.config import ProxyConfig
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_tool_call(call_id: str, name: str = "lookup", arguments: str = '{"q": "x"}'):
+    return ChatCompletionMessageToolCall(
+        id=call_id, function=Function(name=name, arguments=arguments), type="function"
+    )
+
+
+@pytest.fixture
+def tool_client():
+    client = ProxyToolClient(ProxyConfig(tool_cache_ttls={"lookup": 60}))
+
+    async def post(url, json, headers, timeout):
+        await asyncio.sleep(0.01)
+        response = Mock()
+        response.json.return_value = {
+            "role": "tool",
+            "tool_call_id": json["id"],
+            "content": "result",
+        }
+        return response
+
+    client.client.post = AsyncMock(side_effect=post)
+    return client
+
+
+async def test_execute_tool_posts_to_tool_exec_url(tool_client):
+    result = await tool_client.execute_tool(make_tool_call("call_1", name="uncached"))
+
+    tool_client.client.post.assert_called_once()
+    assert tool_client.client.post.call_args[0][0] == tool_client.tool_exec_url
+    assert result["tool_call_id"] == "call_1"
+
+
+async def test_uncacheable_tool_is_not_cached(tool_client):
+    await tool_client.execute_tool(make_tool_call("call_1", name="uncached"))
+    await tool_client.execute_tool(make_tool_call("call_2", name="uncached"))
+
+    assert tool_client.client.post.call_count == 2
+
+
+async def test_cacheable_tool_is_served_from_cache(tool_client):
+    first = await tool_client.execute_tool(make_tool_call("call_1"))
+    second = await tool_client.execute_tool(make_tool_call("call_2"))
+
+    tool_client.client.post.assert_called_once()
+    assert first["tool_call_id"] == "call_1"
+    assert second["tool_call_id"] == "call_2"
+    assert second["content"] == "result"
+
+
+async def test_cache_key_canonicalizes_arguments(tool_client):
+    await tool_client.execute_tool(make_tool_call("call_1", arguments='{"a": 1, "b": 2}'))
+    await tool_client.execute_tool(make_tool_call("call_2", arguments='{"b":2,"a":1}'))
+
+    tool_client.client.post.assert_called_once()
+
+
+async def test_different_arguments_are_cached_separately(tool_client):
+    await tool_client.execute_tool(make_tool_call("call_1", arguments='{"q": "x"}'))
+    await tool_client.execute_tool(make_tool_call("call_2", arguments='{"q": "y"}'))
+
+    assert tool_client.client.post.call_count == 2
+
+
+async def test_register_cacheable_tool(tool_client):
+    tool_client.register_cacheable_tool("weather", ttl=30)
+
+    await tool_client.execute_tool(make_tool_call("call_1", name="weather"))
+    await tool_client.execute_tool(make_tool_call("call_2", name="weather"))
+
+    tool_client.client.post.assert_called_once()
+
+
+async def test_concurrent_cacheable_calls_share_one_request(tool_client):
+    results = await asyncio.gather(
+        *(tool_client.execute_tool(make_tool_call(f"call_{i}")) for i in range(3))
+    )
+
+    tool_client.client.post.assert_called_once()
+    assert [result["tool_call_id"] for result in results] == ["call_0", "call_1", "call_2"]
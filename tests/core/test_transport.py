@@ -0,0 +1,37 @@
+from unittest.mock import patch
+
+from chat_completion_server.core.server import ChatCompletionServer
+from chat_completion_server.core.transport import create_http_client
+from chat_completion_server.models.config import ProxyConfig
+
+
+def test_create_http_client_applies_pool_limits():
+    config = ProxyConfig(
+        upstream_max_connections=10,
+        upstream_max_keepalive_connections=5,
+        upstream_keepalive_expiry=15.0,
+        upstream_connect_timeout=2.0,
+    )
+
+    client = create_http_client(config)
+    pool = client._transport._pool
+
+    assert pool._max_connections == 10
+    assert pool._max_keepalive_connections == 5
+    assert pool._keepalive_expiry == 15.0
+    assert client.timeout.connect == 2.0
+    assert client.timeout.read == config.proxy_timeout
+
+
+@patch("chat_completion_server.core.transport.find_spec", return_value=None)
+def test_create_http_client_falls_back_without_h2(mock_find_spec):
+    client = create_http_client(ProxyConfig(upstream_http2=True))
+
+    assert client._transport._pool._http2 is False
+
+
+def test_server_shares_http_client_between_handler_and_tool_client():
+    server = ChatCompletionServer()
+
+    assert server.proxy_handler.http_client is server.http_client
+    assert server.proxy_tool_client.client is server.http_client
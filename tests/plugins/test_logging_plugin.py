@@ -1,10 +1,13 @@
+import json
+
 import pytest
 from unittest.mock import Mock, patch
 from openai.types.chat import ChatCompletion, ChatCompletionMessage
 from openai.types.chat.chat_completion import Choice
 from openai.types import CompletionUsage
-from openai.lib.streaming.chat import ChatCompletionStreamEvent
 
+from chat_completion_server.core.logging import set_request_id
+from chat_completion_server.models.plugin import StreamEvents, StreamTiming
 from chat_completion_server.plugins.logging import LoggingPlugin
 
 pytestmark = pytest.mark.asyncio
@@ -48,26 +51,28 @@ async def test_before_request_logs_params(mock_logger, plugin, params):
 
 
 @patch("chat_completion_server.plugins.logging.logger")
-async def test_after_stream_async_with_events(mock_logger, plugin, params, response):
-    events = [Mock(spec=ChatCompletionStreamEvent)]
-
-    await plugin.after_stream_async(params, response, events)
+async def test_after_stream_timing_async_logs_chunk_count(mock_logger, plugin, params, response):
+    await plugin.after_stream_timing_async(params, response, StreamTiming(chunk_count=3))
 
     mock_logger.info.assert_called_once()
     log_msg = mock_logger.info.call_args[0][0]
     assert "Chat completion stream" in log_msg
-    assert "events=1" in log_msg
+    assert "chunks=3" in log_msg
 
 
 @patch("chat_completion_server.plugins.logging.logger")
-async def test_after_stream_async_without_events(mock_logger, plugin, params, response):
-    await plugin.after_stream_async(params, response, [])
+async def test_after_request_async_logs_response(mock_logger, plugin, params, response):
+    await plugin.after_request_async(params, response)
 
     mock_logger.info.assert_called_once()
     log_msg = mock_logger.info.call_args[0][0]
     assert "Chat completion response" in log_msg
 
 
+async def test_retains_no_stream_events(plugin):
+    assert plugin.stream_events == StreamEvents.NONE
+
+
 @patch("chat_completion_server.plugins.logging.logger")
 async def test_on_error_async_logs_error(mock_logger, plugin, params):
     error = Exception("test error")
@@ -88,7 +93,7 @@ async def test_before_request_missing_model(mock_logger, plugin):
 
 
 @patch("chat_completion_server.plugins.logging.logger")
-async def test_after_stream_async_no_usage(mock_logger, plugin, params):
+async def test_after_request_async_no_usage(mock_logger, plugin, params):
     response = ChatCompletion(
         id="test-id",
         choices=[
@@ -104,8 +109,90 @@ async def test_after_stream_async_no_usage(mock_logger, plugin, params):
         usage=None,
     )
 
-    await plugin.after_stream_async(params, response, [])
+    await plugin.after_request_async(params, response)
 
     mock_logger.info.assert_called_once()
     log_msg = mock_logger.info.call_args[0][0]
     assert "usage=None" in log_msg
+
+
+@patch("chat_completion_server.plugins.logging.logger")
+async def test_before_request_skips_unsampled_requests(mock_logger, params):
+    plugin = LoggingPlugin(sample_rate=0.0)
+
+    await plugin.before_request(params)
+    await plugin.after_request_async(params, Mock())
+    await plugin.after_stream_timing_async(params, Mock(), StreamTiming())
+    await plugin.on_error_async(params, Exception("test error"))
+
+    mock_logger.info.assert_not_called()
+    mock_logger.error.assert_called_once()
+
+
+@patch("chat_completion_server.plugins.logging.logger")
+async def test_before_request_skips_work_when_info_disabled(mock_logger, plugin):
+    mock_logger.isEnabledFor.return_value = False
+    params = Mock()
+
+    await plugin.before_request(params)
+
+    mock_logger.info.assert_not_called()
+    params.get.assert_not_called()
+
+
+async def test_sampling_is_consistent_per_request_id():
+    plugin = LoggingPlugin(sample_rate=0.5)
+
+    decisions = []
+    for i in range(200):
+        set_request_id(f"request-{i}")
+        decisions.append(plugin._is_sampled())
+        assert plugin._is_sampled() == decisions[-1]
+    set_request_id(None)
+
+    assert 50 < sum(decisions) < 150
+
+
+@patch("chat_completion_server.plugins.logging.logger")
+async def test_before_request_summarizes_multimodal_and_tools(mock_logger, plugin):
+    image = {"url": "data:image/png;base64," + "A" * 10000}
+    tool_call = {"id": "c1", "type": "function", "function": {"name": "lookup", "arguments": "{}"}}
+    params = {
+        "model": "test-model",
+        "messages": [
+            {
+                "role": "user",
+                "content": [
+                    {"type": "text", "text": "describe"},
+                    {"type": "image_url", "image_url": image},
+                ],
+            },
+            {"role": "assistant", "tool_calls": [tool_call]},
+            {"role": "tool", "tool_call_id": "c1", "content": "x" * 10000},
+        ],
+        "tools": [
+            {"type": "function", "function": {"name": "lookup", "parameters": {"big": "s" * 10000}}}
+        ],
+    }
+
+    await plugin.before_request(params)
+
+    record = json.loads(mock_logger.info.call_args[0][1])
+    assert record["message_count"] == 3
+    assert record["messages"][0]["content"] == ["describe", "[image]"]
+    assert record["messages"][1]["tool_calls"] == ["lookup"]
+    assert len(record["messages"][2]["content"]) < 200
+    assert record["tools"] == ["lookup"]
+
+
+@patch("chat_completion_server.plugins.logging.logger")
+async def test_before_request_caps_record_size(mock_logger):
+    plugin = LoggingPlugin(max_record_bytes=100)
+    params = {"model": "test-model", "messages": [{"role": "user", "content": "x" * 1000}]}
+
+    await plugin.before_request(params)
+
+    summary = mock_logger.info.call_args[0][1]
+    assert summary.startswith('{"model": "test-model"')
+    assert summary.endswith("bytes truncated]")
+    assert len(summary) < 130